@@ -8,63 +8,127 @@ Agent Factory - 使用 LangChain 1.0 create_agent 创建 Skill-aware Agent
 - 支持自定义 state_schema 追踪 skills_loaded
 """
 
-from typing import Optional, Callable, Any, Dict, List
+from dataclasses import dataclass
+from typing import Optional, Callable, Any, Dict, Iterable, List, FrozenSet, Set
 from pathlib import Path
 import logging
+import threading
 
+import numpy as np
 from langchain_core.language_models import BaseChatModel
 
 # LangChain 1.0 正确的导入
 from langchain.agents import create_agent
 from langchain.agents.middleware import AgentMiddleware
-
-from .core import SkillRegistry, SkillState, SkillMetadata
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+
+try:
+    # LangGraph 的内部 API：运行时增删工具需要为新工具预先计算注入参数（如 runtime）
+    from langgraph.prebuilt.tool_node import _get_all_injected_args
+except ImportError:  # pragma: no cover - 取决于安装的 LangGraph 版本
+    _get_all_injected_args = None
+
+from .core import BaseSkill, SkillRegistry, SkillState, SkillMetadata, SkillRouter, SkillWatcher, create_meta_tools
+from .core.groups import group_loader_name
+from .core.metadata_table import CombinedFilter, MetadataTable
+from .core.permissions import PermissionFilter
 from .core.state import SkillStateAccumulative, SkillStateFIFO
-from .middleware import SkillMiddleware
+from .middleware import (
+    SkillMiddleware,
+    PermissionAwareSkillMiddleware,
+    RateLimitedPermissionAwareSkillMiddleware,
+    SkillRouterMiddleware,
+    ToolResultCacheMiddleware,
+)
 from .config import SkillSystemConfig, load_config
-from .utils import setup_logger, generate_system_prompt
+from .utils import setup_logger, generate_system_prompt, generate_meta_system_prompt
 
 logger = logging.getLogger(__name__)
 
 
+def supports_tool_mutation(tool_node: Any) -> bool:
+    """
+    ToolNode 是否支持运行时增删工具
+
+    SkillAgent.add_skill / remove_skill 依赖 LangGraph ToolNode 的内部结构：
+    tools_by_name 和 _injected_args 两个字典，以及 _get_all_injected_args()。
+    任何一项在新版本中消失时返回 False，运行时增删退化为“重建 Agent 后生效”
+    """
+    return (
+        _get_all_injected_args is not None
+        and isinstance(getattr(tool_node, "tools_by_name", None), dict)
+        and isinstance(getattr(tool_node, "_injected_args", None), dict)
+    )
+
+
 class SkillAgent:
     """
     Skill Agent 包装器
 
-    封装了 Agent 和 Registry，提供便捷的管理接口
+    封装了 Agent 和 Registry，提供便捷的管理接口。
+    add_skill / remove_skill / set_skill_enabled 在运行时修改工具全集：
+    只把变化的 Skill 的 Loader 和工具注册到（或移出）Agent 的 ToolNode，不重建 Agent 图；
+    SkillMiddleware 每轮从 Registry 读取工具，下一次模型调用即可看到变化。
+    热重载监视器的新增、替换、删除经 _on_skill_change 走同一条路径
     """
 
     def __init__(
         self,
         agent: Any,
         registry: SkillRegistry,
-        config: SkillSystemConfig
+        config: SkillSystemConfig,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
     ):
         """
         Args:
             agent: LangChain Agent 实例
             registry: Skill Registry
             config: 系统配置
+            filter_fn: 创建 Agent 时使用的过滤函数（运行时添加的 Skill 同样按它过滤）
         """
         self.agent = agent
         self.registry = registry
         self.config = config
+        self.filter_fn = filter_fn
+        # 热重载监视器（config.hot_reload 为 True 时由 create_skill_agent 设置）
+        self.watcher: Optional[SkillWatcher] = None
+        # 工具过滤中间件（启用中间件时由 create_skill_agent 设置，可读取 metrics）
+        self.skill_middleware: Optional[SkillMiddleware] = None
+        # 工具结果缓存中间件（config.tool_cache_size > 0 时由 create_skill_agent 设置，可读取命中统计）
+        self.tool_cache_middleware: Optional[ToolResultCacheMiddleware] = None
+        # 串行化对 ToolNode 的修改（add_skill / remove_skill / set_skill_enabled 可能来自不同线程）
+        self._tools_lock = threading.Lock()
+
+    def _run_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        补充运行配置中的并发上限
+
+        模型在一轮中发出的多个工具调用由 LangGraph 作为同一步的并行任务执行：
+        同步工具在线程池中执行，异步工具作为 asyncio 任务执行，结果按调用顺序写回。
+        max_concurrency 限制同时执行的工具调用数（调用方显式传入时不覆盖）
+        """
+        if self.config.tool_concurrency is None:
+            return kwargs
+        run_config = dict(kwargs.get("config") or {})
+        run_config.setdefault("max_concurrency", self.config.tool_concurrency)
+        return {**kwargs, "config": run_config}
 
     def invoke(self, input_data: Dict[str, Any], **kwargs) -> Any:
         """调用 Agent"""
-        return self.agent.invoke(input_data, **kwargs)
+        return self.agent.invoke(input_data, **self._run_kwargs(kwargs))
 
     async def ainvoke(self, input_data: Dict[str, Any], **kwargs) -> Any:
         """异步调用 Agent"""
-        return await self.agent.ainvoke(input_data, **kwargs)
+        return await self.agent.ainvoke(input_data, **self._run_kwargs(kwargs))
 
     def stream(self, input_data: Dict[str, Any], **kwargs):
         """流式调用 Agent"""
-        return self.agent.stream(input_data, **kwargs)
+        return self.agent.stream(input_data, **self._run_kwargs(kwargs))
 
     async def astream(self, input_data: Dict[str, Any], **kwargs):
         """异步流式调用 Agent"""
-        return self.agent.astream(input_data, **kwargs)
+        return self.agent.astream(input_data, **self._run_kwargs(kwargs))
 
     def list_skills(self) -> List[str]:
         """列出所有已注册的 Skills"""
@@ -77,21 +141,170 @@ class SkillAgent:
     def search_skills(
         self,
         query: str = "",
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        limit: Optional[int] = None
     ) -> List[SkillMetadata]:
-        """搜索 Skills"""
-        return self.registry.search(query=query, tags=tags)
+        """搜索 Skills（按相关度排序）"""
+        return self.registry.search(query=query, tags=tags, limit=limit)
+
+    def add_skill(self, skill: BaseSkill) -> None:
+        """
+        注册一个 Skill 并让 Agent 可以执行它的 Loader 和工具（同名 Skill 会被替换）
+
+        应在两次 invoke 之间调用：正在执行的 invoke 中已经发出的工具调用可能看到修改前或修改后的工具，
+        替换或移除的工具此时会以“不是有效工具”的错误返回给模型
+
+        Raises:
+            ValueError: 如果 Skill 验证失败
+            SkillDependencyError: 如果注册后会形成循环依赖
+        """
+        name = skill.metadata.name
+        old = self.registry.snapshot().skills.get(name)
+        if old is None:
+            self.registry.register(skill)
+        else:
+            self.registry.replace(skill)
+        self._on_skill_change(old, skill)
+
+    def remove_skill(self, skill_name: str) -> None:
+        """
+        取消注册一个 Skill，并从 Agent 的 ToolNode 中移除它的 Loader 和工具
+
+        与 add_skill 相同，应在两次 invoke 之间调用
+        """
+        skill = self.registry.snapshot().skills.get(skill_name)
+        if skill is None:
+            return
+        self.registry.unregister(skill_name)
+        self._on_skill_change(skill, None)
+
+    def set_skill_enabled(self, skill_name: str, enabled: bool) -> None:
+        """
+        启用或禁用一个 Skill（禁用的 Skill 的工具不再可执行）
+
+        Raises:
+            SkillNotFoundError: 如果 Skill 不存在
+        """
+        self.registry.set_enabled(skill_name, enabled)
+        if enabled:
+            self._register_tools(skill_name)
+        else:
+            self._unregister_tools(self.registry.get(skill_name))
+
+    def _on_skill_change(self, old: Optional[BaseSkill], new: Optional[BaseSkill]) -> None:
+        """
+        Registry 中一个 Skill 被新增、替换或删除后同步 ToolNode（也是热重载监视器的 on_change 回调）
+
+        先注册新工具再移除旧 Skill 独有的工具，同名工具在替换过程中始终可执行
+        """
+        registered = self._register_tools(new.metadata.name) if new is not None else set()
+        if old is not None:
+            self._unregister_tools(old, keep=registered)
+
+    def _tool_node(self) -> Optional[ToolNode]:
+        """Agent 的 ToolNode；不存在或当前 LangGraph 版本不支持运行时增删工具时返回 None"""
+        node = getattr(self.agent, "nodes", {}).get("tools")
+        tool_node = getattr(node, "bound", None)
+        if not isinstance(tool_node, ToolNode):
+            return None
+        if not supports_tool_mutation(tool_node):
+            logger.warning(
+                "Installed LangGraph ToolNode does not support adding or removing tools at runtime; "
+                "skill changes take effect only after the agent is recreated"
+            )
+            return None
+        return tool_node
+
+    def _register_tools(self, skill_name: str) -> Set[str]:
+        """
+        把一个 Skill 的 Loader 和工具加入 ToolNode（开销只与该 Skill 的工具数有关）
+
+        Returns:
+            加入 ToolNode 的工具名（Skill 被禁用或过滤掉时为空）
+        """
+        tool_node = self._tool_node()
+        if tool_node is None:
+            logger.warning(
+                f"Agent has no tool node; tools of '{skill_name}' are not executable "
+                "until the agent is recreated"
+            )
+            return set()
+
+        snapshot = self.registry.snapshot()
+        meta = snapshot.get_metadata(skill_name)
+        if not meta.enabled or (self.filter_fn is not None and not self.filter_fn(meta)):
+            return set()
+
+        skill = snapshot.get(skill_name)
+        tools: List[BaseTool] = [skill.get_loader_tool(), *skill.get_tools()]
+        with self._tools_lock:
+            if self.config.group_loaders and meta.group:
+                # 新分组的 Loader 也要能执行（已有分组的 Loader 由中间件按当前快照固定）
+                group_loaders = snapshot.get_group_loader_tools(self.filter_fn)
+                tools.extend(
+                    t for t in group_loaders
+                    if t.name == group_loader_name(meta.group) and t.name not in tool_node.tools_by_name
+                )
+
+            for t in tools:
+                # ToolNode 在构建时预先计算需要注入的参数（如 runtime）；
+                # 先写注入参数再写工具，并发的调用不会看到缺少注入参数的工具
+                tool_node._injected_args[t.name] = _get_all_injected_args(t)
+                tool_node.tools_by_name[t.name] = t
+        logger.info(f"Registered {len(tools)} tools of skill '{skill_name}' with the agent")
+        return {t.name for t in tools}
+
+    def _unregister_tools(self, skill: BaseSkill, keep: Iterable[str] = ()) -> None:
+        """从 ToolNode 中移除一个 Skill 的 Loader 和工具（keep 中的工具名保留）"""
+        tool_node = self._tool_node()
+        if tool_node is None:
+            return
+        keep = set(keep)
+        with self._tools_lock:
+            for t in [skill.get_loader_tool(), *skill.get_tools()]:
+                if t.name in keep:
+                    continue
+                tool_node.tools_by_name.pop(t.name, None)
+                tool_node._injected_args.pop(t.name, None)
+
+    def stop_watching(self) -> None:
+        """停止热重载监视"""
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
 
     def __repr__(self) -> str:
         return f"<SkillAgent: {len(self.registry)} skills loaded>"
 
 
+@dataclass(frozen=True)
+class VisibilityFilter:
+    """
+    按可见性过滤 Skills
+
+    值对象（可哈希、按内容比较相等）：配置相同的 Agent 产生相等的过滤函数，
+    因此在共享的 Registry 快照上命中同一个工具集缓存条目
+    """
+    allowed: Optional[FrozenSet[str]] = None  # None 表示不过滤
+
+    def __call__(self, meta: SkillMetadata) -> bool:
+        return self.allowed is None or meta.visibility in self.allowed
+
+    def table_mask(self, table: MetadataTable) -> np.ndarray:
+        return table.visibility_mask(self.allowed)
+
+
+def _is_ungrouped(meta: SkillMetadata) -> bool:
+    return not meta.group
+
+
 def create_skill_agent(
     model: BaseChatModel,
     config: Optional[SkillSystemConfig] = None,
     config_path: Optional[Path] = None,
     custom_system_prompt: Optional[str] = None,
     filter_fn: Optional[Callable[[SkillMetadata], bool]] = None,
+    registry: Optional[SkillRegistry] = None,
 ) -> SkillAgent:
     """
     创建 Skill-aware Agent（使用 LangChain 1.0 API）
@@ -110,6 +323,8 @@ def create_skill_agent(
         config_path: 配置文件路径（可选）
         custom_system_prompt: 自定义 System Prompt（可选）
         filter_fn: 自定义 Skill 过滤函数（可选）
+        registry: 已加载的 Registry（可选）。提供时跳过目录发现，
+            多租户场景下传入 base_registry.overlay() 以共享 Skill 实例和工具缓存
 
     Returns:
         SkillAgent 实例
@@ -148,37 +363,57 @@ def create_skill_agent(
     logger.info(f"Initializing Skill Agent with config: {config.to_dict()}")
 
     # 3. 初始化 Registry
-    registry = SkillRegistry()
+    owns_registry = registry is None
+    if owns_registry:
+        registry = SkillRegistry()
 
     # 4. 自动发现并加载 Skills
-    if config.auto_discover and config.skills_dir.exists():
+    if not owns_registry:
+        logger.info(f"Using provided registry: {registry!r}")
+    elif config.auto_discover and config.skills_dir.exists():
         logger.info(f"Auto-discovering skills from: {config.skills_dir}")
-        loaded_count = registry.discover_and_load(
+        discovery = registry.discover(
             skills_dir=config.skills_dir,
-            module_name=config.skill_module_name
+            module_name=config.skill_module_name,
+            use_manifest=config.use_manifest,
+            max_workers=config.discovery_workers,
+            cache_path=config.registry_cache_path
+        )
+        logger.info(
+            f"Loaded {len(discovery.loaded)} skills, "
+            f"{len(discovery.failed)} failed ({discovery.total_time:.3f}s)"
         )
-        logger.info(f"Loaded {loaded_count} skills")
     else:
         logger.warning(f"Skills directory not found or auto-discover disabled: {config.skills_dir}")
 
     if len(registry) == 0:
         logger.warning("No skills loaded! Agent will have no skill capabilities.")
 
-    # 5. 定义过滤函数（基于可见性）
-    def visibility_filter(meta: SkillMetadata) -> bool:
-        if not config.filter_by_visibility:
-            return True
-        return meta.visibility in config.allowed_visibilities
+    # 5. 定义过滤函数（基于可见性和用户权限）
+    visibility_filter = VisibilityFilter(
+        frozenset(config.allowed_visibilities) if config.filter_by_visibility else None
+    )
 
-    # 组合用户自定义过滤函数
-    combined_filter = filter_fn
-    if filter_fn:
-        combined_filter = lambda meta: visibility_filter(meta) and filter_fn(meta)
-    else:
-        combined_filter = visibility_filter
+    # 可见性和用户自定义过滤函数；再组合默认权限过滤（所需权限已编译为位掩码，不需要权限的 Skill 总是通过）。
+    # 与 PermissionAwareSkillMiddleware 组合出的过滤函数相等，共用 Registry 工具集缓存条目
+    base_filter = CombinedFilter(visibility_filter, filter_fn) if filter_fn else visibility_filter
+    combined_filter = CombinedFilter(
+        base_filter, PermissionFilter.for_permissions(config.user_permissions)
+    )
 
     # 6. 获取所有工具（用于注册到 Agent）
     all_tools = registry.get_all_tools(filter_fn=combined_filter)
+
+    # meta 模式：模型只看到 find_skills / load_skill，Skill 的工具在加载后才出现
+    meta_tools = []
+    if config.loader_mode == "meta":
+        meta_tools = create_meta_tools(
+            registry, filter_fn=combined_filter, search_limit=config.meta_search_limit
+        )
+        all_tools = [*meta_tools, *all_tools]
+    elif config.group_loaders:
+        # 分组模式：group_<name> Loader 打开分组后，组内 Skill 的 Loader 才可见
+        all_tools = [*registry.get_group_loader_tools(filter_fn=combined_filter), *all_tools]
     logger.info(f"Total tools registered: {len(all_tools)}")
 
     # 7. 选择状态管理模式
@@ -196,22 +431,79 @@ def create_skill_agent(
     # 8. 创建中间件列表
     middleware_list: List[AgentMiddleware] = []
 
+    if config.middleware_enabled and config.router_enabled:
+        # 轮前路由：在第一次模型调用前预先激活高置信度的 Skills
+        router = SkillRouter(
+            registry,
+            threshold=config.router_threshold,
+            max_skills=config.router_max_skills,
+            filter_fn=combined_filter
+        )
+        middleware_list.append(SkillRouterMiddleware(
+            skill_registry=registry,
+            router=router,
+            verbose=config.verbose,
+            loader_mode=config.loader_mode
+        ))
+        logger.info("SkillRouterMiddleware enabled - pre-turn skill routing active")
+
+    tool_cache_middleware = None
+    if config.middleware_enabled and config.tool_cache_size > 0:
+        # 放在 SkillMiddleware 之前：命中的调用直接返回，不经过限速等待
+        tool_cache_middleware = ToolResultCacheMiddleware(
+            skill_registry=registry,
+            max_size=config.tool_cache_size,
+            default_ttl=config.tool_cache_ttl,
+            user_permissions=config.user_permissions,
+            verbose=config.verbose
+        )
+        middleware_list.append(tool_cache_middleware)
+        logger.info("ToolResultCacheMiddleware enabled - cacheable tool results are reused")
+
     if config.middleware_enabled:
         # 【核心】创建 SkillMiddleware 实现动态工具过滤
-        skill_middleware = SkillMiddleware(
+        # 默认权限取 config.user_permissions，调用时 context 中的 user_permissions 按请求覆盖
+        middleware_kwargs = dict(
             skill_registry=registry,
+            user_permissions=config.user_permissions,
             verbose=config.verbose,
-            filter_fn=combined_filter
+            filter_fn=base_filter,
+            loader_mode=config.loader_mode,
+            meta_tools=meta_tools,
+            group_loaders=config.group_loaders,
+            auto_activate=config.auto_activate_skills
         )
+        if config.tool_rate_limits or config.skill_rate_limits:
+            # 配置了限速：同一个 Agent 的所有会话共享令牌桶和并发上限
+            skill_middleware = RateLimitedPermissionAwareSkillMiddleware(
+                tool_limits=config.tool_rate_limits,
+                skill_limits=config.skill_rate_limits,
+                timeout=config.rate_limit_timeout,
+                **middleware_kwargs
+            )
+        else:
+            skill_middleware = PermissionAwareSkillMiddleware(**middleware_kwargs)
         middleware_list.append(skill_middleware)
-        logger.info("SkillMiddleware enabled - dynamic tool filtering active")
+        logger.info(f"{type(skill_middleware).__name__} enabled - dynamic tool filtering active")
 
     # 9. 生成 System Prompt
-    available_skills = registry.list_skills(filter_fn=combined_filter)
-    system_prompt = custom_system_prompt or generate_system_prompt(
-        available_skill_names=available_skills,
-        custom_instructions=""
-    )
+    if custom_system_prompt:
+        system_prompt = custom_system_prompt
+    elif config.loader_mode == "meta":
+        system_prompt = generate_meta_system_prompt(custom_instructions="")
+    elif config.group_loaders:
+        ungrouped = CombinedFilter(combined_filter, _is_ungrouped)
+        system_prompt = generate_system_prompt(
+            available_skill_names=registry.list_skills(filter_fn=ungrouped),
+            custom_instructions="",
+            available_groups=registry.list_groups(filter_fn=combined_filter)
+        )
+    else:
+        available_skills = registry.list_skills(filter_fn=combined_filter)
+        system_prompt = generate_system_prompt(
+            available_skill_names=available_skills,
+            custom_instructions=""
+        )
 
     logger.debug(f"System prompt:\n{system_prompt}")
 
@@ -249,7 +541,22 @@ def create_skill_agent(
     logger.info("Skill Agent created successfully")
 
     # 11. 返回封装的 SkillAgent
-    return SkillAgent(agent=agent, registry=registry, config=config)
+    skill_agent = SkillAgent(agent=agent, registry=registry, config=config, filter_fn=combined_filter)
+    if config.middleware_enabled:
+        skill_agent.skill_middleware = skill_middleware
+    skill_agent.tool_cache_middleware = tool_cache_middleware
+
+    # 12. 热重载：变化的 Skill 会被原子替换并同步到 ToolNode，SkillMiddleware 在下一次模型调用时提供新工具
+    if config.hot_reload and owns_registry and config.skills_dir.is_dir():
+        skill_agent.watcher = registry.watch(
+            config.skills_dir,
+            module_name=config.skill_module_name,
+            use_manifest=config.use_manifest,
+            interval=config.hot_reload_interval,
+            on_change=skill_agent._on_skill_change
+        )
+
+    return skill_agent
 
 
 def create_custom_agent(
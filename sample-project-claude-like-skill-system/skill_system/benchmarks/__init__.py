@@ -0,0 +1,14 @@
+"""
+Benchmarks Module - 离线性能基准
+
+所有基准都只依赖本地代码，不访问网络，可直接运行：
+    python -m skill_system.benchmarks.tool_build
+    python -m skill_system.benchmarks.search
+    python -m skill_system.benchmarks.concurrent_reads
+    python -m skill_system.benchmarks.scaling --sizes 1000 10000 --output scaling.json
+    python -m skill_system.benchmarks.prompt_tokens --sizes 10 100 1000 5000
+    python -m skill_system.benchmarks.metadata --sizes 1000 10000 50000
+    python -m skill_system.benchmarks.cold_start --sizes 50 200 500
+
+合成 Skill 由 benchmarks.synthetic 生成（可复现、工具数量可配置）
+"""
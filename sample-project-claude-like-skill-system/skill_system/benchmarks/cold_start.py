@@ -0,0 +1,158 @@
+"""
+冷启动基准：Skills 目录 vs 预编译归档
+
+在临时目录生成 N 个 Skill（skill.py + instructions.md + skill.yaml），比较：
+- directory_import：目录形式，立即导入全部 skill.py（每次都从源码编译）
+- directory_manifest：目录形式，按 skill.yaml 延迟导入
+- bundle_import：归档形式，立即通过 zipimport 导入全部 .pyc
+- bundle_manifest：归档形式，按 bundle.json 延迟导入（默认）
+
+运行期间关闭 .pyc 写入（sys.dont_write_bytecode），模拟只读镜像中的首次启动。
+每种形式取多次运行的最小值（毫秒），完全离线运行。
+
+运行:
+    python -m skill_system.benchmarks.cold_start --sizes 50 200 500
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import textwrap
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core.bundle import build_bundle
+from skill_system.core.manifest import write_manifest
+from skill_system.core.registry import SkillRegistry
+
+DEFAULT_SIZES = [50, 200, 500]
+
+SKILL_PY = textwrap.dedent('''
+    from langchain_core.tools import tool
+    from skill_system.core.base_skill import BaseSkill, SkillMetadata
+
+
+    class GeneratedSkill(BaseSkill):
+        @property
+        def metadata(self):
+            return SkillMetadata(
+                name="{name}",
+                description="Generated skill {index} for cold start benchmarks",
+                tags=["generated", "bench"],
+            )
+
+        def build_tools(self):
+            @tool("{name}_parse")
+            def parse(text: str, limit: int = 10) -> str:
+                """Parse the text and return at most limit tokens."""
+                return " ".join(text.split()[:limit])
+
+            @tool("{name}_count")
+            def count(text: str) -> int:
+                """Count the words in the text."""
+                return len(text.split())
+
+            @tool("{name}_upper")
+            def upper(text: str) -> str:
+                """Upper-case the text."""
+                return text.upper()
+
+            return [parse, count, upper]
+
+        def build_loader_tool(self):
+            @tool("skill_{name}")
+            def loader() -> str:
+                """Load generated skill {index}."""
+                return self.get_instructions()
+
+            return loader
+
+
+    def create_skill(skill_dir):
+        return GeneratedSkill(skill_dir)
+''')
+
+
+def make_skills_dir(root: Path, size: int) -> Path:
+    """生成 size 个 Skill 目录（带 skill.yaml）"""
+    skills_dir = root / "skills"
+    skills_dir.mkdir()
+    loader = SkillRegistry()
+    for i in range(size):
+        name = f"generated_{i:05d}"
+        skill_dir = skills_dir / name
+        skill_dir.mkdir()
+        (skill_dir / "skill.py").write_text(SKILL_PY.format(name=name, index=i), encoding="utf-8")
+        (skill_dir / "instructions.md").write_text(
+            f"# {name}\n\nUse {name}_parse, {name}_count and {name}_upper.\n", encoding="utf-8"
+        )
+        write_manifest(loader.load_skill(skill_dir, use_manifest=False), skill_dir / "skill.yaml")
+    return skills_dir
+
+
+def _best_ms(fn: Callable[[], Any], iterations: int) -> float:
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def bench_size(size: int, iterations: int = 3) -> Dict[str, Any]:
+    """测量 size 个 Skill 在两种形式下的 discover() 耗时"""
+    dont_write_bytecode = sys.dont_write_bytecode
+    sys.dont_write_bytecode = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            skills_dir = make_skills_dir(Path(tmp), size)
+            bundle = Path(tmp) / "skills.zip"
+            build_bundle(skills_dir, bundle)
+
+            def discover(path: Path, use_manifest: bool) -> None:
+                result = SkillRegistry().discover(path, use_manifest=use_manifest)
+                assert len(result.loaded) == size, result.failed[:1]
+
+            results = {
+                "directory_import_ms": _best_ms(lambda: discover(skills_dir, False), iterations),
+                "directory_manifest_ms": _best_ms(lambda: discover(skills_dir, True), iterations),
+                "bundle_import_ms": _best_ms(lambda: discover(bundle, False), iterations),
+                "bundle_manifest_ms": _best_ms(lambda: discover(bundle, True), iterations),
+                "bundle_kb": bundle.stat().st_size / 1024,
+            }
+    finally:
+        sys.dont_write_bytecode = dont_write_bytecode
+
+    results["import_speedup"] = results["directory_import_ms"] / results["bundle_import_ms"]
+    results["manifest_speedup"] = results["directory_manifest_ms"] / results["bundle_manifest_ms"]
+    return results
+
+
+def run(sizes: List[int] = None, iterations: int = 3) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {size: {"directory_import_ms", "directory_manifest_ms", "bundle_import_ms",
+                "bundle_manifest_ms", "bundle_kb", "import_speedup", "manifest_speedup"}}
+    """
+    return {str(size): bench_size(size, iterations) for size in sizes or DEFAULT_SIZES}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Cold start: skills directory vs precompiled bundle")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Skill counts to benchmark")
+    parser.add_argument("--iterations", type=int, default=3, help="Runs per form (best is reported)")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.sizes, args.iterations), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
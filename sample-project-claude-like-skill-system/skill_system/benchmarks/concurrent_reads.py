@@ -0,0 +1,121 @@
+"""
+并发读取基准
+
+多个读线程持续执行中间件风格的读取（get_tools_for_skills、search、get_metadata），
+同时一个写线程不断替换 / 启停 Skill（模拟热重载）。
+读取只访问已发布的 RegistrySnapshot，不加锁；基准报告各线程数下的吞吐和读取错误数
+（错误数应始终为 0）。
+
+运行:
+    python -m skill_system.benchmarks.concurrent_reads --threads 1 4 8 16 --duration 1.0
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.benchmarks.synthetic import SyntheticSkill
+from skill_system.core import SkillRegistry
+
+DEFAULT_THREADS = [1, 4, 8, 16]
+SKILL_COUNT = 200
+
+
+def make_registry(count: int = SKILL_COUNT) -> SkillRegistry:
+    registry = SkillRegistry()
+    for i in range(count):
+        registry.register(SyntheticSkill(f"skill{i}", tool_count=1))
+    return registry
+
+
+def _reader(registry: SkillRegistry, stop: threading.Event, counts: List[int], errors: List[str]) -> None:
+    loaded_sets = [["skill1"], ["skill2", "skill3"], [], ["skill4"]]
+    reads = 0
+    i = 0
+    while not stop.is_set():
+        try:
+            registry.get_tools_for_skills(loaded_sets[i % len(loaded_sets)])
+            registry.search("synthetic", limit=5)
+            registry.get_metadata(f"skill{i % SKILL_COUNT}")
+            reads += 3
+        except Exception as e:
+            errors.append(repr(e))
+        i += 1
+    counts.append(reads)
+
+
+def _writer(registry: SkillRegistry, stop: threading.Event, interval: float, counts: List[int]) -> None:
+    writes = 0
+    while not stop.is_set():
+        name = f"skill{writes % SKILL_COUNT}"
+        registry.replace(SyntheticSkill(name, tool_count=1, revision=writes))
+        registry.set_enabled(name, writes % 2 == 0)
+        writes += 2
+        time.sleep(interval)
+    counts.append(writes)
+
+
+def run(
+    threads: List[int] = None,
+    duration: float = 1.0,
+    write_interval: float = 0.001
+) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {threads: {"reads_per_sec", "writes", "errors"}}
+    """
+    results = {}
+    for n in threads or DEFAULT_THREADS:
+        registry = make_registry()
+        stop = threading.Event()
+        read_counts: List[int] = []
+        write_counts: List[int] = []
+        errors: List[str] = []
+
+        workers = [
+            threading.Thread(target=_reader, args=(registry, stop, read_counts, errors))
+            for _ in range(n)
+        ]
+        workers.append(threading.Thread(
+            target=_writer, args=(registry, stop, write_interval, write_counts)
+        ))
+        for w in workers:
+            w.start()
+        time.sleep(duration)
+        stop.set()
+        for w in workers:
+            w.join()
+
+        results[str(n)] = {
+            "reads_per_sec": sum(read_counts) / duration,
+            "writes": sum(write_counts),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+        }
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="SkillRegistry concurrent read benchmark")
+    parser.add_argument("--threads", type=int, nargs="+", default=DEFAULT_THREADS,
+                        help="Reader thread counts to benchmark")
+    parser.add_argument("--duration", type=float, default=1.0, help="Seconds to run each thread count")
+    parser.add_argument("--write-interval", type=float, default=0.001,
+                        help="Seconds between writer updates")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.threads, args.duration, args.write_interval), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+元数据内存与扫描基准
+
+- memory：创建 N 个元数据对象的常驻内存，对比改造前的普通 dataclass
+  （每个实例一个 __dict__、标签字符串不驻留）与当前的 slots + 驻留字符串 SkillMetadata。
+  标签和可见性字符串每个 Skill 单独构造，模拟从 YAML / 代码分别解析得到的字符串
+- scan：逐个调用过滤函数与 MetadataTable 向量化扫描的耗时（可见性、标签、两者组合），
+  以及列式表的构建耗时和列数据大小
+
+运行:
+    python -m skill_system.benchmarks.metadata --sizes 100 1000 10000 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.benchmarks.synthetic import TAGS, VOCABULARY
+from skill_system.core.base_skill import SkillMetadata
+from skill_system.core.metadata_table import CombinedFilter, MetadataTable, TagFilter
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 50_000]
+_VISIBILITIES = ["public", "public", "internal", "private"]
+
+
+@dataclass
+class _LegacyMetadata:
+    """改造前的 SkillMetadata 定义（普通 dataclass），仅用于对比"""
+    name: str
+    description: str
+    version: str = "1.0.0"
+    tags: List[str] = field(default_factory=list)
+    visibility: str = "public"
+    dependencies: List[str] = field(default_factory=list)
+    required_permissions: List[str] = field(default_factory=list)
+    author: Optional[str] = None
+    enabled: bool = True
+
+
+def _fresh(text: str) -> str:
+    """构造一个内容相同但不共享的字符串对象"""
+    return "".join(list(text))
+
+
+def _make_fields(size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"{rng.choice(VOCABULARY)}_{i}",
+            "description": " ".join(rng.sample(VOCABULARY, 8)),
+            "tags": [_fresh(t) for t in rng.sample(TAGS, 3)],
+            "visibility": _fresh(rng.choice(_VISIBILITIES)),
+            "enabled": rng.random() > 0.1,
+        }
+        for i in range(size)
+    ]
+
+
+def _retained_kb(factory: Callable[[], Any]) -> float:
+    tracemalloc.start()
+    objects = factory()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / 1024
+
+
+def _best_us(fn: Callable[[], Any], iterations: int) -> float:
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def bench_size(size: int, iterations: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """对一个 Skill 数量运行内存和扫描测量"""
+    results: Dict[str, Any] = {}
+
+    results["memory_kb"] = {
+        "legacy_dataclass": _retained_kb(
+            lambda: [_LegacyMetadata(**f) for f in _make_fields(size, seed)]
+        ),
+        "slotted_interned": _retained_kb(
+            lambda: [SkillMetadata(**f) for f in _make_fields(size, seed)]
+        ),
+    }
+
+    metadata = {f["name"]: SkillMetadata(**f) for f in _make_fields(size, seed)}
+    start = time.perf_counter()
+    table = MetadataTable(metadata)
+    table.tag_bits
+    results["table_build_us"] = (time.perf_counter() - start) * 1e6
+    results["table_column_kb"] = table.nbytes / 1024
+
+    filters = {
+        "visibility": VisibilityFilter(frozenset(["public"])),
+        "tags_any": TagFilter(frozenset(TAGS[:5])),
+        "visibility_and_tag": CombinedFilter(
+            VisibilityFilter(frozenset(["public", "internal"])), TagFilter(frozenset(TAGS[:20]))
+        ),
+    }
+    scans = {}
+    for label, filter_fn in filters.items():
+        per_row = lambda: [n for n, m in metadata.items() if filter_fn(m)]
+        columnar = lambda: table.select(filter_fn.table_mask(table))
+        assert per_row() == columnar()
+        scans[label] = {
+            "per_row_us": _best_us(per_row, iterations),
+            "columnar_us": _best_us(columnar, iterations),
+            "matches": len(columnar()),
+        }
+    results["scan"] = scans
+    return results
+
+
+def run(sizes: List[int] = None, iterations: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {size: {"memory_kb": {...}, "table_build_us", "table_column_kb", "scan": {...}}}
+    """
+    return {str(size): bench_size(size, iterations, seed) for size in sizes or DEFAULT_SIZES}
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Skill metadata memory and scan benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Skill counts to benchmark")
+    parser.add_argument("--iterations", type=int, default=5, help="Iterations per scan")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.sizes, args.iterations, args.seed), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Prompt 大小基准：per_skill Loader 与 meta 模式（find_skills / load_skill）
+
+对每个 Skill 数量，计算模型在第一轮（尚未加载任何 Skill）实际收到的内容：
+System Prompt + 工具 schema（OpenAI function 格式的 JSON）。
+- per_skill：每个 Skill 一行 Prompt 和一个 Loader schema，随 Skill 数量线性增长
+- meta：固定 Prompt + 两个 Meta Tool，与 Skill 数量无关
+
+token 数由 skill_system.utils.estimate_tokens 计算（未安装 tiktoken 时为估算值，
+输出中的 "counter" 字段标明计数方式）。
+
+运行:
+    python -m skill_system.benchmarks.prompt_tokens --sizes 10 100 1000 5000
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.benchmarks.synthetic import make_registry
+from skill_system.middleware import SkillMiddleware
+from skill_system.utils import estimate_tokens, generate_meta_system_prompt, generate_system_prompt
+from skill_system.utils.tokens import token_counter_name
+
+DEFAULT_SIZES = [10, 100, 1_000, 5_000]
+
+
+def _tool_tokens(tools: List[BaseTool]) -> int:
+    return sum(estimate_tokens(json.dumps(convert_to_openai_tool(t))) for t in tools)
+
+
+def bench_size(size: int, tool_count: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """计算一个 Skill 数量下两种模式的首轮 token 数"""
+    registry = make_registry(size, tool_count, seed)
+    names = registry.list_skills()
+
+    results: Dict[str, Any] = {}
+    for mode, prompt in [
+        ("per_skill", generate_system_prompt(names)),
+        ("meta", generate_meta_system_prompt()),
+    ]:
+        tools = SkillMiddleware(registry, loader_mode=mode)._get_filtered_tools([])
+        prompt_tokens = estimate_tokens(prompt)
+        tool_tokens = _tool_tokens(tools)
+        results[mode] = {
+            "tools": len(tools),
+            "prompt_tokens": prompt_tokens,
+            "tool_schema_tokens": tool_tokens,
+            "total_tokens": prompt_tokens + tool_tokens,
+        }
+
+    results["reduction"] = 1 - results["meta"]["total_tokens"] / results["per_skill"]["total_tokens"]
+    return results
+
+
+def run(sizes: List[int] = None, tool_count: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {"counter": ..., "results": {size: {"per_skill": {...}, "meta": {...}, "reduction": float}}}
+    """
+    sizes = sizes or DEFAULT_SIZES
+    return {
+        "counter": token_counter_name(),
+        "results": {str(size): bench_size(size, tool_count, seed) for size in sizes},
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Prompt token comparison: per_skill vs meta loaders")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Skill counts to compare")
+    parser.add_argument("--tools", type=int, default=3, help="Tools per synthetic skill")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic skills")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.sizes, args.tools, args.seed), indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
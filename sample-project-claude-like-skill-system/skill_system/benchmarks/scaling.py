@@ -0,0 +1,181 @@
+"""
+Registry 规模基准
+
+在不同 Skill 数量下测量 SkillRegistry 各操作的延迟和内存：
+- register：注册全部合成 Skill（包含验证时的工具构建；总耗时、每个 Skill 的耗时、注册后常驻内存）
+- list_skills_filter：list_skills(filter_fn)（可见性过滤）
+- get_all_tools_cold / get_all_tools：注册后首次调用（包含快照发布）与之后的调用
+- get_tools_for_skills_miss / get_tools_for_skills_hit：缓存未命中（每次不同的已加载集合）与命中
+- search：SkillRegistry.search 的几个典型查询
+- generate_system_prompt：为全部 Skill 生成 System Prompt
+
+输出 JSON（键顺序固定，不含时间戳），可以直接在不同版本之间 diff。
+完全离线运行，只依赖本地代码。
+
+运行:
+    python -m skill_system.benchmarks.scaling --sizes 1000 10000 --tools 3 --output scaling.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.benchmarks.synthetic import TAGS, VOCABULARY, make_skills
+from skill_system.core.registry import SkillRegistry
+from skill_system.utils import generate_system_prompt
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+
+SEARCH_QUERIES = [
+    {"query": VOCABULARY[500], "limit": 10},
+    {"query": f"{VOCABULARY[700]} {VOCABULARY[900]}", "limit": 10},
+    {"tags": [TAGS[3]], "visibility": "public", "limit": 10},
+    {"query": "skill", "limit": 10},
+]
+
+
+def _timed(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """
+    测量 fn 的耗时（微秒）和单次调用的峰值内存分配（KB）
+
+    计时与内存分开测量：tracemalloc 会显著拖慢被测代码
+    """
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "avg_us": sum(samples) / len(samples),
+        "p50_us": samples[len(samples) // 2],
+        "max_us": samples[-1],
+        "peak_kb": peak / 1024,
+    }
+
+
+def _once(fn: Callable[[], Any]) -> Dict[str, float]:
+    """只能执行一次的操作（如冷启动）：同时测量耗时和内存"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "total_ms": elapsed * 1e3,
+        "retained_kb": current / 1024,
+        "peak_kb": peak / 1024,
+    }
+
+
+def bench_size(size: int, tool_count: int, iterations: int, seed: int = 0) -> Dict[str, Any]:
+    """对一个 Skill 数量运行全部测量"""
+    skills = make_skills(size, tool_count, seed)
+    names = [s.name for s in skills]
+    registry = SkillRegistry()
+
+    def register_all():
+        for skill in skills:
+            registry.register(skill)
+
+    results: Dict[str, Any] = {}
+    results["register"] = _once(register_all)
+    results["register"]["per_skill_us"] = results["register"]["total_ms"] * 1e3 / size
+
+    public_only = VisibilityFilter(frozenset(["public"]))
+    results["list_skills_filter"] = _timed(lambda: registry.list_skills(public_only), iterations)
+
+    results["get_all_tools_cold"] = _once(lambda: registry.get_all_tools())
+    results["get_all_tools"] = _timed(lambda: registry.get_all_tools(), iterations)
+
+    rng = random.Random(seed)
+    loaded_sets = [rng.sample(names, min(3, size)) for _ in range(iterations)]
+    pending = iter(loaded_sets)
+    results["get_tools_for_skills_miss"] = _timed(
+        lambda: registry.get_tools_for_skills(next(pending, loaded_sets[0]), public_only),
+        iterations
+    )
+    results["get_tools_for_skills_hit"] = _timed(
+        lambda: registry.get_tools_for_skills(loaded_sets[0], public_only),
+        iterations
+    )
+
+    results["search"] = {
+        json.dumps(params, sort_keys=True): _timed(lambda: registry.search(**params), iterations)
+        for params in SEARCH_QUERIES
+    }
+
+    prompt = generate_system_prompt(names)
+    results["generate_system_prompt"] = _timed(lambda: generate_system_prompt(names), iterations)
+    results["generate_system_prompt"]["prompt_chars"] = len(prompt)
+
+    return results
+
+
+def run(
+    sizes: Optional[List[int]] = None,
+    tool_count: int = 3,
+    iterations: int = 20,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {"config": {...}, "environment": {...}, "results": {size: {operation: {...}}}}
+    """
+    sizes = sizes or DEFAULT_SIZES
+    return {
+        "config": {
+            "sizes": sizes,
+            "tools_per_skill": tool_count,
+            "iterations": iterations,
+            "seed": seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "results": {
+            str(size): bench_size(size, tool_count, iterations, seed) for size in sizes
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="SkillRegistry scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Skill counts to benchmark")
+    parser.add_argument("--tools", type=int, default=3, help="Tools per synthetic skill")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations per operation")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic skills")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.tools, args.iterations, args.seed)
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Skill 搜索基准
+
+对比倒排索引（SkillSearchIndex）与旧的全量扫描在不同 Skill 数量下的查询延迟，
+用于证明搜索开销不随 Skill 总数线性增长。
+
+运行:
+    python -m skill_system.benchmarks.search --sizes 1000 10000 50000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.benchmarks.synthetic import TAGS, VOCABULARY
+from skill_system.core.base_skill import SkillMetadata
+from skill_system.core.search_index import SkillSearchIndex
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+
+_VISIBILITIES = ["public", "internal", "private"]
+
+QUERIES = [
+    {"query": VOCABULARY[500], "limit": 10},
+    {"query": f"{VOCABULARY[700]} {VOCABULARY[900]}", "limit": 10},
+    {"query": VOCABULARY[1200], "visibility": "public", "limit": 10},
+    {"tags": [TAGS[3], TAGS[7]], "limit": 10},
+    {"query": VOCABULARY[1500][:4], "tags": [TAGS[11]], "limit": 10},
+    {"query": VOCABULARY[1800]},
+]
+
+
+def make_metadata(count: int, seed: int = 0) -> List[SkillMetadata]:
+    """生成可复现的合成 Skill 元数据"""
+    rng = random.Random(seed)
+    metas = []
+    for i in range(count):
+        words = rng.sample(VOCABULARY, 2)
+        metas.append(SkillMetadata(
+            name=f"{words[0]}_{words[1]}_{i}",
+            description=" ".join(rng.sample(VOCABULARY, 8)) + f" skill number {i}",
+            tags=rng.sample(TAGS, 3),
+            visibility=rng.choice(_VISIBILITIES),
+        ))
+    return metas
+
+
+def linear_search(
+    metas: List[SkillMetadata],
+    query: str = "",
+    tags: Optional[List[str]] = None,
+    visibility: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[SkillMetadata]:
+    """旧版 SkillRegistry.search 的全量扫描实现（作为基线）"""
+    results = []
+    for meta in metas:
+        if query:
+            if query.lower() not in meta.name.lower() and \
+               query.lower() not in meta.description.lower():
+                continue
+        if tags:
+            if not any(tag in meta.tags for tag in tags):
+                continue
+        if visibility and meta.visibility != visibility:
+            continue
+        results.append(meta)
+    return results[:limit] if limit else results
+
+
+def _avg_us(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run(sizes: List[int] = None, iterations: int = 50) -> Dict[str, Any]:
+    """
+    运行基准
+
+    Returns:
+        {size: {"build_ms": ..., "queries": [{"params", "indexed_us", "linear_us", "hits"}]}}
+    """
+    results = {}
+    for size in sizes or DEFAULT_SIZES:
+        metas = make_metadata(size)
+
+        index = SkillSearchIndex()
+        start = time.perf_counter()
+        for meta in metas:
+            index.add(meta)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        queries = []
+        for params in QUERIES:
+            # 基线没有排序能力，只按相同过滤条件扫描
+            queries.append({
+                "params": params,
+                "hits": len(index.search(**params)),
+                "indexed_us": _avg_us(lambda: index.search(**params), iterations),
+                "linear_us": _avg_us(lambda: linear_search(metas, **params), iterations),
+            })
+
+        results[str(size)] = {"build_ms": build_ms, "queries": queries}
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Skill search benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Skill counts to benchmark")
+    parser.add_argument("--iterations", type=int, default=50, help="Iterations per query")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.sizes, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+合成 Skill 生成器
+
+为基准生成可复现的 BaseSkill 子类实例：名称、描述、标签、可见性由种子决定，
+工具数量可配置。工具使用 JSON schema 构建（与清单代理相同的方式），
+避免为每个合成工具生成 pydantic 模型，使测量集中在 Registry 自身的开销上。
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from skill_system.core.base_skill import BaseSkill, SkillMetadata
+from skill_system.core.registry import SkillRegistry
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pu", "da", "fe", "gi", "ho"]
+_VISIBILITIES = ["public", "public", "internal", "private"]
+
+_PARAMETERS: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "text": {"type": "string", "description": "Input text"},
+        "limit": {"type": "integer", "description": "Maximum number of results"},
+    },
+    "required": ["text"],
+}
+
+
+def make_vocabulary(size: int = 2000, seed: int = 1) -> List[str]:
+    """生成互不为前缀的合成词表（避免前缀匹配放大命中数）"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(_SYLLABLES) for _ in range(3)) + "x")
+    return sorted(words)
+
+
+VOCABULARY = make_vocabulary()
+TAGS = VOCABULARY[:200]
+
+
+class SyntheticSkill(BaseSkill):
+    """参数化的合成 Skill"""
+
+    def __init__(
+        self,
+        name: str,
+        tool_count: int = 3,
+        description: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        visibility: str = "public",
+        revision: int = 0
+    ):
+        super().__init__()
+        self.name = name
+        self.tool_count = tool_count
+        self.revision = revision
+        self._metadata = SkillMetadata(
+            name=name,
+            description=description or f"synthetic {name} skill revision {revision}",
+            tags=tags or ["synthetic"],
+            visibility=visibility,
+        )
+
+    @property
+    def metadata(self) -> SkillMetadata:
+        return self._metadata
+
+    def build_tools(self) -> List[BaseTool]:
+        return [
+            StructuredTool(
+                name=f"{self.name}_tool{i}",
+                description=f"Tool {i} of {self.name}. {self._metadata.description}",
+                args_schema=_PARAMETERS,
+                func=lambda **kwargs: kwargs.get("text", ""),
+            )
+            for i in range(self.tool_count)
+        ]
+
+    def build_loader_tool(self) -> BaseTool:
+        return StructuredTool(
+            name=f"skill_{self.name}",
+            description=f"Load {self.name.replace('_', ' ')} capabilities. {self._metadata.description}",
+            args_schema={"type": "object", "properties": {}},
+            func=lambda: "loaded",
+        )
+
+
+def make_skills(count: int, tool_count: int = 3, seed: int = 0) -> List[SyntheticSkill]:
+    """生成 count 个可复现的合成 Skill"""
+    rng = random.Random(seed)
+    skills = []
+    for i in range(count):
+        words = rng.sample(VOCABULARY, 2)
+        skills.append(SyntheticSkill(
+            name=f"{words[0]}_{words[1]}_{i}",
+            tool_count=tool_count,
+            description=" ".join(rng.sample(VOCABULARY, 8)) + f" skill number {i}",
+            tags=rng.sample(TAGS, 3),
+            visibility=rng.choice(_VISIBILITIES),
+        ))
+    return skills
+
+
+def make_registry(count: int, tool_count: int = 3, seed: int = 0) -> SkillRegistry:
+    """生成并注册 count 个合成 Skill"""
+    registry = SkillRegistry()
+    for skill in make_skills(count, tool_count, seed):
+        registry.register(skill)
+    return registry
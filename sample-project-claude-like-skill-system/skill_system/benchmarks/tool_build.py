@@ -0,0 +1,103 @@
+"""
+工具构建开销基准
+
+对比两种方式获取 Skill 工具的开销：
+- rebuild：每次都重新构建 @tool 闭包（旧行为，等价于每次调用 rebuild_tools()）
+- cached：BaseSkill 缓存的工具实例（get_tools() / get_loader_tool()）
+
+同时单独统计 pydantic 参数 schema 生成（model_json_schema）的耗时。
+
+运行:
+    python -m skill_system.benchmarks.tool_build --skills-dir skill_system/skills --iterations 200
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core.base_skill import BaseSkill
+from skill_system.core.registry import SkillRegistry
+
+
+def _measure(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """测量 fn 的平均耗时（微秒）和峰值内存分配（KB）"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "avg_us": elapsed / iterations * 1e6,
+        "peak_kb": peak / 1024,
+    }
+
+
+def _schema_cost(skill: BaseSkill, iterations: int) -> Dict[str, float]:
+    """测量为该 Skill 的所有工具生成 JSON schema 的耗时"""
+    def generate():
+        for t in skill.get_tools():
+            if t.args_schema is not None:
+                t.args_schema.model_json_schema()
+
+    return _measure(generate, iterations)
+
+
+def run(skills_dir: Path, iterations: int = 200) -> Dict[str, Dict[str, Any]]:
+    """
+    对 skills_dir 下的所有 Skill 运行基准
+
+    Args:
+        skills_dir: Skills 根目录
+        iterations: 每项测量的迭代次数
+
+    Returns:
+        {skill_name: {"rebuild": ..., "cached": ..., "schema": ...}}
+    """
+    registry = SkillRegistry()
+    registry.discover_and_load(skills_dir, use_manifest=False)
+
+    results = {}
+    for name in registry.list_skills():
+        skill = registry.get(name)
+
+        def rebuild():
+            skill.rebuild_tools()
+            skill.get_tools()
+            skill.get_loader_tool()
+
+        def cached():
+            skill.get_tools()
+            skill.get_loader_tool()
+
+        results[name] = {
+            "tools": len(skill.get_tools()),
+            "rebuild": _measure(rebuild, iterations),
+            "cached": _measure(cached, iterations),
+            "schema": _schema_cost(skill, iterations),
+        }
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Skill tool build benchmark")
+    parser.add_argument("--skills-dir", type=Path, default=Path(__file__).parent.parent / "skills",
+                        help="Skills directory to benchmark")
+    parser.add_argument("--iterations", type=int, default=200, help="Iterations per measurement")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.skills_dir, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
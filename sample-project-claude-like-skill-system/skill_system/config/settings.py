@@ -15,15 +15,35 @@ class SkillSystemConfig:
     Skill System 配置
 
     Attributes:
-        skills_dir: Skills 目录路径
+        skills_dir: Skills 目录路径（也可以是 build_bundle() 生成的预编译 zip）
         state_mode: 状态管理模式 (replace/accumulate/fifo)
         max_concurrent_skills: FIFO 模式下最大同时加载的 Skill 数
         verbose: 是否启用详细日志
         default_model: 默认 LLM 模型
         middleware_enabled: 是否启用中间件
+        loader_mode: Skill 激活方式（per_skill: 每个 Skill 一个 Loader | meta: find_skills / load_skill）
+        meta_search_limit: meta 模式下 find_skills 最多返回的 Skill 数
+        group_loaders: 是否按 SkillMetadata.group 两级加载（先打开分组，再加载 Skill）
+        auto_activate_skills: 模型直接调用未加载 Skill 的工具时是否自动激活该 Skill
         auto_discover: 是否自动发现 Skills
+        use_manifest: 是否使用 skill.yaml 清单延迟导入 Skill 模块
+        discovery_workers: 并行发现 Skills 的线程数（1 表示串行）
+        registry_cache_path: 磁盘注册缓存文件路径（None 表示不使用缓存）
+        hot_reload: 是否监视 skills_dir 并热重载变化的 Skills（关闭时使用说明和工具在
+            首次访问后缓存，修改 Skill 文件需要重启，或调用 skill.invalidate_instructions() / rebuild_tools()）
+        hot_reload_interval: 热重载检查间隔（秒）
         filter_by_visibility: 按可见性过滤 Skills
         allowed_visibilities: 允许的可见性级别列表
+        router_enabled: 是否在第一次模型调用前按用户消息预先激活 Skills
+        router_threshold: 路由激活所需的最低 BM25 得分
+        router_max_skills: 每条消息最多预先激活的 Skill 数
+        user_permissions: 用户被授予的权限（Skill 的 required_permissions 全部被授予时才可见）
+        tool_rate_limits: 工具名称 -> {rate, burst, max_in_flight}（每秒调用数、令牌桶容量、并发上限）
+        skill_rate_limits: Skill 名称 -> 同上（作用于该 Skill 全部工具的调用之和）
+        rate_limit_timeout: 受限调用最多等待的秒数（0 表示超出限制时立即拒绝）
+        tool_cache_size: 可缓存工具（cacheable()）的结果缓存容量（0 表示不缓存）
+        tool_cache_ttl: 工具没有声明 ttl 时结果的有效期（秒，None 表示不过期）
+        tool_concurrency: 一轮中多个工具调用最多同时执行的数量（None 使用 LangGraph 默认线程池大小）
     """
     # 基础路径配置
     skills_dir: Path = Path("./skills")
@@ -43,10 +63,24 @@ class SkillSystemConfig:
 
     # 中间件配置
     middleware_enabled: bool = True
+    loader_mode: str = "per_skill"  # per_skill, meta（Prompt 大小与 Skill 数量无关）
+    meta_search_limit: int = 5
+    group_loaders: bool = False  # 可见 Loader 数取决于分组数而非 Skill 总数
+    auto_activate_skills: bool = True  # 跳过 Loader 的工具调用照常执行并激活 Skill
+
+    # 轮前路由配置（跳过 Loader 轮）
+    router_enabled: bool = False
+    router_threshold: float = 3.0
+    router_max_skills: int = 1
 
     # Skill 发现配置
     auto_discover: bool = True
     skill_module_name: str = "skill"  # skill.py
+    use_manifest: bool = True  # 存在 skill.yaml 时延迟导入 skill.py
+    discovery_workers: int = 1  # 并行解析/导入 Skills 的线程数
+    registry_cache_path: Optional[Path] = None  # 按内容哈希缓存 Skill 元数据和 schema
+    hot_reload: bool = False  # 监视 skills_dir，只重新导入变化的 Skill（关闭时文件修改需重启才生效）
+    hot_reload_interval: float = 1.0  # 轮询间隔（秒）
 
     # 过滤配置
     filter_by_visibility: bool = True
@@ -55,6 +89,18 @@ class SkillSystemConfig:
     # 权限配置（可选）
     user_permissions: List[str] = field(default_factory=list)
 
+    # 速率限制配置（任一非空时使用 RateLimitedPermissionAwareSkillMiddleware）
+    tool_rate_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    skill_rate_limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    rate_limit_timeout: float = 30.0
+
+    # 工具结果缓存配置（只缓存声明为 cacheable 的工具）
+    tool_cache_size: int = 1024
+    tool_cache_ttl: Optional[float] = None
+
+    # 工具并发执行配置（同一轮中的多个工具调用并行执行）
+    tool_concurrency: Optional[int] = None
+
     # 自定义配置
     custom_config: Dict[str, Any] = field(default_factory=dict)
 
@@ -63,6 +109,8 @@ class SkillSystemConfig:
         # 确保路径是 Path 对象
         if not isinstance(self.skills_dir, Path):
             self.skills_dir = Path(self.skills_dir)
+        if self.registry_cache_path is not None and not isinstance(self.registry_cache_path, Path):
+            self.registry_cache_path = Path(self.registry_cache_path)
 
         # 验证状态模式
         valid_modes = ["replace", "accumulate", "fifo"]
@@ -72,6 +120,17 @@ class SkillSystemConfig:
                 f"Must be one of {valid_modes}"
             )
 
+        # 验证 Loader 模式
+        valid_loader_modes = ["per_skill", "meta"]
+        if self.loader_mode not in valid_loader_modes:
+            raise ValueError(
+                f"Invalid loader_mode: {self.loader_mode}. "
+                f"Must be one of {valid_loader_modes}"
+            )
+
+        if self.tool_concurrency is not None and self.tool_concurrency < 1:
+            raise ValueError(f"tool_concurrency must be at least 1, got {self.tool_concurrency}")
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -84,11 +143,31 @@ class SkillSystemConfig:
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
             "middleware_enabled": self.middleware_enabled,
+            "loader_mode": self.loader_mode,
+            "meta_search_limit": self.meta_search_limit,
+            "group_loaders": self.group_loaders,
+            "auto_activate_skills": self.auto_activate_skills,
+            "router_enabled": self.router_enabled,
+            "router_threshold": self.router_threshold,
+            "router_max_skills": self.router_max_skills,
             "auto_discover": self.auto_discover,
             "skill_module_name": self.skill_module_name,
+            "use_manifest": self.use_manifest,
+            "discovery_workers": self.discovery_workers,
+            "registry_cache_path": (
+                str(self.registry_cache_path) if self.registry_cache_path else None
+            ),
+            "hot_reload": self.hot_reload,
+            "hot_reload_interval": self.hot_reload_interval,
             "filter_by_visibility": self.filter_by_visibility,
             "allowed_visibilities": self.allowed_visibilities,
             "user_permissions": self.user_permissions,
+            "tool_rate_limits": self.tool_rate_limits,
+            "skill_rate_limits": self.skill_rate_limits,
+            "rate_limit_timeout": self.rate_limit_timeout,
+            "tool_cache_size": self.tool_cache_size,
+            "tool_cache_ttl": self.tool_cache_ttl,
+            "tool_concurrency": self.tool_concurrency,
             "custom_config": self.custom_config,
         }
 
@@ -141,18 +220,38 @@ def load_config(
         f"{env_prefix}DEFAULT_MODEL": "default_model",
         f"{env_prefix}TEMPERATURE": "temperature",
         f"{env_prefix}MIDDLEWARE_ENABLED": "middleware_enabled",
+        f"{env_prefix}LOADER_MODE": "loader_mode",
+        f"{env_prefix}META_SEARCH_LIMIT": "meta_search_limit",
+        f"{env_prefix}GROUP_LOADERS": "group_loaders",
+        f"{env_prefix}AUTO_ACTIVATE_SKILLS": "auto_activate_skills",
+        f"{env_prefix}ROUTER_ENABLED": "router_enabled",
+        f"{env_prefix}ROUTER_THRESHOLD": "router_threshold",
+        f"{env_prefix}ROUTER_MAX_SKILLS": "router_max_skills",
         f"{env_prefix}AUTO_DISCOVER": "auto_discover",
+        f"{env_prefix}USE_MANIFEST": "use_manifest",
+        f"{env_prefix}DISCOVERY_WORKERS": "discovery_workers",
+        f"{env_prefix}REGISTRY_CACHE_PATH": "registry_cache_path",
+        f"{env_prefix}HOT_RELOAD": "hot_reload",
+        f"{env_prefix}HOT_RELOAD_INTERVAL": "hot_reload_interval",
+        f"{env_prefix}RATE_LIMIT_TIMEOUT": "rate_limit_timeout",
+        f"{env_prefix}TOOL_CACHE_SIZE": "tool_cache_size",
+        f"{env_prefix}TOOL_CACHE_TTL": "tool_cache_ttl",
+        f"{env_prefix}TOOL_CONCURRENCY": "tool_concurrency",
     }
 
     for env_key, config_key in env_mappings.items():
         if env_key in os.environ:
             value = os.environ[env_key]
             # 类型转换
-            if config_key in ["max_concurrent_skills"]:
+            if config_key in ["max_concurrent_skills", "discovery_workers", "meta_search_limit",
+                              "router_max_skills", "tool_cache_size", "tool_concurrency"]:
                 value = int(value)
-            elif config_key in ["temperature"]:
+            elif config_key in ["temperature", "router_threshold", "hot_reload_interval",
+                                "rate_limit_timeout", "tool_cache_ttl"]:
                 value = float(value)
-            elif config_key in ["verbose", "middleware_enabled", "auto_discover"]:
+            elif config_key in ["verbose", "middleware_enabled", "auto_discover",
+                                "use_manifest", "router_enabled", "hot_reload",
+                                "group_loaders", "auto_activate_skills"]:
                 value = value.lower() in ["true", "1", "yes"]
             config_dict[config_key] = value
 
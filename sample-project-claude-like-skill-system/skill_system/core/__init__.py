@@ -6,17 +6,61 @@ Claude-Style Skills System - Core Module
 from .base_skill import BaseSkill, SkillMetadata
 from .state import SkillState, skill_list_reducer, skill_list_accumulator, skill_list_fifo
 from .registry import SkillRegistry
-from .exceptions import SkillError, SkillNotFoundError, SkillLoadError
+from .snapshot import RegistrySnapshot
+from .metadata_table import MetadataTable, TagFilter, CombinedFilter
+from .permissions import PermissionFilter, compile_permissions
+from .overlay import SkillRegistryOverlay
+from .discovery import DiscoveryResult, SkillLoadReport
+from .search_index import SkillSearchIndex
+from .router import SkillRouter, RouterMetrics
+from .meta_tools import create_meta_tools
+from .registry_cache import RegistryCache, fingerprint_skill_dir
+from .manifest import ManifestSkill, load_manifest, build_manifest, write_manifest
+from .bundle import SkillBundle, build_bundle
+from .result_cache import ToolResultCache, cacheable
+from .watcher import SkillWatcher, ReloadEvent
+from .exceptions import (
+    SkillError, SkillNotFoundError, SkillLoadError, SkillDependencyError, SkillPermissionError,
+    SkillRateLimitError,
+)
 
 __all__ = [
     "BaseSkill",
     "SkillMetadata",
     "SkillState",
     "SkillRegistry",
+    "RegistrySnapshot",
+    "MetadataTable",
+    "TagFilter",
+    "CombinedFilter",
+    "PermissionFilter",
+    "compile_permissions",
+    "SkillRegistryOverlay",
+    "DiscoveryResult",
+    "SkillLoadReport",
+    "SkillSearchIndex",
+    "SkillRouter",
+    "RouterMetrics",
+    "create_meta_tools",
+    "RegistryCache",
+    "fingerprint_skill_dir",
+    "ManifestSkill",
+    "load_manifest",
+    "build_manifest",
+    "write_manifest",
+    "SkillBundle",
+    "build_bundle",
+    "ToolResultCache",
+    "cacheable",
+    "SkillWatcher",
+    "ReloadEvent",
     "skill_list_reducer",
     "skill_list_accumulator",
     "skill_list_fifo",
     "SkillError",
     "SkillNotFoundError",
     "SkillLoadError",
+    "SkillDependencyError",
+    "SkillPermissionError",
+    "SkillRateLimitError",
 ]
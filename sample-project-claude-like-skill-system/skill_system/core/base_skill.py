@@ -2,18 +2,28 @@
 Skill 基类和元数据定义
 """
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from langchain_core.tools import BaseTool
 from pathlib import Path
 
+from .loader_action import with_first_action
+from .permissions import compile_permissions
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SkillMetadata:
     """
     Skill 元数据
 
+    不可变且使用 __slots__（没有实例 __dict__）：同一个实例在 Registry、快照和
+    租户叠加层之间共享，修改请使用 dataclasses.replace()。
+    tags、dependencies、required_permissions 构造时转换为元组（传入列表也可以），
+    因此元数据整体不可变且可哈希；to_dict() 仍输出列表。
+    visibility、tags、group 中的字符串被驻留（sys.intern），大量 Skill 共享同一份字符串
+
     Attributes:
         name: Skill 唯一标识符
         description: Skill 功能描述
@@ -24,16 +34,37 @@ class SkillMetadata:
         required_permissions: 需要的权限列表
         author: 作者
         enabled: 是否启用
+        group: 所属分组（None 表示不分组，Loader 始终直接可见）
+        permission_mask: required_permissions 编译后的位掩码（构造时计算，见 core.permissions）
     """
     name: str
     description: str
     version: str = "1.0.0"
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
     visibility: str = "public"  # public, internal, private
-    dependencies: List[str] = field(default_factory=list)
-    required_permissions: List[str] = field(default_factory=list)
+    dependencies: Tuple[str, ...] = ()
+    required_permissions: Tuple[str, ...] = ()
     author: Optional[str] = None
     enabled: bool = True
+    group: Optional[str] = None
+    permission_mask: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 清单或缓存中写成 "visibility:"（null）时按默认的 public 处理
+        if self.visibility is None:
+            object.__setattr__(self, "visibility", "public")
+        elif not isinstance(self.visibility, str):
+            raise ValueError(
+                f"Skill '{self.name}' has invalid visibility {self.visibility!r} (expected a string)"
+            )
+        object.__setattr__(self, "visibility", sys.intern(self.visibility))
+        object.__setattr__(self, "tags", tuple(sys.intern(t) for t in self.tags or ()))
+        object.__setattr__(self, "dependencies", tuple(self.dependencies or ()))
+        object.__setattr__(self, "required_permissions", tuple(self.required_permissions or ()))
+        if self.group is not None:
+            object.__setattr__(self, "group", sys.intern(self.group))
+        if self.required_permissions:
+            object.__setattr__(self, "permission_mask", compile_permissions(self.required_permissions))
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -41,12 +72,13 @@ class SkillMetadata:
             "name": self.name,
             "description": self.description,
             "version": self.version,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "visibility": self.visibility,
-            "dependencies": self.dependencies,
-            "required_permissions": self.required_permissions,
+            "dependencies": list(self.dependencies),
+            "required_permissions": list(self.required_permissions),
             "author": self.author,
             "enabled": self.enabled,
+            "group": self.group,
         }
 
 
@@ -56,9 +88,16 @@ class BaseSkill(ABC):
 
     每个具体的 Skill 都应继承此类并实现：
     1. metadata 属性：返回 SkillMetadata
-    2. get_tools() 方法：返回该 Skill 的工具列表
-    3. get_loader_tool() 方法：返回用于加载该 Skill 的 Loader Tool
-    4. get_instructions() 方法：返回 Skill 激活后的使用说明
+    2. build_tools() 方法：构建该 Skill 的工具列表
+    3. build_loader_tool() 方法：构建用于加载该 Skill 的 Loader Tool
+    4. load_instructions() 方法：读取 Skill 激活后的使用说明（可选）
+
+    工具和 Loader 在首次访问时构建一次并缓存在实例上，
+    get_tools() / get_loader_tool() 之后只返回缓存；需要重新构建时调用 rebuild_tools()。
+    使用说明同样只读取一次（get_instructions() 返回缓存），Loader 调用路径上没有文件 I/O；
+    缓存不检查文件修改时间：启用热重载（SkillWatcher）时文件变化会用新实例替换该 Skill；
+    未启用时修改 instructions.md 或 Skill 代码需要重启进程，或调用 invalidate_instructions() / rebuild_tools()。
+    直接重写 get_tools() / get_loader_tool() / get_instructions() 的旧式 Skill 仍然可用，只是不享受缓存。
     """
 
     def __init__(self, skill_dir: Optional[Path] = None):
@@ -68,36 +107,74 @@ class BaseSkill(ABC):
         """
         self.skill_dir = skill_dir
         self._metadata: Optional[SkillMetadata] = None
+        self._tools: Optional[List[BaseTool]] = None
+        self._loader_tool: Optional[BaseTool] = None
+        self._instructions: Optional[str] = None
+        self._instruction_tokens: Optional[Tuple[str, int]] = None
 
     @property
     @abstractmethod
     def metadata(self) -> SkillMetadata:
-        """返回 Skill 元数据"""
+        """
+        返回 Skill 声明的元数据
+
+        注册后的运行时状态（如 set_enabled 设置的 enabled）以 Registry 中的元数据为准，
+        见 SkillRegistry.get_metadata()
+        """
         pass
 
-    @abstractmethod
+    def build_tools(self) -> List[BaseTool]:
+        """
+        构建该 Skill 包含的所有工具
+
+        每个实例只调用一次（或在 rebuild_tools() 之后再调用一次）
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement build_tools() or get_tools()"
+        )
+
+    def build_loader_tool(self) -> BaseTool:
+        """
+        构建用于加载该 Skill 的 Loader Tool
+
+        每个实例只调用一次（或在 rebuild_tools() 之后再调用一次）
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} must implement build_loader_tool() or get_loader_tool()"
+        )
+
     def get_tools(self) -> List[BaseTool]:
         """
         返回该 Skill 包含的所有工具
 
         这些工具只有在 Skill 被激活后才对 Agent 可见
         """
-        pass
+        if self._tools is None:
+            self._tools = list(self.build_tools())
+        return list(self._tools)
 
-    @abstractmethod
     def get_loader_tool(self) -> BaseTool:
         """
         返回用于加载该 Skill 的 Loader Tool
 
         Loader Tool 始终对 Agent 可见，用于激活 Skill
         """
-        pass
-
-    def get_instructions(self) -> str:
+        if self._loader_tool is None:
+            self._loader_tool = with_first_action(self.build_loader_tool(), self)
+        return self._loader_tool
+
+    def rebuild_tools(self) -> None:
+        """丢弃已缓存的工具和 Loader，并立即重新构建"""
+        self._tools = None
+        self._loader_tool = None
+        self.get_tools()
+        self.get_loader_tool()
+
+    def load_instructions(self) -> str:
         """
-        返回 Skill 激活后的使用说明
+        读取 Skill 激活后的使用说明
 
-        当 Loader Tool 被调用时，会返回这段说明给 Agent
+        每个实例只调用一次（或在 invalidate_instructions() 之后再调用一次）
         默认实现从 instructions.md 文件读取
         """
         if self.skill_dir:
@@ -116,6 +193,34 @@ Available tools:
 Use these tools to accomplish tasks related to: {', '.join(self.metadata.tags)}
 """
 
+    def get_instructions(self) -> str:
+        """
+        返回 Skill 激活后的使用说明
+
+        当 Loader Tool 被调用时，会返回这段说明给 Agent（首次调用时读取并缓存）。
+        缓存之后不再检查文件：未启用热重载时修改说明文件需要调用 invalidate_instructions() 或重启
+        """
+        if self._instructions is None:
+            self._instructions = self.load_instructions()
+        return self._instructions
+
+    @property
+    def instruction_tokens(self) -> int:
+        """使用说明的估算 token 数（即每次激活该 Skill 写入上下文的大小）"""
+        instructions = self.get_instructions()
+        cached = self._instruction_tokens
+        if cached is None or cached[0] is not instructions:
+            from ..utils.tokens import estimate_tokens  # utils 依赖 core，延迟导入避免循环
+
+            cached = (instructions, estimate_tokens(instructions))
+            self._instruction_tokens = cached
+        return cached[1]
+
+    def invalidate_instructions(self) -> None:
+        """丢弃已缓存的使用说明，下次访问时重新读取"""
+        self._instructions = None
+        self._instruction_tokens = None
+
     def validate(self) -> bool:
         """
         验证 Skill 配置是否正确
@@ -0,0 +1,205 @@
+"""
+Skill Bundle - 预编译的 Skills 归档（冷启动加速）
+
+把一个 Skills 目录打包为单个 zip：
+- 每个 Skill 目录下的 .py 编译为 .pyc（不含源码，基于哈希、不校验源码）
+- instructions.md 等其它文件原样保留
+- 根目录的 bundle.json 记录每个 Skill 的清单（元数据、工具 schema、使用说明）
+  以及打包时解释器的字节码版本（importlib.util.MAGIC_NUMBER）
+
+.pyc 只能被同一字节码版本的解释器加载，版本不同时打开归档即报错，需要用当前解释器重新打包。
+
+加载时只打开一个文件、解析一个 JSON，不遍历目录、不编译源码；
+Skill 模块通过 zipimport 从归档中导入，默认直到 Loader 首次被调用时才导入。
+
+打包:
+    python -m skill_system.core.bundle ./skills ./skills.zip
+
+使用:
+    registry.discover(Path("./skills.zip"))   # 或 SkillSystemConfig(skills_dir="./skills.zip")
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import py_compile
+import tempfile
+import types
+import zipfile
+import zipimport
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .exceptions import SkillLoadError
+from .manifest import build_manifest
+from .registry_cache import _IGNORED_DIRS
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_INDEX_NAME = "bundle.json"
+
+# 归档格式变化时递增，旧归档需要重新打包
+BUNDLE_VERSION = 1
+
+# 固定的条目时间戳，相同内容打包出相同的归档
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def build_bundle(skills_dir: Path, output: Path, module_name: str = "skill") -> List[str]:
+    """
+    把 Skills 目录打包为预编译归档
+
+    每个 Skill 会被导入一次以生成清单；任一 Skill 加载失败时打包失败
+
+    Args:
+        skills_dir: Skills 根目录
+        output: 输出的 zip 文件路径
+        module_name: Skill 模块文件名
+
+    Returns:
+        打包的 Skill 名称（按目录名顺序）
+
+    Raises:
+        SkillLoadError: Skill 加载或编译失败
+    """
+    from .registry import SkillRegistry
+
+    skills_dir = Path(skills_dir)
+    skill_paths = sorted(
+        p for p in skills_dir.iterdir()
+        if p.is_dir() and (p / f"{module_name}.py").exists()
+    )
+
+    loader = SkillRegistry()
+    entries = []
+    with tempfile.TemporaryDirectory() as tmp, \
+            zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for skill_path in skill_paths:
+            skill = loader.load_skill(skill_path, module_name, use_manifest=False)
+            manifest = build_manifest(skill)
+            manifest["instructions"] = skill.get_instructions()
+            entries.append({"dir": skill_path.name, "manifest": manifest})
+
+            for path in sorted(skill_path.rglob("*")):
+                relative = path.relative_to(skills_dir)
+                if not path.is_file() or _IGNORED_DIRS.intersection(relative.parts):
+                    continue
+                if path.suffix == ".py":
+                    _write(archive, relative.with_suffix(".pyc"), _compile(path, relative, Path(tmp)))
+                else:
+                    _write(archive, relative, path.read_bytes())
+
+        index = {
+            "version": BUNDLE_VERSION,
+            "magic": importlib.util.MAGIC_NUMBER.hex(),
+            "module_name": module_name,
+            "skills": entries,
+        }
+        _write(archive, Path(BUNDLE_INDEX_NAME), json.dumps(index, ensure_ascii=False).encode("utf-8"))
+
+    logger.info(f"Bundled {len(entries)} skills from {skills_dir} into {output}")
+    return [entry["manifest"]["name"] for entry in entries]
+
+
+def _compile(source: Path, relative: Path, tmp_dir: Path) -> bytes:
+    """把源码编译为 .pyc 字节（UNCHECKED_HASH：不依赖时间戳，运行时不查找源码）"""
+    cfile = tmp_dir / "module.pyc"
+    try:
+        py_compile.compile(
+            str(source),
+            cfile=str(cfile),
+            dfile=relative.as_posix(),
+            doraise=True,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+    except py_compile.PyCompileError as e:
+        raise SkillLoadError(source.parent.name, f"Failed to compile {source.name}: {e.msg}")
+    return cfile.read_bytes()
+
+
+def _write(archive: zipfile.ZipFile, name: Path, data: bytes) -> None:
+    info = zipfile.ZipInfo(name.as_posix(), date_time=_ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    archive.writestr(info, data)
+
+
+class SkillBundle:
+    """
+    已打开的 Skill 归档（只读）
+
+    归档在对象存活期间保持打开，延迟导入的 Skill 通过它读取模块和文件
+    """
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: build_bundle() 生成的 zip 文件
+
+        Raises:
+            SkillLoadError: 不是有效的 Skill 归档，或归档格式 / 字节码版本与当前解释器不匹配
+        """
+        self.path = Path(path)
+        try:
+            self._archive = zipfile.ZipFile(self.path)
+            index = json.loads(self._archive.read(BUNDLE_INDEX_NAME))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise SkillLoadError(self.path.name, f"Invalid skill bundle: {e}")
+
+        if index.get("version") != BUNDLE_VERSION:
+            raise SkillLoadError(
+                self.path.name,
+                f"Unsupported bundle version {index.get('version')}, rebuild the bundle"
+            )
+        if index.get("magic") != importlib.util.MAGIC_NUMBER.hex():
+            raise SkillLoadError(
+                self.path.name,
+                f"Bundle was compiled for a different Python bytecode version "
+                f"(magic {index.get('magic')}, this interpreter uses "
+                f"{importlib.util.MAGIC_NUMBER.hex()}), rebuild the bundle with this interpreter"
+            )
+        self.module_name: str = index["module_name"]
+        self.entries: List[Dict[str, Any]] = index["skills"]
+
+    def skill_dir(self, dir_name: str) -> zipfile.Path:
+        """归档中 Skill 目录的只读路径（支持 / 、exists()、read_text()）"""
+        return zipfile.Path(self._archive, at=f"{dir_name}/")
+
+    def import_module(self, dir_name: str) -> types.ModuleType:
+        """
+        通过 zipimport 从归档中导入一个 Skill 模块
+
+        与目录加载相同，模块不写入 sys.modules，名称为 skill_<目录名>
+        """
+        importer = zipimport.zipimporter(f"{self.path}/{dir_name}")
+        try:
+            code = importer.get_code(self.module_name)
+        except zipimport.ZipImportError as e:
+            raise SkillLoadError(dir_name, f"Failed to import from bundle: {e}")
+
+        module = types.ModuleType(f"skill_{dir_name}")
+        module.__file__ = importer.get_filename(self.module_name)
+        module.__loader__ = importer
+        exec(code, module.__dict__)
+        return module
+
+    def close(self) -> None:
+        self._archive.close()
+
+    def __repr__(self) -> str:
+        return f"<SkillBundle: {self.path.name}, {len(self.entries)} skills>"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pack a skills directory into a precompiled bundle")
+    parser.add_argument("skills_dir", type=Path, help="Skills root directory")
+    parser.add_argument("output", type=Path, help="Output zip file")
+    parser.add_argument("--module-name", default="skill", help="Skill module file name")
+    args = parser.parse_args(argv)
+
+    names = build_bundle(args.skills_dir, args.output, args.module_name)
+    print(f"Bundled {len(names)} skills into {args.output}: {', '.join(names)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Skill 发现结果 - 结构化记录每个 Skill 的加载耗时和失败原因
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+@dataclass
+class SkillLoadReport:
+    """
+    单个 Skill 目录的加载报告
+
+    Attributes:
+        path: Skill 目录
+        skill_name: 注册后的 Skill 名称（失败时为 None）
+        load_time: 解析/导入耗时（秒，在工作线程中测量）
+        register_time: 验证和注册耗时（秒）
+        error: 失败原因（成功时为 None）
+        lazy: 是否通过清单延迟加载（skill.yaml 或磁盘缓存）
+        cached: 是否命中磁盘注册缓存
+    """
+    path: Path
+    skill_name: Optional[str] = None
+    load_time: float = 0.0
+    register_time: float = 0.0
+    error: Optional[str] = None
+    lazy: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "path": str(self.path),
+            "skill_name": self.skill_name,
+            "load_time": self.load_time,
+            "register_time": self.register_time,
+            "error": self.error,
+            "lazy": self.lazy,
+            "cached": self.cached,
+        }
+
+
+@dataclass
+class DiscoveryResult:
+    """
+    一次 discover() 调用的完整结果
+
+    Attributes:
+        skills_dir: 扫描的 Skills 根目录
+        reports: 按目录名排序的加载报告
+        total_time: 总耗时（秒）
+        max_workers: 使用的工作线程数
+    """
+    skills_dir: Path
+    reports: List[SkillLoadReport] = field(default_factory=list)
+    total_time: float = 0.0
+    max_workers: int = 1
+
+    @property
+    def loaded(self) -> List[str]:
+        """成功注册的 Skill 名称"""
+        return [r.skill_name for r in self.reports if r.ok]
+
+    @property
+    def cached(self) -> List[str]:
+        """从磁盘注册缓存恢复的 Skill 名称"""
+        return [r.skill_name for r in self.reports if r.ok and r.cached]
+
+    @property
+    def failed(self) -> List[SkillLoadReport]:
+        """加载失败的报告"""
+        return [r for r in self.reports if not r.ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "skills_dir": str(self.skills_dir),
+            "total_time": self.total_time,
+            "max_workers": self.max_workers,
+            "loaded": self.loaded,
+            "cached": self.cached,
+            "reports": [r.to_dict() for r in self.reports],
+        }
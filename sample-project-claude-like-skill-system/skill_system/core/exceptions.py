@@ -35,3 +35,23 @@ class SkillPermissionError(SkillError):
             f"Permission denied for skill '{skill_name}': "
             f"requires '{required_permission}'"
         )
+
+
+class SkillRateLimitError(SkillError):
+    """工具或 Skill 的调用超出速率 / 并发限制"""
+
+    def __init__(self, limited_name: str, reason: str):
+        self.limited_name = limited_name
+        self.reason = reason
+        super().__init__(f"Rate limit exceeded for '{limited_name}': {reason}")
+
+
+class SkillDependencyError(SkillError):
+    """Skill 依赖关系错误（如循环依赖）"""
+
+    def __init__(self, skill_name: str, cycle: list):
+        self.skill_name = skill_name
+        self.cycle = cycle
+        super().__init__(
+            f"Dependency cycle for skill '{skill_name}': {' -> '.join(cycle)}"
+        )
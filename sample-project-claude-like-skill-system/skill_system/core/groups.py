@@ -0,0 +1,71 @@
+"""
+Skill Groups - 两级渐进加载
+
+SkillMetadata.group 相同的 Skill 归为一组。分组模式下模型一开始只看到每个分组的
+group_<name> Loader（以及未分组 Skill 的 Loader）；调用分组 Loader 后该组 Skill 的
+Loader 才出现，再调用 Skill Loader 才出现真实工具。
+每轮可见的工具数取决于分组数和组内 Skill 数，而不是 Skill 总数。
+"""
+
+import re
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from langchain.tools import ToolRuntime
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.types import Command
+
+from .base_skill import SkillMetadata
+
+# 分组 Loader 的描述中最多列出的 Skill 名称数（描述始终对模型可见，需要保持简短）
+MAX_LISTED_MEMBERS = 8
+
+
+def group_loader_name(group: str) -> str:
+    """分组 Loader 的工具名（只保留工具名允许的字符）"""
+    return "group_" + re.sub(r"[^A-Za-z0-9_-]+", "_", group).strip("_").lower()
+
+
+def build_group_loader(group: str, members: List[Tuple[str, SkillMetadata]]) -> BaseTool:
+    """
+    构建一个分组的 Loader Tool
+
+    Args:
+        group: 分组名称
+        members: 该分组中可见的 (Skill Loader 名称, 元数据)，按注册顺序
+
+    Returns:
+        调用后把分组写入 groups_loaded 的 Loader Tool
+    """
+    listing = "\n".join(f"- {loader}: {meta.description}" for loader, meta in members)
+    content = (
+        f"Skill group '{group}' opened. These skill loaders are now available:\n{listing}\n"
+        "Call the loader of the skill you need to get its tools."
+    )
+    names = ", ".join(meta.name for _, meta in members[:MAX_LISTED_MEMBERS])
+    if len(members) > MAX_LISTED_MEMBERS:
+        names += f", ... {len(members)} skills"
+
+    def load_group(runtime: ToolRuntime) -> Command:
+        return Command(update={
+            "messages": [ToolMessage(content=content, tool_call_id=runtime.tool_call_id)],
+            "groups_loaded": [group],
+        })
+
+    return StructuredTool.from_function(
+        func=load_group,
+        name=group_loader_name(group),
+        description=f"Open the '{group}' skill group to reveal its skill loaders ({names}).",
+    )
+
+
+def group_members(
+    metadata: Mapping[str, SkillMetadata],
+    filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+) -> Dict[str, List[SkillMetadata]]:
+    """按分组收集已启用且通过过滤的 Skill（分组和组内顺序都按注册顺序）"""
+    groups: Dict[str, List[SkillMetadata]] = {}
+    for meta in metadata.values():
+        if meta.group and meta.enabled and (filter_fn is None or filter_fn(meta)):
+            groups.setdefault(meta.group, []).append(meta)
+    return groups
@@ -0,0 +1,196 @@
+"""
+Loader First Action - Loader 调用时顺带执行第一个工具
+
+常见流程需要三轮模型调用：调用 skill_<name> Loader → 阅读使用说明 → 调用真实工具。
+模型往往在调用 Loader 时就已经知道要用哪个工具，因此 Loader 接受可选参数：
+- action：该 Skill 中要立即执行的工具名
+- action_args：该工具的参数
+
+Loader 在同一步中激活 Skill 并执行该工具，返回使用说明 + 工具结果，省去一轮模型调用。
+不传 action 时行为与原 Loader 完全相同。
+
+action 与模型直接发起的工具调用走同一套策略：中间件执行工具调用时用 action_policy()
+登记自己的包装函数（结果缓存、限速和并发上限等），Loader 中的 action 依次经过这些包装再执行。
+"""
+
+import dataclasses
+import inspect
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Tuple
+
+from langchain.tools import ToolRuntime
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+if TYPE_CHECKING:
+    from .base_skill import BaseSkill
+
+logger = logging.getLogger(__name__)
+
+# action 参数描述中最多列出的工具名数（Loader schema 始终对模型可见，需要保持简短）
+MAX_LISTED_ACTIONS = 8
+
+# wrapper(request, handler)：与中间件 wrap_tool_call 相同的签名
+ToolCallWrapper = Callable[[ToolCallRequest, Callable[[ToolCallRequest], Any]], Any]
+
+# 当前工具调用所经过的中间件登记的包装函数（外层在前）
+_action_wrappers: ContextVar[Tuple[ToolCallWrapper, ...]] = ContextVar("loader_action_wrappers", default=())
+
+
+@contextmanager
+def action_policy(wrapper: ToolCallWrapper) -> Iterator[None]:
+    """
+    在 with 块内执行的 Loader action 经过 wrapper
+
+    中间件在调用内层 handler 时使用；action 在 Loader 内部同步执行，
+    因此登记的是同步包装函数（异步路径中 Loader 在线程池中执行，上下文随之复制）
+    """
+    token = _action_wrappers.set((*_action_wrappers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _action_wrappers.reset(token)
+
+
+def with_first_action(loader: BaseTool, skill: "BaseSkill") -> BaseTool:
+    """
+    把 Loader 包装为接受可选 action / action_args 的 Loader
+
+    名称和描述与原 Loader 相同；原 Loader 的返回值（Command 或字符串）原样保留，
+    只在调用了 action 时把工具结果追加到 Loader 的 ToolMessage。
+
+    Args:
+        loader: build_loader_tool() 构建的 Loader
+        skill: Loader 所属的 Skill（action 在其 get_tools() 中查找）
+
+    Returns:
+        包装后的 Loader Tool
+    """
+    tool_names = [t.name for t in skill.get_tools()]
+    listed = ", ".join(tool_names[:MAX_LISTED_ACTIONS])
+    if len(tool_names) > MAX_LISTED_ACTIONS:
+        listed += ", ..."
+    passes_runtime = accepts_runtime(loader)
+
+    def load(
+        runtime: ToolRuntime,
+        action: Optional[str] = None,
+        action_args: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        result = loader.invoke({"runtime": runtime} if passes_runtime else {})
+        if not action:
+            return result
+
+        output = run_action(skill, action, action_args or {}, runtime)
+        logger.debug(f"[Loader] {loader.name} ran first action {action}")
+        return _append_output(result, f"Result of {action}:\n{output}", runtime.tool_call_id)
+
+    # 直接给出 JSON schema：从函数签名生成 pydantic 模型的开销远大于其它注册步骤
+    return StructuredTool(
+        name=loader.name,
+        description=loader.description,
+        args_schema={
+            "type": "object",
+            "properties": {
+                "action": {
+                    "type": "string",
+                    "description": f"Optional: a tool of this skill to run right after loading ({listed})",
+                },
+                "action_args": {
+                    "type": "object",
+                    "description": "Arguments for the action tool",
+                },
+            },
+        },
+        func=load,
+    )
+
+
+def run_action(
+    skill: "BaseSkill",
+    action: str,
+    args: Dict[str, Any],
+    runtime: Optional[ToolRuntime] = None
+) -> str:
+    """
+    执行 Skill 中的一个工具，返回结果文本（失败时返回错误说明，由模型自行修正）
+
+    调用经过当前登记的中间件包装（见 action_policy），Skill 在状态中视为已加载
+    """
+    tools = {t.name: t for t in skill.get_tools()}
+    target = tools.get(action)
+    if target is None:
+        return f"Error: '{action}' is not a tool of this skill. Available tools: {', '.join(tools)}"
+
+    call_id = getattr(runtime, "tool_call_id", None) or "loader"
+    request = ToolCallRequest(
+        tool_call={"name": action, "args": args, "id": f"{call_id}:{action}"},
+        tool=target,
+        state=_loaded_state(getattr(runtime, "state", None), skill.metadata.name),
+        runtime=runtime,
+    )
+    handler = _execute_action
+    for wrapper in reversed(_action_wrappers.get()):
+        handler = _wrapped(wrapper, handler)
+    result = handler(request)
+    return str(getattr(result, "content", result))
+
+
+def _wrapped(wrapper: ToolCallWrapper, handler: Callable[[ToolCallRequest], Any]) -> Callable[[ToolCallRequest], Any]:
+    return lambda request: wrapper(request, handler)
+
+
+def _execute_action(request: ToolCallRequest) -> ToolMessage:
+    call = request.tool_call
+    try:
+        output = request.tool.invoke(call["args"])
+    except Exception as e:
+        return ToolMessage(
+            content=f"Error: {type(e).__name__}: {e}",
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
+    return ToolMessage(content=str(getattr(output, "content", output)), name=call["name"], tool_call_id=call["id"])
+
+
+def _loaded_state(state: Any, skill_name: str) -> Dict[str, Any]:
+    """Loader 所在步骤的状态，skills_loaded 中加上正在激活的 Skill"""
+    state = dict(state) if isinstance(state, dict) else {}
+    loaded = list(state.get("skills_loaded") or [])
+    if skill_name not in loaded:
+        loaded.append(skill_name)
+    return {**state, "skills_loaded": loaded}
+
+
+def invoke_loader(loader: BaseTool, runtime: Any) -> Any:
+    """调用一个 Loader（声明了 runtime 参数时传入 runtime），返回其原始结果"""
+    return loader.invoke({"runtime": runtime} if accepts_runtime(loader) else {})
+
+
+def accepts_runtime(loader: BaseTool) -> bool:
+    """Loader 的函数是否声明了 runtime 参数"""
+    func = getattr(loader, "func", None)
+    if func is None:
+        return False
+    return "runtime" in inspect.signature(func).parameters
+
+
+def _append_output(result: Any, text: str, tool_call_id: Optional[str]) -> Any:
+    """把 action 的结果追加到 Loader 返回值中对应的消息"""
+    if isinstance(result, Command) and isinstance(result.update, dict):
+        messages = list(result.update.get("messages") or [])
+        for i, msg in enumerate(messages):
+            if isinstance(msg, ToolMessage) and msg.tool_call_id == tool_call_id:
+                messages[i] = msg.model_copy(update={"content": f"{msg.content}\n\n{text}"})
+                break
+        else:
+            messages.append(ToolMessage(content=text, tool_call_id=tool_call_id))
+        return dataclasses.replace(result, update={**result.update, "messages": messages})
+    if isinstance(result, ToolMessage):
+        return result.model_copy(update={"content": f"{result.content}\n\n{text}"})
+    return f"{result}\n\n{text}"
@@ -0,0 +1,292 @@
+"""
+Skill Manifest - 基于静态清单的延迟加载
+
+每个 Skill 目录可以提供一个可选的 skill.yaml 清单，描述元数据和工具 schema：
+
+    name: pdf_processing
+    description: PDF 文档处理能力
+    version: 1.0.0
+    tags: [pdf, document]
+    visibility: public
+    group: documents            # 可选，分组模式下先打开分组再加载
+    loader_description: Load PDF processing capabilities.
+    tools:
+      - name: pdf_to_csv
+        description: Convert PDF tables to CSV format.
+        parameters: {type: object, properties: {file_path: {type: string}}, required: [file_path]}
+
+Registry 发现清单后只注册一个轻量的 ManifestSkill 代理，不执行 skill.py；
+直到 Loader 被调用（或代理工具被执行）时才真正导入模块。
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+from langchain_core.tools import BaseTool, StructuredTool
+
+from .base_skill import BaseSkill, SkillMetadata
+from .exceptions import SkillLoadError
+from .loader_action import invoke_loader
+from .result_cache import CACHE_METADATA_KEY, cache_options
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE_NAME = "skill.yaml"
+
+# SkillMetadata 中可以直接从清单读取的字段
+_METADATA_FIELDS = (
+    "name",
+    "description",
+    "version",
+    "tags",
+    "visibility",
+    "dependencies",
+    "required_permissions",
+    "author",
+    "enabled",
+    "group",
+)
+
+
+def load_manifest(manifest_file: Path) -> Dict[str, Any]:
+    """
+    读取并校验 Skill 清单
+
+    Raises:
+        SkillLoadError: 清单格式错误或缺少必需字段
+    """
+    skill_name = manifest_file.parent.name
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            manifest = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise SkillLoadError(skill_name, f"Invalid manifest: {e}")
+
+    if not isinstance(manifest, dict):
+        raise SkillLoadError(skill_name, "Manifest must be a mapping")
+
+    for key in ("name", "description", "tools"):
+        if not manifest.get(key):
+            raise SkillLoadError(skill_name, f"Manifest missing required field '{key}'")
+
+    for tool_def in manifest["tools"]:
+        if not isinstance(tool_def, dict) or not tool_def.get("name"):
+            raise SkillLoadError(skill_name, "Every manifest tool needs a name")
+
+    return manifest
+
+
+def build_manifest(skill: BaseSkill) -> Dict[str, Any]:
+    """
+    从已加载的 Skill 生成清单（用于生成或更新 skill.yaml）
+
+    Args:
+        skill: 已实例化的 BaseSkill
+
+    Returns:
+        可直接写入 YAML 的清单字典
+    """
+    manifest = skill.metadata.to_dict()
+    if manifest.get("group") is None:
+        manifest.pop("group", None)
+    manifest["loader_description"] = skill.get_loader_tool().description
+    manifest["tools"] = []
+    for t in skill.get_tools():
+        tool_def = {
+            "name": t.name,
+            "description": t.description,
+            "parameters": _tool_parameters(t),
+        }
+        options = cache_options(t)
+        if options is not None:
+            tool_def["cache"] = options or True
+        manifest["tools"].append(tool_def)
+    return manifest
+
+
+class _ManifestDumper(yaml.SafeDumper):
+    """多行字符串（描述、docstring）使用 | 块格式输出，便于人工阅读和 diff"""
+
+
+def _represent_str(dumper: yaml.SafeDumper, data: str) -> yaml.Node:
+    if "\n" in data:
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+
+
+_ManifestDumper.add_representer(str, _represent_str)
+
+
+def write_manifest(skill: BaseSkill, manifest_file: Path) -> None:
+    """将 Skill 的清单写入 YAML 文件"""
+    with open(manifest_file, "w", encoding="utf-8") as f:
+        yaml.dump(
+            build_manifest(skill),
+            f,
+            Dumper=_ManifestDumper,
+            allow_unicode=True,
+            sort_keys=False,
+            default_flow_style=False,
+        )
+
+
+def _tool_parameters(t: BaseTool) -> Dict[str, Any]:
+    """提取工具暴露给模型的参数 JSON schema"""
+    schema = t.tool_call_schema
+    if isinstance(schema, dict):
+        params = dict(schema)
+    else:
+        params = schema.model_json_schema()
+    # 描述和标题已在工具层面给出
+    params.pop("description", None)
+    params.pop("title", None)
+    return params
+
+
+def _strip_titles(schema: Any) -> Any:
+    """去掉 pydantic 自动生成的 title（手写清单通常省略），用于比较参数 schema"""
+    if isinstance(schema, dict):
+        return {
+            k: {name: _strip_titles(p) for name, p in v.items()}
+            if k == "properties" and isinstance(v, dict) else _strip_titles(v)
+            for k, v in schema.items() if k != "title"
+        }
+    if isinstance(schema, list):
+        return [_strip_titles(v) for v in schema]
+    return schema
+
+
+class ManifestSkill(BaseSkill):
+    """
+    由清单描述的 Skill 代理
+
+    元数据、Loader 和工具都直接由清单构建，不导入 skill.py。
+    首次调用 Loader 或代理工具时才通过 factory 加载真实 Skill，
+    之后 Loader 和所有工具调用都转发给真实 Skill 的 Loader 和工具。
+    """
+
+    def __init__(
+        self,
+        manifest: Dict[str, Any],
+        factory: Callable[[], BaseSkill],
+        skill_dir: Optional[Path] = None
+    ):
+        """
+        Args:
+            manifest: load_manifest() 返回的清单
+            factory: 加载真实 Skill 的函数（只会调用一次）
+            skill_dir: Skill 所在目录
+        """
+        super().__init__(skill_dir)
+        self.manifest = manifest
+        self._factory = factory
+        self._resolved: Optional[BaseSkill] = None
+        self._resolved_tools: Dict[str, BaseTool] = {}
+        self._resolve_lock = threading.Lock()
+        self._metadata = SkillMetadata(
+            **{k: manifest[k] for k in _METADATA_FIELDS if k in manifest}
+        )
+
+    @property
+    def metadata(self) -> SkillMetadata:
+        return self._metadata
+
+    @property
+    def is_resolved(self) -> bool:
+        """真实 Skill 是否已被导入"""
+        return self._resolved is not None
+
+    def resolve(self) -> BaseSkill:
+        """
+        导入并返回真实 Skill（线程安全，只执行一次）
+
+        Raises:
+            SkillLoadError: 清单与真实 Skill 不一致（工具集合或参数 schema 不同），
+                需要重新生成 skill.yaml
+        """
+        if self._resolved is not None:
+            return self._resolved
+
+        with self._resolve_lock:
+            if self._resolved is None:
+                skill = self._factory()
+                tools = {t.name: t for t in skill.get_tools()}
+                self._check_drift(tools)
+
+                self._resolved_tools = tools
+                self._resolved = skill
+                logger.info(f"Resolved lazy skill: {self.metadata.name}")
+
+        return self._resolved
+
+    def _check_drift(self, tools: Dict[str, BaseTool]) -> None:
+        """清单中的工具名和参数 schema 必须与真实工具完全一致，否则模型看到的是过期的工具"""
+        name = self.metadata.name
+        declared = {t["name"]: t for t in self.manifest["tools"]}
+
+        missing = [n for n in declared if n not in tools]
+        if missing:
+            raise SkillLoadError(name, f"Manifest tools not provided by skill module: {missing}")
+        extra = [n for n in tools if n not in declared]
+        if extra:
+            raise SkillLoadError(name, f"Skill module tools missing from manifest: {extra}")
+
+        changed = [
+            n for n, tool_def in declared.items()
+            if _strip_titles(tool_def.get("parameters") or {"type": "object", "properties": {}})
+            != _strip_titles(_tool_parameters(tools[n]))
+        ]
+        if changed:
+            raise SkillLoadError(name, f"Manifest parameter schema out of date for tools: {changed}")
+
+    def load_instructions(self) -> str:
+        # 磁盘注册缓存会把说明文本直接写入清单
+        if "instructions" in self.manifest:
+            return self.manifest["instructions"]
+        if self.skill_dir:
+            instructions_file = self.skill_dir / "instructions.md"
+            if instructions_file.exists():
+                return instructions_file.read_text(encoding="utf-8")
+        return self.resolve().get_instructions()
+
+    def build_loader_tool(self) -> BaseTool:
+        skill_instance = self
+        name = self.metadata.name
+        description = self.manifest.get(
+            "loader_description",
+            f"Load {name.replace('_', ' ')} capabilities. {self.metadata.description}"
+        )
+
+        def loader(runtime) -> Any:
+            # 转发给真实 Skill 的 Loader，保留其自定义逻辑和返回值
+            return invoke_loader(skill_instance.resolve().get_loader_tool(), runtime)
+
+        # 与代理工具相同，直接使用 JSON schema，注册时不从函数签名生成 pydantic 模型
+        return StructuredTool(
+            name=f"skill_{name}",
+            description=description,
+            args_schema={"type": "object", "properties": {}},
+            func=loader,
+        )
+
+    def build_tools(self) -> List[BaseTool]:
+        return [self._create_proxy_tool(tool_def) for tool_def in self.manifest["tools"]]
+
+    def _create_proxy_tool(self, tool_def: Dict[str, Any]) -> BaseTool:
+        """根据清单创建转发到真实工具的代理工具"""
+        tool_name = tool_def["name"]
+
+        def invoke(**kwargs: Any) -> Any:
+            self.resolve()
+            return self._resolved_tools[tool_name].invoke(kwargs)
+
+        return StructuredTool(
+            name=tool_name,
+            description=tool_def.get("description", ""),
+            args_schema=tool_def.get("parameters") or {"type": "object", "properties": {}},
+            func=invoke,
+            metadata={CACHE_METADATA_KEY: tool_def["cache"]} if tool_def.get("cache") else None,
+        )
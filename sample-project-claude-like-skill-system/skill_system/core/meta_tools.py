@@ -0,0 +1,116 @@
+"""
+Meta Tools - 用两个固定工具代替每个 Skill 一个 Loader
+
+默认模式下每个 Skill 都有一个始终可见的 skill_<name> Loader，System Prompt 和工具 schema
+随 Skill 数量线性增长。meta 模式只暴露：
+- find_skills(query)：在 Registry 中检索 Skill，返回名称、描述和标签
+- load_skill(name)：调用该 Skill 自己的 Loader 激活它（自定义 Loader 逻辑、清单代理同样生效）
+
+模型先检索再加载，基础 Prompt 与工具列表的大小与 Skill 数量无关。
+
+两个工具都按 filter_fn 过滤；调用时在 context 中提供 user_permissions 时，
+还只检索、加载这些权限允许的 Skill。
+"""
+
+import logging
+from typing import Any, Callable, List, Optional
+
+from langchain.tools import ToolRuntime
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool, tool
+from langgraph.types import Command
+
+from .base_skill import SkillMetadata
+from .loader_action import invoke_loader
+from .permissions import PermissionFilter, context_permissions
+from .registry import SkillRegistry
+from .router import SkillRouter
+
+logger = logging.getLogger(__name__)
+
+FIND_SKILLS_TOOL_NAME = "find_skills"
+LOAD_SKILL_TOOL_NAME = "load_skill"
+
+
+def create_meta_tools(
+    registry: SkillRegistry,
+    filter_fn: Optional[Callable[[SkillMetadata], bool]] = None,
+    search_limit: int = 5
+) -> List[BaseTool]:
+    """
+    创建 find_skills / load_skill 两个 Meta Tool
+
+    Args:
+        registry: Skill 注册中心（每次调用读取当前快照，支持热重载和租户叠加层）
+        filter_fn: 可选的过滤函数（与 SkillMiddleware 使用同一个）
+        search_limit: find_skills 最多返回的 Skill 数
+
+    Returns:
+        [find_skills, load_skill]
+    """
+    # 索引检索（词元前缀，退回子串）结果不足时，用 BM25 按描述中的词补足结果
+    router = SkillRouter(registry, filter_fn=filter_fn)
+
+    def allowed(meta: SkillMetadata, runtime: Any) -> bool:
+        if not meta.enabled or (filter_fn is not None and not filter_fn(meta)):
+            return False
+        permissions = context_permissions(getattr(runtime, "context", None))
+        return permissions is None or PermissionFilter.for_permissions(permissions)(meta)
+
+    @tool(FIND_SKILLS_TOOL_NAME)
+    def find_skills(query: str, runtime: ToolRuntime) -> str:
+        """
+        Search the available skills.
+
+        Call this first when you need a capability you don't have yet. Pass a few keywords
+        describing the task (e.g. "pdf table extraction"); then call load_skill with the
+        name of the best match.
+        """
+        snapshot = registry.snapshot()
+        names = [meta.name for meta in snapshot.search(query) if allowed(meta, runtime)][:search_limit]
+
+        if len(names) < search_limit:
+            for name, _ in router.score(query):
+                if name not in names and name in snapshot and allowed(snapshot.metadata[name], runtime):
+                    names.append(name)
+                if len(names) >= search_limit:
+                    break
+
+        if not names:
+            return f"No skills match '{query}'. Try different keywords."
+
+        lines = []
+        for name in names:
+            meta = snapshot.get_metadata(name)
+            line = f"- {name}: {meta.description}"
+            if meta.tags:
+                line += f" (tags: {', '.join(meta.tags)})"
+            lines.append(line)
+        return "Matching skills:\n" + "\n".join(lines)
+
+    @tool(LOAD_SKILL_TOOL_NAME)
+    def load_skill(name: str, runtime: ToolRuntime) -> Command:
+        """
+        Load a skill by name and make its tools available.
+
+        Use a name returned by find_skills. After loading you receive the skill's
+        instructions, and its tools become available on the next step.
+        """
+        snapshot = registry.snapshot()
+        meta = snapshot.metadata.get(name)
+        if meta is None or not allowed(meta, runtime):
+            content = f"Unknown skill '{name}'. Call find_skills to look up available skills."
+            return Command(update={
+                "messages": [ToolMessage(content=content, tool_call_id=runtime.tool_call_id)]
+            })
+
+        logger.debug(f"[load_skill] Loading {name}")
+        result = invoke_loader(snapshot.get(name).get_loader_tool(), runtime)
+        if isinstance(result, Command):
+            return result
+        # 只返回文本或消息的 Loader：补上与默认 Loader 相同的状态更新
+        if not isinstance(result, ToolMessage):
+            result = ToolMessage(content=str(result), tool_call_id=runtime.tool_call_id)
+        return Command(update={"messages": [result], "skills_loaded": [name]})
+
+    return [find_skills, load_skill]
@@ -0,0 +1,198 @@
+"""
+Metadata Table - 快照元数据的列式表示
+
+Skill 数量很大时，list_skills(filter_fn) 对每个 SkillMetadata 调用一次 Python 函数。
+MetadataTable 把同一个快照的元数据按列存放：
+- names：Skill 名称（注册顺序）
+- visibility_codes：可见性编码（uint8，编码表见 visibilities）
+- enabled：启用标记（bool）
+- tag_bits：每个 Skill 的标签位图（uint64 × 标签词表大小 / 64，第一次按标签过滤时构建）
+- permission_masks：每个 Skill 所需权限的位掩码（uint64，第一次按权限过滤时构建）
+
+提供 table_mask(table) 方法的过滤函数（VisibilityFilter、TagFilter、PermissionFilter 及其组合）
+可以用 numpy 向量化谓词一次扫描整列。表在快照内按需构建一次，快照不可变所以无需失效。
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .base_skill import SkillMetadata
+
+
+class MetadataTable:
+    """一个快照的只读列式元数据"""
+
+    # 标签词表超过该大小时不构建位图矩阵
+    MAX_TAG_BITS = 4096
+
+    def __init__(self, metadata: Mapping[str, SkillMetadata]):
+        """
+        Args:
+            metadata: Skill 名称 -> 元数据（按注册顺序）
+        """
+        metas = list(metadata.values())
+        self.names: Tuple[str, ...] = tuple(metadata)
+
+        self.visibilities: Dict[str, int] = {}
+        self.tag_ids: Dict[str, int] = {}
+        for meta in metas:
+            self.visibilities.setdefault(meta.visibility, len(self.visibilities))
+            for tag in meta.tags:
+                self.tag_ids.setdefault(tag, len(self.tag_ids))
+
+        code_type = np.uint8 if len(self.visibilities) <= 256 else np.uint32
+        self.visibility_codes = np.fromiter(
+            (self.visibilities[m.visibility] for m in metas), dtype=code_type, count=len(metas)
+        )
+        self.enabled = np.fromiter((m.enabled for m in metas), dtype=bool, count=len(metas))
+
+        self._metas = metas
+        self._words = max(1, (len(self.tag_ids) + 63) // 64)
+        self._tag_bits: Optional[np.ndarray] = None
+        self._tag_rows: Optional[Dict[str, np.ndarray]] = None
+        self._permission_masks: Optional[np.ndarray] = None
+
+    @property
+    def tag_bits(self) -> np.ndarray:
+        """每行的标签位图（第一次按标签过滤时构建）"""
+        bits = self._tag_bits
+        if bits is None:
+            # 每行先用 Python 整数拼出位图，再一次性转换为 uint64 矩阵（逐元素写 numpy 很慢）
+            width = self._words * 8
+            tag_ids = self.tag_ids
+            packed = b"".join(
+                sum(1 << tag_ids[tag] for tag in set(meta.tags)).to_bytes(width, "little")
+                for meta in self._metas
+            )
+            bits = np.frombuffer(packed, dtype="<u8").reshape(len(self._metas), self._words)
+            self._tag_bits = bits
+        return bits
+
+    def _rows_with_tag(self, tag: str) -> np.ndarray:
+        rows = self._tag_rows
+        if rows is None:
+            postings: Dict[str, List[int]] = {}
+            for row, meta in enumerate(self._metas):
+                for t in set(meta.tags):
+                    postings.setdefault(t, []).append(row)
+            rows = {t: np.array(r, dtype=np.intp) for t, r in postings.items()}
+            self._tag_rows = rows
+        return rows.get(tag, np.empty(0, dtype=np.intp))
+
+    def visibility_mask(self, allowed: Optional[Iterable[str]]) -> np.ndarray:
+        """可见性属于 allowed 的行（None 表示全部）"""
+        if allowed is None:
+            return np.ones(len(self), dtype=bool)
+        codes = [self.visibilities[v] for v in allowed if v in self.visibilities]
+        return np.isin(self.visibility_codes, codes)
+
+    def tag_mask(self, tags: Iterable[str], match_all: bool = False) -> np.ndarray:
+        """
+        包含标签的行
+
+        Args:
+            tags: 标签
+            match_all: True 时要求包含全部标签，否则包含任一标签即可
+        """
+        tags = list(tags)
+        if len(self.tag_ids) > self.MAX_TAG_BITS:
+            # 标签词表过大时位图矩阵（行数 × 词表 / 64）太占内存，改用每个标签的行号列表
+            counts = np.zeros(len(self), dtype=np.intp)
+            for tag in set(tags):
+                counts[self._rows_with_tag(tag)] += 1
+            return counts == len(set(tags)) if match_all else counts > 0
+
+        query = np.zeros(self._words, dtype=np.uint64)
+        for tag in tags:
+            bit = self.tag_ids.get(tag)
+            if bit is None:
+                if match_all:
+                    return np.zeros(len(self), dtype=bool)
+                continue
+            query[bit // 64] |= np.uint64(1 << (bit % 64))
+
+        hits = self.tag_bits & query
+        if match_all:
+            return (hits == query).all(axis=1)
+        return hits.any(axis=1)
+
+    @property
+    def permission_masks(self) -> Optional[np.ndarray]:
+        """每行所需权限的位掩码（权限词表超过 64 位时为 None）"""
+        masks = self._permission_masks
+        if masks is None:
+            required = [m.permission_mask for m in self._metas]
+            if any(r >> 64 for r in required):
+                return None
+            masks = np.fromiter(required, dtype=np.uint64, count=len(required))
+            self._permission_masks = masks
+        return masks
+
+    def permission_mask(self, granted: int) -> np.ndarray:
+        """所需权限全部包含在 granted 中的行"""
+        masks = self.permission_masks
+        if masks is None:
+            return np.fromiter(
+                (not m.permission_mask & ~granted for m in self._metas), dtype=bool, count=len(self)
+            )
+        return (masks & np.uint64(~granted & (2 ** 64 - 1))) == 0
+
+    def select(self, mask: np.ndarray) -> List[str]:
+        """掩码为 True 的 Skill 名称（注册顺序）"""
+        names = self.names
+        return [names[i] for i in np.flatnonzero(mask)]
+
+    @property
+    def nbytes(self) -> int:
+        """列数据占用的字节数（不含名称字符串本身）"""
+        tag_bytes = self._tag_bits.nbytes if self._tag_bits is not None else 0
+        permission_bytes = self._permission_masks.nbytes if self._permission_masks is not None else 0
+        return self.visibility_codes.nbytes + self.enabled.nbytes + tag_bytes + permission_bytes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"<MetadataTable: {len(self)} skills, {len(self.tag_ids)} tags>"
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    """
+    按标签过滤 Skills
+
+    值对象（可哈希、按内容比较相等），可以作为工具集缓存键；
+    在 MetadataTable 上按标签位图向量化扫描
+    """
+    tags: FrozenSet[str]
+    match_all: bool = False
+
+    def __call__(self, meta: SkillMetadata) -> bool:
+        matched = self.tags.intersection(meta.tags)
+        return matched == self.tags if self.match_all else bool(matched)
+
+    def table_mask(self, table: MetadataTable) -> np.ndarray:
+        return table.tag_mask(self.tags, self.match_all)
+
+
+@dataclass(frozen=True)
+class CombinedFilter:
+    """两个过滤函数同时满足（同样按内容比较相等）"""
+    first: Callable[[SkillMetadata], bool]
+    second: Callable[[SkillMetadata], bool]
+
+    def __call__(self, meta: SkillMetadata) -> bool:
+        return self.first(meta) and self.second(meta)
+
+    def table_mask(self, table: MetadataTable) -> Optional[np.ndarray]:
+        # 任一部分不支持列式扫描时返回 None，由调用方逐个调用过滤函数
+        first = getattr(self.first, "table_mask", None)
+        second = getattr(self.second, "table_mask", None)
+        if first is None or second is None:
+            return None
+        first_mask, second_mask = first(table), second(table)
+        if first_mask is None or second_mask is None:
+            return None
+        return first_mask & second_mask
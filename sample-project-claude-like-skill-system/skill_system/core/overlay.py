@@ -0,0 +1,242 @@
+"""
+Registry Overlay - 多租户叠加层
+
+一个进程服务多个租户时，所有租户共享同一个基础 SkillRegistry（Skill 实例和工具对象只有一份），
+每个租户只持有一个很薄的 SkillRegistryOverlay：
+- register()：添加租户私有 Skill（同名时遮蔽基础 Skill）
+- hide() / unregister()：对该租户隐藏基础 Skill
+- set_enabled()：只对该租户启用/禁用 Skill，不影响基础层和其他租户
+
+叠加层本身也是 SkillRegistry，可直接传给 SkillMiddleware、SkillRouter 和 create_skill_agent。
+
+共享策略：
+- 未做任何修改的叠加层直接返回基础层的快照（包括其工具集缓存）
+- 没有私有 Skill、隐藏/禁用设置相同的租户共享同一个派生快照
+- 有私有 Skill 的租户只额外持有名称 -> 实例的映射，工具对象仍与基础层共享
+
+共享快照时工具集缓存也共享，但命中统计按叠加层分别记录（get_cache_stats() 只包含该租户的调用）
+"""
+
+import dataclasses
+import heapq
+from typing import Dict, FrozenSet, List, Optional, Set
+
+from .exceptions import SkillNotFoundError
+from .registry import SkillRegistry
+from .search_index import SkillSearchIndex
+from .snapshot import RegistrySnapshot
+
+
+class _OverlaySearchIndex:
+    """在基础索引和私有索引上合并搜索结果（不复制基础索引）"""
+
+    def __init__(
+        self,
+        base: SkillSearchIndex,
+        private: SkillSearchIndex,
+        visible_base: FrozenSet[str]
+    ):
+        self.base = base
+        self.private = private
+        self.visible_base = visible_base
+
+    def search(
+        self,
+        query: str = "",
+        tags: Optional[List[str]] = None,
+        visibility: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        # 排序键：(得分降序, 基础层在前, 各自的注册顺序)
+        keyed = [
+            ((-value, 0, self.base.position(name)), name)
+            for name, value in self.base.score(query, tags, visibility).items()
+            if name in self.visible_base
+        ]
+        keyed.extend(
+            ((-value, 1, self.private.position(name)), name)
+            for name, value in self.private.score(query, tags, visibility).items()
+        )
+        if limit is not None:
+            keyed = heapq.nsmallest(limit, keyed)
+        else:
+            keyed.sort()
+        return [name for _, name in keyed]
+
+
+class SkillRegistryOverlay(SkillRegistry):
+    """
+    租户叠加层
+
+    继承自 SkillRegistry：私有 Skill 存放在父类的工作副本中，
+    snapshot() 把基础层快照与私有层、隐藏和启用设置合并成该租户看到的快照
+    """
+
+    def __init__(self, base: SkillRegistry, tools_cache_size: Optional[int] = None):
+        """
+        Args:
+            base: 共享的基础 Registry
+            tools_cache_size: 派生快照的工具集缓存大小（默认与基础层相同）
+        """
+        super().__init__(
+            tools_cache_size=tools_cache_size or base._tools_cache_size
+        )
+        self.base = base
+        self._hidden: Set[str] = set()
+        # 基础 Skill 名称 -> 该租户下的启用状态（与基础层相同时不记录）
+        self._enabled_overrides: Dict[str, bool] = {}
+        # (基础快照, 私有层快照, 合并结果)
+        self._merged: Optional[tuple] = None
+
+    def snapshot(self) -> RegistrySnapshot:
+        """该租户当前看到的只读快照（基础层或叠加层任一变化后重建）"""
+        base_snapshot = self.base.snapshot()
+        private_snapshot = super().snapshot()
+
+        merged = self._merged
+        if merged is not None and merged[0] is base_snapshot and merged[1] is private_snapshot:
+            return merged[2]
+
+        with self._lock:
+            snapshot = self._build(base_snapshot, private_snapshot)
+            self._merged = (base_snapshot, private_snapshot, snapshot)
+        return snapshot
+
+    def _build(
+        self,
+        base_snapshot: RegistrySnapshot,
+        private_snapshot: RegistrySnapshot
+    ) -> RegistrySnapshot:
+        private = private_snapshot.skills
+        overrides = {
+            name: enabled for name, enabled in self._enabled_overrides.items()
+            if name in base_snapshot.skills and name not in self._hidden
+        }
+        hidden = frozenset(self._hidden.intersection(base_snapshot.skills))
+
+        if not private and not hidden and not overrides:
+            return base_snapshot
+
+        # 没有私有 Skill 时，设置相同的租户可以共享同一个派生快照（及其工具集缓存）
+        share_key = None
+        if not private:
+            share_key = (base_snapshot.version, hidden, frozenset(overrides.items()))
+            shared = self.base._derived_snapshots.get(share_key)
+            if shared is not None:
+                return shared
+
+        skills = {}
+        metadata = {}
+        for name, skill in base_snapshot.skills.items():
+            if name in hidden or name in private:
+                continue
+            skills[name] = skill
+            meta = base_snapshot.metadata[name]
+            if name in overrides:
+                meta = dataclasses.replace(meta, enabled=overrides[name])
+            metadata[name] = meta
+        visible_base = frozenset(skills)
+        skills.update(private)
+        metadata.update(private_snapshot.metadata)
+
+        snapshot = RegistrySnapshot(
+            version=self.version,
+            skills=skills,
+            metadata=metadata,
+            search_index=_OverlaySearchIndex(
+                base_snapshot.search_index,
+                private_snapshot.search_index,
+                visible_base
+            ),
+            tools_cache_size=self._tools_cache_size,
+            stats=self._cache_stats
+        )
+        if share_key is not None:
+            self.base._derived_snapshots[share_key] = snapshot
+        return snapshot
+
+    @property
+    def version(self) -> int:
+        """基础层与叠加层版本号之和（任一层变化都会递增）"""
+        return self.base.version + self._version
+
+    def hide(self, skill_name: str) -> None:
+        """
+        对该租户隐藏一个基础 Skill
+
+        Raises:
+            SkillNotFoundError: 基础层中不存在该 Skill
+        """
+        if skill_name not in self.base:
+            raise SkillNotFoundError(skill_name)
+        with self._lock:
+            if skill_name in self._hidden:
+                return
+            self._hidden.add(skill_name)
+            self._publish()
+
+    def unhide(self, skill_name: str) -> None:
+        """取消隐藏一个基础 Skill"""
+        with self._lock:
+            if skill_name not in self._hidden:
+                return
+            self._hidden.discard(skill_name)
+            self._publish()
+
+    @property
+    def hidden(self) -> FrozenSet[str]:
+        """被该租户隐藏的基础 Skill"""
+        return frozenset(self._hidden)
+
+    def unregister(self, skill_name: str) -> None:
+        """移除私有 Skill；对基础 Skill 则只对该租户隐藏"""
+        with self._lock:
+            if skill_name in self._skills:
+                super().unregister(skill_name)
+                return
+        if skill_name in self.base:
+            self.hide(skill_name)
+
+    def set_enabled(self, skill_name: str, enabled: bool) -> None:
+        """
+        只对该租户启用或禁用一个 Skill
+
+        Raises:
+            SkillNotFoundError: 如果 Skill 不存在
+        """
+        with self._lock:
+            if skill_name in self._skills:
+                super().set_enabled(skill_name, enabled)
+                return
+
+            base_meta = self.base.snapshot().metadata.get(skill_name)
+            if base_meta is None:
+                raise SkillNotFoundError(skill_name)
+
+            current = self._enabled_overrides.get(skill_name, base_meta.enabled)
+            if current == enabled:
+                return
+            if enabled == base_meta.enabled:
+                del self._enabled_overrides[skill_name]
+            else:
+                self._enabled_overrides[skill_name] = enabled
+            self._publish()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        返回该租户的工具集缓存统计
+
+        hits / misses 只统计通过该叠加层的调用；共享快照时 size 包含其他租户写入的条目
+        """
+        merged = self._merged
+        return {
+            "hits": self._cache_stats["hits"],
+            "misses": self._cache_stats["misses"],
+            "size": merged[2].cached_tool_sets if merged is not None else 0,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<SkillRegistryOverlay: {len(self)} skills "
+            f"({len(self._skills)} private, {len(self._hidden)} hidden)>"
+        )
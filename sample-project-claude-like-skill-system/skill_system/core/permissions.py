@@ -0,0 +1,101 @@
+"""
+Permissions - 预编译的权限位掩码
+
+权限名称在进程内的权限词表中各占一位（首次出现时分配，之后不变）：
+- Skill 的 required_permissions 在构造 SkillMetadata 时编译为 permission_mask
+- 用户权限在请求时编译为 PermissionFilter(mask)，相同的权限集合复用同一个过滤函数
+
+判断一个 Skill 是否允许使用只需一次整数运算：required & ~granted == 0。
+PermissionFilter 是值对象（可哈希、按掩码比较相等），作为工具集缓存键时
+同一权限集合、同一组 skills_loaded 的请求命中同一个缓存条目。
+"""
+
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .base_skill import SkillMetadata
+    from .metadata_table import MetadataTable
+
+
+class PermissionVocabulary:
+    """权限名称 -> 位序号（只增不减，线程安全）"""
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bit(self, permission: str) -> int:
+        """权限对应的位序号（首次出现时分配）"""
+        bit = self._bits.get(permission)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(permission, len(self._bits))
+        return bit
+
+    def compile(self, permissions: Iterable[str]) -> int:
+        """把权限名称编译为位掩码"""
+        mask = 0
+        for permission in permissions:
+            mask |= 1 << self.bit(permission)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """位掩码中包含的权限名称（按分配顺序）"""
+        return [name for name, bit in list(self._bits.items()) if mask >> bit & 1]
+
+    def __len__(self) -> int:
+        return len(self._bits)
+
+
+# 进程内共享的词表：不同 Registry、快照和租户叠加层编译出的掩码可以直接比较
+PERMISSIONS = PermissionVocabulary()
+
+
+def compile_permissions(permissions: Iterable[str]) -> int:
+    """把权限名称编译为位掩码（使用进程内共享的词表）"""
+    return PERMISSIONS.compile(permissions)
+
+
+@dataclass(frozen=True)
+class PermissionFilter:
+    """
+    按用户权限过滤 Skills
+
+    Skill 所需的权限全部被授予时通过（不需要权限的 Skill 总是通过）；
+    在 MetadataTable 上按权限掩码列向量化扫描
+    """
+    mask: int = 0  # 已授予的权限位掩码
+
+    @classmethod
+    def for_permissions(cls, permissions: Optional[Iterable[str]]) -> "PermissionFilter":
+        """编译用户权限（相同的权限集合返回同一个实例）"""
+        return _filter_for(frozenset(permissions or ()))
+
+    def __call__(self, meta: "SkillMetadata") -> bool:
+        return not meta.permission_mask & ~self.mask
+
+    def table_mask(self, table: "MetadataTable") -> "np.ndarray":
+        return table.permission_mask(self.mask)
+
+    def missing(self, meta: "SkillMetadata") -> List[str]:
+        """Skill 需要但未被授予的权限"""
+        return PERMISSIONS.names(meta.permission_mask & ~self.mask)
+
+
+def context_permissions(context: Any) -> Optional[List[str]]:
+    """运行时 context（字典或对象）中的 user_permissions；没有提供时返回 None"""
+    if isinstance(context, dict):
+        permissions = context.get("user_permissions")
+    else:
+        permissions = getattr(context, "user_permissions", None)
+    return None if permissions is None else list(permissions)
+
+
+@lru_cache(maxsize=1024)
+def _filter_for(permissions: FrozenSet[str]) -> PermissionFilter:
+    return PermissionFilter(compile_permissions(sorted(permissions)))
@@ -2,15 +2,25 @@
 Skill Registry - 管理所有 Skills 的注册、查找和过滤
 """
 
-from typing import Dict, List, Optional, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Callable, Tuple, Any
 from pathlib import Path
+import dataclasses
 import importlib.util
 import logging
+import threading
+import time
+import weakref
 
 from langchain_core.tools import BaseTool
 
 from .base_skill import BaseSkill, SkillMetadata
-from .exceptions import SkillNotFoundError, SkillLoadError
+from .exceptions import SkillNotFoundError, SkillLoadError, SkillDependencyError
+from .manifest import MANIFEST_FILE_NAME, ManifestSkill, load_manifest, build_manifest
+from .registry_cache import RegistryCache, fingerprint_skill_dir
+from .discovery import DiscoveryResult, SkillLoadReport
+from .search_index import SkillSearchIndex
+from .snapshot import RegistrySnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -26,9 +36,67 @@ class SkillRegistry:
     4. 提供工具查询接口
     """
 
-    def __init__(self):
+    def __init__(self, tools_cache_size: int = 256):
+        """
+        Args:
+            tools_cache_size: 每个快照中 get_tools_for_skills 结果缓存的最大条目数
+        """
+        # 写入方的工作副本，只在 _lock 内修改；读操作一律通过 snapshot()
         self._skills: Dict[str, BaseSkill] = {}
         self._metadata_cache: Dict[str, SkillMetadata] = {}
+        self._search_index = SkillSearchIndex()
+        # 当前搜索索引是否已被某个快照引用（被引用后下次写入前先写时复制）
+        self._index_published = False
+
+        self._tools_cache_size = tools_cache_size
+        self._cache_stats = {"hits": 0, "misses": 0}
+
+        # 每次 Skill 集合或启用状态变化时递增，供路由器等派生索引判断是否需要重建
+        self._version = 0
+
+        # 串行化写操作（热重载线程与主线程可能同时修改 Registry）
+        self._lock = threading.RLock()
+        # 已发布的只读快照；写操作后置为 None，下一次读取时重新构建
+        self._snapshot: Optional[RegistrySnapshot] = None
+        # 租户叠加层派生的共享快照（设置相同的租户共用，无人引用时自动释放）
+        self._derived_snapshots: "weakref.WeakValueDictionary[Any, RegistrySnapshot]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def overlay(self) -> "SkillRegistryOverlay":
+        """
+        创建一个共享本 Registry 的租户叠加层
+
+        叠加层可以添加私有 Skill、隐藏或单独启停 Skill，不复制任何 Skill 实例或工具
+        """
+        from .overlay import SkillRegistryOverlay
+
+        return SkillRegistryOverlay(self)
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        获取当前内容的只读快照
+
+        快照发布后不再改变。无写入时直接返回已发布的快照（一次属性读取，不加锁）；
+        写入后的第一次读取在写锁内构建新快照。需要在多次读取间保持一致时，
+        调用方应先取得快照再在其上操作
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None:
+                self._index_published = True
+                self._snapshot = RegistrySnapshot(
+                    version=self._version,
+                    skills=dict(self._skills),
+                    metadata=dict(self._metadata_cache),
+                    search_index=self._search_index,
+                    tools_cache_size=self._tools_cache_size,
+                    stats=self._cache_stats
+                )
+            return self._snapshot
 
     def register(self, skill: BaseSkill) -> None:
         """
@@ -39,23 +107,113 @@ class SkillRegistry:
 
         Raises:
             ValueError: 如果 Skill 验证失败或名称冲突
+            SkillDependencyError: 如果注册后会形成循环依赖
         """
         skill.validate()
         name = skill.metadata.name
 
-        if name in self._skills:
-            logger.warning(f"Skill '{name}' already registered, overwriting")
+        with self._lock:
+            self._check_dependencies(skill.metadata)
+            if name in self._skills:
+                logger.warning(f"Skill '{name}' already registered, overwriting")
 
-        self._skills[name] = skill
-        self._metadata_cache[name] = skill.metadata
+            self._put(name, skill)
+            self._publish()
         logger.info(f"Registered skill: {name} v{skill.metadata.version}")
 
     def unregister(self, skill_name: str) -> None:
         """取消注册一个 Skill"""
-        if skill_name in self._skills:
-            del self._skills[skill_name]
-            del self._metadata_cache[skill_name]
-            logger.info(f"Unregistered skill: {skill_name}")
+        with self._lock:
+            if skill_name not in self._skills:
+                return
+            self._remove(skill_name)
+            self._publish()
+        logger.info(f"Unregistered skill: {skill_name}")
+
+    def replace(self, skill: BaseSkill, old_name: Optional[str] = None) -> None:
+        """
+        用新的 Skill 实例替换已注册的 Skill（热重载使用）
+
+        先验证新 Skill，验证失败时 Registry 保持不变；
+        验证通过后在一次加锁中完成替换，读取方只会看到替换前或替换后的快照
+
+        Args:
+            skill: 新的 Skill 实例
+            old_name: 被替换的 Skill 名称（Skill 改名时与新名称不同）
+
+        Raises:
+            ValueError: 如果新 Skill 验证失败
+            SkillDependencyError: 如果替换后会形成循环依赖
+        """
+        skill.validate()
+        name = skill.metadata.name
+
+        with self._lock:
+            self._check_dependencies(skill.metadata)
+            if old_name and old_name != name and old_name in self._skills:
+                self._remove(old_name)
+            self._put(name, skill)
+            self._publish()
+        logger.info(f"Replaced skill: {old_name or name} -> {name} v{skill.metadata.version}")
+
+    def _check_dependencies(self, meta: SkillMetadata) -> None:
+        """
+        检查注册 meta 后依赖图中是否出现环（在 _lock 内调用）
+
+        只考虑已注册的 Skill；依赖中的库名或尚未注册的 Skill 不参与检查，
+        它们注册时会再次检查
+
+        Raises:
+            SkillDependencyError: 发现循环依赖
+        """
+        name = meta.name
+
+        def deps_of(skill_name: str) -> List[str]:
+            source = meta if skill_name == name else self._metadata_cache.get(skill_name)
+            if source is None:
+                return []
+            return [d for d in source.dependencies if d == name or d in self._metadata_cache]
+
+        # 从新 Skill 出发做 DFS，回到自身即为环
+        stack = [(dep, [name, dep]) for dep in deps_of(name)]
+        visited = set()
+        while stack:
+            current, path = stack.pop()
+            if current == name:
+                raise SkillDependencyError(name, path)
+            if current in visited:
+                continue
+            visited.add(current)
+            stack.extend((dep, path + [dep]) for dep in deps_of(current))
+
+    def get_dependency_closure(
+        self,
+        skill_names: List[str],
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[str]:
+        """
+        获取 Skills 及其传递依赖（依赖在前），用于一次性激活组合工作流所需的全部 Skill
+
+        见 RegistrySnapshot.dependency_closure
+        """
+        return self.snapshot().dependency_closure(skill_names, filter_fn)
+
+    def _writable_index(self) -> SkillSearchIndex:
+        """返回可修改的搜索索引（已发布到快照时先写时复制）"""
+        if self._index_published:
+            self._search_index = self._search_index.copy()
+            self._index_published = False
+        return self._search_index
+
+    def _put(self, name: str, skill: BaseSkill) -> None:
+        self._skills[name] = skill
+        self._metadata_cache[name] = skill.metadata
+        self._writable_index().add(self._metadata_cache[name])
+
+    def _remove(self, skill_name: str) -> None:
+        del self._skills[skill_name]
+        del self._metadata_cache[skill_name]
+        self._writable_index().remove(skill_name)
 
     def get(self, skill_name: str) -> BaseSkill:
         """
@@ -70,15 +228,35 @@ class SkillRegistry:
         Raises:
             SkillNotFoundError: 如果 Skill 不存在
         """
-        if skill_name not in self._skills:
-            raise SkillNotFoundError(skill_name)
-        return self._skills[skill_name]
+        return self.snapshot().get(skill_name)
 
     def get_metadata(self, skill_name: str) -> SkillMetadata:
         """获取 Skill 元数据"""
-        if skill_name not in self._metadata_cache:
-            raise SkillNotFoundError(skill_name)
-        return self._metadata_cache[skill_name]
+        return self.snapshot().get_metadata(skill_name)
+
+    def set_enabled(self, skill_name: str, enabled: bool) -> None:
+        """
+        启用或禁用一个 Skill
+
+        禁用的 Skill 仍保留在 Registry 中，但其 Loader 和工具不再对外提供。
+        元数据以新对象替换，已发布的快照不受影响。
+
+        启用状态只记录在 Registry 的元数据中（get_metadata() / snapshot().metadata），
+        这是唯一的权威来源；Skill 实例的 skill.metadata 是它声明的元数据，不随之改变
+        （同一个实例还可能被多个租户叠加层以不同的启用状态共享）
+
+        Raises:
+            SkillNotFoundError: 如果 Skill 不存在
+        """
+        with self._lock:
+            meta = self._metadata_cache.get(skill_name)
+            if meta is None:
+                raise SkillNotFoundError(skill_name)
+            if meta.enabled == enabled:
+                return
+            self._metadata_cache[skill_name] = dataclasses.replace(meta, enabled=enabled)
+            self._publish()
+        logger.info(f"Skill '{skill_name}' {'enabled' if enabled else 'disabled'}")
 
     def list_skills(
         self,
@@ -93,13 +271,7 @@ class SkillRegistry:
         Returns:
             Skill 名称列表
         """
-        if filter_fn is None:
-            return list(self._skills.keys())
-
-        return [
-            name for name, meta in self._metadata_cache.items()
-            if filter_fn(meta)
-        ]
+        return self.snapshot().list_skills(filter_fn)
 
     def get_all_loader_tools(
         self,
@@ -116,15 +288,29 @@ class SkillRegistry:
         Returns:
             Loader Tools 列表
         """
-        skill_names = self.list_skills(filter_fn)
-        loaders = []
+        return self.snapshot().get_all_loader_tools(filter_fn)
+
+    def list_groups(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[str]:
+        """列出至少包含一个可见 Skill 的分组（SkillMetadata.group，按注册顺序）"""
+        return self.snapshot().list_groups(filter_fn)
+
+    def get_group_loader_tools(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[BaseTool]:
+        """
+        获取所有分组的 Loader Tools（分组模式下代替组内 Skill 的 Loader 始终可见）
 
-        for name in skill_names:
-            skill = self._skills[name]
-            if skill.metadata.enabled:
-                loaders.append(skill.get_loader_tool())
+        Args:
+            filter_fn: 可选的过滤函数（基于权限、可见性等）
 
-        return loaders
+        Returns:
+            group_<name> Loader Tools 列表
+        """
+        return self.snapshot().get_group_loader_tools(filter_fn)
 
     def get_all_tools(
         self,
@@ -141,47 +327,76 @@ class SkillRegistry:
         Returns:
             所有工具的列表
         """
-        skill_names = self.list_skills(filter_fn)
-        all_tools = []
-
-        for name in skill_names:
-            skill = self._skills[name]
-            if skill.metadata.enabled:
-                # 添加 Loader
-                all_tools.append(skill.get_loader_tool())
-                # 添加实际工具
-                all_tools.extend(skill.get_tools())
-
-        return all_tools
+        return self.snapshot().get_all_tools(filter_fn)
 
-    def get_tools_for_skills(self, skill_names: List[str]) -> List[BaseTool]:
+    def get_tools_for_skills(
+        self,
+        skill_names: List[str],
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None,
+        include_loaders: bool = True,
+        groups_loaded: Optional[List[str]] = None
+    ) -> Tuple[BaseTool, ...]:
         """
         根据已加载的 Skill 名称获取对应的工具
 
-        用于中间件动态过滤
+        用于中间件动态过滤。结果按 (已加载 Skill 集合, filter_fn) 缓存在当前快照中，
+        register/unregister/set_enabled 发布新快照后自然失效，因此每轮调用只需一次字典查找
 
         Args:
-            skill_names: 已加载的 Skill 名称列表
+            skill_names: 已加载的 Skill 名称列表（顺序和重复不影响结果）
+            filter_fn: 可选的过滤函数（基于权限、可见性等）
+            include_loaders: 是否包含每个 Skill 的 Loader（meta 模式下为 False）
+            groups_loaded: 已打开的分组（None 表示不使用分组，所有 Loader 直接可见）
 
         Returns:
-            所有 Loader Tools + 已加载 Skills 的工具
+            所有 Loader Tools + 已加载 Skills 的工具（不可变元组）
         """
-        # 始终包含所有 Loader Tools
-        tools = self.get_all_loader_tools()
+        return self.snapshot().get_tools_for_skills(
+            skill_names, filter_fn, include_loaders, groups_loaded, stats=self._cache_stats
+        )
 
-        # 添加已加载 Skills 的工具
-        for name in skill_names:
-            if name in self._skills:
-                skill = self._skills[name]
-                if skill.metadata.enabled:
-                    tools.extend(skill.get_tools())
+    def get_instruction_tokens(self, skill_name: str) -> int:
+        """
+        Skill 使用说明的估算 token 数
+
+        Raises:
+            SkillNotFoundError: 如果 Skill 不存在
+        """
+        return self.snapshot().get(skill_name).instruction_tokens
 
-        return tools
+    def get_instruction_token_report(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> Dict[str, int]:
+        """所有已启用 Skill 的使用说明估算 token 数（Skill 名称 -> token 数）"""
+        return self.snapshot().instruction_tokens(filter_fn)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """返回工具集缓存的统计信息（命中、未命中、当前快照的条目数）"""
+        snapshot = self._snapshot
+        return {
+            "hits": self._cache_stats["hits"],
+            "misses": self._cache_stats["misses"],
+            "size": snapshot.cached_tool_sets if snapshot is not None else 0,
+        }
+
+    @property
+    def version(self) -> int:
+        """Registry 内容版本号（register/unregister/set_enabled 时递增）"""
+        return self._version
+
+    def _publish(self) -> None:
+        """写操作完成：递增版本号并撤下旧快照（在 _lock 内调用）"""
+        self._version += 1
+        self._snapshot = None
 
     def discover_and_load(
         self,
         skills_dir: Path,
-        module_name: str = "skill"
+        module_name: str = "skill",
+        use_manifest: bool = True,
+        max_workers: int = 1,
+        cache_path: Optional[Path] = None
     ) -> int:
         """
         从目录自动发现并加载 Skills
@@ -190,6 +405,7 @@ class SkillRegistry:
         skills_dir/
             pdf_processing/
                 skill.py       <- 必须定义 create_skill() 函数
+                skill.yaml     <- 可选：静态清单，存在时延迟导入 skill.py
                 instructions.md
             data_analysis/
                 skill.py
@@ -198,34 +414,274 @@ class SkillRegistry:
         Args:
             skills_dir: Skills 根目录
             module_name: Skill 模块文件名（默认 "skill.py"）
+            use_manifest: 是否使用 skill.yaml 清单注册延迟加载的代理
+            max_workers: 并行解析/导入的线程数（1 表示串行）
+            cache_path: 可选的磁盘注册缓存文件（见 discover()）
+
+        Returns:
+            成功加载的 Skill 数量（详细结果见 discover()）
+        """
+        result = self.discover(
+            skills_dir,
+            module_name=module_name,
+            use_manifest=use_manifest,
+            max_workers=max_workers,
+            cache_path=cache_path
+        )
+        return len(result.loaded)
+
+    def discover(
+        self,
+        skills_dir: Path,
+        module_name: str = "skill",
+        use_manifest: bool = True,
+        max_workers: int = 1,
+        cache_path: Optional[Path] = None
+    ) -> DiscoveryResult:
+        """
+        从目录发现并加载 Skills，返回结构化结果
+
+        解析和导入在线程池中并行执行；验证和注册按目录名顺序串行执行，
+        因此无论线程数多少，注册顺序和覆盖行为都是确定的
+
+        指定 cache_path 时，内容指纹未变化的 Skill 直接从磁盘缓存构建代理，
+        不导入模块；变化过的 Skill 正常加载后写回缓存
+
+        skills_dir 是文件时按预编译归档加载（见 discover_bundle()）
+
+        Args:
+            skills_dir: Skills 根目录或 build_bundle() 生成的 zip
+            module_name: Skill 模块文件名（默认 "skill.py"）
+            use_manifest: 是否使用 skill.yaml 清单注册延迟加载的代理
+            max_workers: 并行解析/导入的线程数（1 表示串行）
+            cache_path: 可选的磁盘注册缓存文件
 
         Returns:
-            成功加载的 Skill 数量
+            DiscoveryResult，包含每个 Skill 的耗时和失败原因
         """
+        if skills_dir.is_file():
+            return self.discover_bundle(skills_dir, use_manifest=use_manifest)
+
+        start = time.perf_counter()
+        result = DiscoveryResult(skills_dir=skills_dir, max_workers=max_workers)
+
         if not skills_dir.exists():
             logger.warning(f"Skills directory not found: {skills_dir}")
-            return 0
+            return result
 
-        loaded_count = 0
+        skill_paths = sorted(
+            p for p in skills_dir.iterdir()
+            if p.is_dir() and (p / f"{module_name}.py").exists()
+        )
 
-        for skill_path in skills_dir.iterdir():
-            if not skill_path.is_dir():
-                continue
+        cache = RegistryCache(cache_path) if cache_path is not None else None
 
-            skill_file = skill_path / f"{module_name}.py"
-            if not skill_file.exists():
-                continue
+        def load(skill_path: Path):
+            report = SkillLoadReport(path=skill_path)
+            load_start = time.perf_counter()
+            skill = None
+            fingerprint = None
+            try:
+                skill_file = skill_path / f"{module_name}.py"
+                manifest_file = skill_path / MANIFEST_FILE_NAME
+                cached_manifest = None
+                if cache is not None:
+                    fingerprint = fingerprint_skill_dir(skill_path)
+                    cached_manifest = cache.get(f"{skill_path.name}/{module_name}", fingerprint)
+
+                if cached_manifest is not None:
+                    report.lazy = report.cached = True
+                    skill = ManifestSkill(
+                        cached_manifest,
+                        factory=lambda: self._load_skill_from_file(skill_file, skill_path),
+                        skill_dir=skill_path
+                    )
+                else:
+                    report.lazy = use_manifest and manifest_file.exists()
+                    skill = self.load_skill(skill_path, module_name, use_manifest)
+            except Exception as e:
+                report.error = str(e)
+            report.load_time = time.perf_counter() - load_start
+            return report, skill, fingerprint
+
+        if max_workers > 1 and len(skill_paths) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                loaded = list(executor.map(load, skill_paths))
+        else:
+            loaded = [load(p) for p in skill_paths]
+
+        for report, skill, fingerprint in loaded:
+            if skill is not None:
+                register_start = time.perf_counter()
+                try:
+                    self.register(skill)
+                    report.skill_name = skill.metadata.name
+                    if cache is not None and not report.cached:
+                        cache.put(
+                            f"{report.path.name}/{module_name}",
+                            fingerprint,
+                            self._build_cache_manifest(skill)
+                        )
+                except Exception as e:
+                    report.error = str(e)
+                report.register_time = time.perf_counter() - register_start
+
+            if not report.ok:
+                logger.error(f"Failed to load skill from {report.path}: {report.error}")
+            result.reports.append(report)
+
+        if cache is not None:
+            cache.save()
+
+        result.total_time = time.perf_counter() - start
+        logger.info(
+            f"Loaded {len(result.loaded)} skills from {skills_dir} "
+            f"in {result.total_time:.3f}s ({max_workers} workers)"
+        )
+        return result
 
+    def discover_bundle(self, bundle_path: Path, use_manifest: bool = True) -> DiscoveryResult:
+        """
+        从 build_bundle() 生成的预编译归档加载 Skills
+
+        清单和使用说明来自归档中的 bundle.json，不遍历目录、不编译源码。
+        use_manifest 为 True 时注册 ManifestSkill 代理，模块在 Loader 首次调用时才通过
+        zipimport 导入；否则立即导入全部模块
+
+        Args:
+            bundle_path: zip 文件路径
+            use_manifest: 是否延迟导入 Skill 模块
+
+        Returns:
+            DiscoveryResult（报告中的 path 为 <bundle>/<Skill 目录>）
+
+        Raises:
+            SkillLoadError: 不是有效的 Skill 归档
+        """
+        from .bundle import SkillBundle
+
+        start = time.perf_counter()
+        result = DiscoveryResult(skills_dir=bundle_path)
+        bundle = SkillBundle(bundle_path)
+
+        for entry in bundle.entries:
+            dir_name = entry["dir"]
+            skill_dir = bundle.skill_dir(dir_name)
+            report = SkillLoadReport(path=bundle_path / dir_name, lazy=use_manifest)
+            load_start = time.perf_counter()
             try:
-                skill = self._load_skill_from_file(skill_file, skill_path)
+                factory = lambda d=dir_name, p=skill_dir: self._create_skill(bundle.import_module(d), d, p)
+                if use_manifest:
+                    skill = ManifestSkill(entry["manifest"], factory=factory, skill_dir=skill_dir)
+                else:
+                    skill = factory()
+                report.load_time = time.perf_counter() - load_start
+
+                register_start = time.perf_counter()
                 self.register(skill)
-                loaded_count += 1
+                report.register_time = time.perf_counter() - register_start
+                report.skill_name = skill.metadata.name
             except Exception as e:
-                logger.error(f"Failed to load skill from {skill_path}: {e}")
-                continue
+                report.error = str(e)
+                logger.error(f"Failed to load skill {dir_name} from bundle {bundle_path}: {e}")
+            result.reports.append(report)
+
+        result.total_time = time.perf_counter() - start
+        logger.info(
+            f"Loaded {len(result.loaded)} skills from bundle {bundle_path} in {result.total_time:.3f}s"
+        )
+        return result
+
+    def load_skill(
+        self,
+        skill_path: Path,
+        module_name: str = "skill",
+        use_manifest: bool = True
+    ) -> BaseSkill:
+        """
+        从单个 Skill 目录加载 Skill（不注册）
 
-        logger.info(f"Loaded {loaded_count} skills from {skills_dir}")
-        return loaded_count
+        存在 skill.yaml 且 use_manifest 为 True 时返回延迟加载的 ManifestSkill，
+        否则导入并执行 skill.py
+
+        Raises:
+            SkillLoadError: 目录缺少 Skill 模块或模块不符合约定
+        """
+        skill_file = skill_path / f"{module_name}.py"
+        if not skill_file.exists():
+            raise SkillLoadError(skill_path.name, f"Missing {skill_file.name}")
+
+        manifest_file = skill_path / MANIFEST_FILE_NAME
+        if use_manifest and manifest_file.exists():
+            return self._load_skill_from_manifest(manifest_file, skill_file, skill_path)
+        return self._load_skill_from_file(skill_file, skill_path)
+
+    def watch(
+        self,
+        skills_dir: Path,
+        module_name: str = "skill",
+        use_manifest: bool = True,
+        interval: float = 1.0,
+        backend: str = "auto",
+        on_change: Optional[Callable[[Optional[BaseSkill], Optional[BaseSkill]], None]] = None
+    ) -> "SkillWatcher":
+        """
+        启动热重载：监视 skills_dir，只重新加载发生变化的 Skill 目录
+
+        Args:
+            skills_dir: Skills 根目录（通常与 discover_and_load 使用的相同）
+            module_name: Skill 模块文件名
+            use_manifest: 是否使用 skill.yaml 清单
+            interval: 轮询间隔（秒）
+            backend: "auto"（有 watchfiles 时使用 inotify 等系统通知）、"poll" 或 "watchfiles"
+            on_change: 每次替换或取消注册后调用 on_change(旧 Skill, 新 Skill)
+
+        Returns:
+            已启动的 SkillWatcher（调用 stop() 停止）
+        """
+        from .watcher import SkillWatcher
+
+        watcher = SkillWatcher(
+            self,
+            skills_dir,
+            module_name=module_name,
+            use_manifest=use_manifest,
+            interval=interval,
+            backend=backend,
+            on_change=on_change
+        )
+        watcher.start()
+        return watcher
+
+    def _build_cache_manifest(self, skill: BaseSkill) -> Dict[str, Any]:
+        """
+        生成写入磁盘缓存的清单（附带使用说明）
+
+        尚未导入的 ManifestSkill 只在存在 instructions.md 时缓存说明，避免为此导入模块
+        """
+        manifest = build_manifest(skill)
+        has_file = skill.skill_dir is not None and (skill.skill_dir / "instructions.md").exists()
+        if not isinstance(skill, ManifestSkill) or skill.is_resolved or has_file:
+            manifest["instructions"] = skill.get_instructions()
+        return manifest
+
+    def _load_skill_from_manifest(
+        self,
+        manifest_file: Path,
+        skill_file: Path,
+        skill_dir: Path
+    ) -> BaseSkill:
+        """
+        从清单创建延迟加载的 Skill 代理
+
+        只解析 YAML，skill.py 在 Loader 首次被调用时才导入
+        """
+        manifest = load_manifest(manifest_file)
+        return ManifestSkill(
+            manifest,
+            factory=lambda: self._load_skill_from_file(skill_file, skill_dir),
+            skill_dir=skill_dir
+        )
 
     def _load_skill_from_file(
         self,
@@ -246,10 +702,13 @@ class SkillRegistry:
 
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
+        return self._create_skill(module, skill_dir.name, skill_dir)
 
+    def _create_skill(self, module: Any, skill_name: str, skill_dir: Any) -> BaseSkill:
+        """调用模块的 create_skill(skill_dir) 并检查返回值"""
         if not hasattr(module, "create_skill"):
             raise SkillLoadError(
-                skill_dir.name,
+                skill_name,
                 "Module must define create_skill() function"
             )
 
@@ -257,58 +716,61 @@ class SkillRegistry:
 
         if not isinstance(skill, BaseSkill):
             raise SkillLoadError(
-                skill_dir.name,
+                skill_name,
                 "create_skill() must return BaseSkill instance"
             )
 
         return skill
 
+    def get_skill_for_tool(self, tool_name: str) -> Optional[str]:
+        """
+        查找提供指定工具的 Skill
+
+        Args:
+            tool_name: 工具名称（如 pdf_to_csv）
+
+        Returns:
+            Skill 名称；没有 Skill 提供该工具时返回 None
+        """
+        return self.snapshot().tool_owner(tool_name)
+
     def search(
         self,
         query: str = "",
         tags: Optional[List[str]] = None,
-        visibility: Optional[str] = None
+        visibility: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[SkillMetadata]:
         """
         搜索 Skills
 
+        基于 register/unregister 时维护的倒排索引，不扫描全部 Skill。
+        每个查询词都需作为名称、标签或描述中某个词的前缀出现，结果按相关度排序；
+        没有结果时退回到旧版的子串匹配（名称或描述包含查询串），见 SkillSearchIndex.search
+
         Args:
-            query: 搜索关键词（匹配名称或描述）
+            query: 搜索关键词（匹配名称、标签或描述）
             tags: 标签过滤
             visibility: 可见性过滤
+            limit: 最多返回的结果数
 
         Returns:
-            匹配的 SkillMetadata 列表
+            按相关度排序的 SkillMetadata 列表
         """
-        results = []
-
-        for meta in self._metadata_cache.values():
-            # 查询过滤
-            if query:
-                if query.lower() not in meta.name.lower() and \
-                   query.lower() not in meta.description.lower():
-                    continue
-
-            # 标签过滤
-            if tags:
-                if not any(tag in meta.tags for tag in tags):
-                    continue
-
-            # 可见性过滤
-            if visibility and meta.visibility != visibility:
-                continue
-
-            results.append(meta)
-
-        return results
+        return self.snapshot().search(
+            query=query,
+            tags=tags,
+            visibility=visibility,
+            limit=limit
+        )
 
     def __len__(self) -> int:
         """返回已注册的 Skill 数量"""
-        return len(self._skills)
+        return len(self.snapshot())
 
     def __contains__(self, skill_name: str) -> bool:
         """检查 Skill 是否已注册"""
-        return skill_name in self._skills
+        return skill_name in self.snapshot()
 
     def __repr__(self) -> str:
         return f"<SkillRegistry: {len(self)} skills>"
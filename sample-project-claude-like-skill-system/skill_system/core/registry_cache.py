@@ -0,0 +1,134 @@
+"""
+Registry Cache - 按 Skill 目录内容哈希持久化的注册缓存
+
+缓存每个 Skill 的清单（元数据、Loader 描述、工具名和 JSON schema）以及使用说明。
+进程启动时，内容未变化的 Skill 直接由缓存构建 ManifestSkill 代理，
+不导入 skill.py、不重新生成 schema；只有变化过的 Skill 才会重新导入。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式或 Skill 构建逻辑变化时递增，使旧缓存整体失效
+CACHE_VERSION = 1
+
+# 计算指纹时忽略的目录
+_IGNORED_DIRS = {"__pycache__", ".git"}
+
+
+def fingerprint_skill_dir(skill_dir: Path) -> str:
+    """
+    计算 Skill 目录的内容指纹
+
+    对目录下所有文件（忽略 __pycache__）的相对路径和内容做 SHA-256
+    """
+    digest = hashlib.sha256()
+    for path in sorted(skill_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(skill_dir)
+        if _IGNORED_DIRS.intersection(relative.parts):
+            continue
+        digest.update(str(relative.as_posix()).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RegistryCache:
+    """
+    Skill 注册信息的磁盘缓存（JSON 文件）
+
+    结构：
+        {"version": 1, "skills": {"<key>": {"fingerprint": ..., "manifest": {...}}}}
+    """
+
+    def __init__(self, cache_path: Path):
+        """
+        Args:
+            cache_path: 缓存文件路径（不存在时自动创建）
+        """
+        self.cache_path = Path(cache_path)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._seen: Set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable registry cache {self.cache_path}: {e}")
+            return
+
+        if data.get("version") != CACHE_VERSION:
+            logger.info(f"Registry cache version mismatch, rebuilding: {self.cache_path}")
+            return
+
+        self._entries = data.get("skills", {})
+
+    def get(self, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存的清单
+
+        Returns:
+            指纹一致时返回清单，否则返回 None
+        """
+        with self._lock:
+            self._seen.add(key)
+            entry = self._entries.get(key)
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry["manifest"]
+
+    def put(self, key: str, fingerprint: str, manifest: Dict[str, Any]) -> None:
+        """写入（或更新）一个 Skill 的缓存"""
+        with self._lock:
+            self._seen.add(key)
+            self._entries[key] = {"fingerprint": fingerprint, "manifest": manifest}
+            self._dirty = True
+
+    def save(self, prune: bool = True) -> None:
+        """
+        将缓存写回磁盘（原子替换）
+
+        Args:
+            prune: 是否删除本轮未访问到的条目（对应的 Skill 目录已被移除）
+        """
+        with self._lock:
+            if prune:
+                stale = set(self._entries) - self._seen
+                for key in stale:
+                    del self._entries[key]
+                self._dirty = self._dirty or bool(stale)
+
+            if not self._dirty:
+                return
+
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": CACHE_VERSION, "skills": self._entries},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+
+        logger.info(f"Saved registry cache: {self.cache_path}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
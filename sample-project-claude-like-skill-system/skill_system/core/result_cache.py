@@ -0,0 +1,174 @@
+"""
+Tool Result Cache - 确定性工具的结果缓存
+
+工具通过 metadata 声明可以缓存（默认不缓存）：
+
+    return cacheable(calculate_statistics)                       # 不过期
+    return cacheable(extract_pdf_text, ttl=600, file_args=["file_path"])
+
+缓存键 = 工具名称 + 规范化的参数（JSON，键排序）+ file_args 中每个文件的 (mtime, size)，
+文件被修改后键随之变化，不会返回旧结果。声明随清单（skill.yaml / 归档）保存，
+延迟加载的代理工具同样可以缓存。
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from langchain_core.tools import BaseTool
+
+# tool.metadata 中声明缓存选项的键
+CACHE_METADATA_KEY = "cache"
+
+
+def cacheable(
+    tool: BaseTool,
+    ttl: Optional[float] = None,
+    file_args: Iterable[str] = ()
+) -> BaseTool:
+    """
+    把工具标记为可缓存（结果只取决于参数和 file_args 指向的文件内容）
+
+    Args:
+        tool: 工具
+        ttl: 结果的有效期（秒，None 表示只受 LRU 容量限制）
+        file_args: 取值为文件路径的参数名称（键中包含文件的 mtime 和 size）
+
+    Returns:
+        同一个工具对象
+    """
+    options: Dict[str, Any] = {}
+    if ttl is not None:
+        options["ttl"] = ttl
+    if file_args:
+        options["file_args"] = list(file_args)
+    tool.metadata = {**(tool.metadata or {}), CACHE_METADATA_KEY: options or True}
+    return tool
+
+
+def cache_options(tool: Optional[BaseTool]) -> Optional[Dict[str, Any]]:
+    """工具声明的缓存选项（未声明时返回 None）"""
+    metadata = getattr(tool, "metadata", None)
+    if not metadata:
+        return None
+    options = metadata.get(CACHE_METADATA_KEY)
+    if not options:
+        return None
+    return options if isinstance(options, dict) else {}
+
+
+def _file_stat(path: Any) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def tool_cache_key(tool_name: str, args: Any, file_args: Iterable[str] = ()) -> Tuple[Hashable, ...]:
+    """
+    缓存键：工具名称 + 规范化参数 + 文件状态
+
+    不存在的文件记为 None（文件出现后键随之变化）
+    """
+    canonical = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    files = ()
+    if file_args and isinstance(args, dict):
+        files = tuple(
+            (name, _file_stat(args[name])) for name in sorted(file_args) if args.get(name)
+        )
+    return tool_name, canonical, files
+
+
+class ToolResultCache:
+    """
+    工具结果的 LRU + TTL 缓存（线程安全）
+
+    Attributes:
+        max_size: 最多缓存的结果数
+        default_ttl: 工具没有声明 ttl 时使用的有效期（秒，None 表示不过期）
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_size: 最多缓存的结果数（超出时淘汰最久未使用的条目）
+            default_ttl: 默认有效期（秒）
+            clock: 单调时钟（测试时可替换）
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._clock = clock
+        # 键 -> (过期时间或 None, 结果)
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """命中时返回缓存的结果，否则返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple[Hashable, ...], value: Any, ttl: Optional[float] = None) -> None:
+        """写入结果（ttl 为 None 时使用 default_ttl）"""
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, match: Callable[[Tuple[Hashable, ...]], bool]) -> int:
+        """
+        删除键满足 match 的条目
+
+        Returns:
+            删除的条目数
+        """
+        with self._lock:
+            stale = [key for key in self._entries if match(key)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """命中、未命中、淘汰、过期次数和当前条目数"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,193 @@
+"""
+Skill Router - 基于 BM25 的轮前词法路由
+
+在第一次模型调用之前，用用户消息对每个 Skill 的文档（名称、描述、标签、工具名和工具描述）
+打分；高于阈值的 Skill 直接激活，省去模型先调用 skill_<name> Loader 的那一轮。
+
+纯 Python 实现，不依赖网络或外部模型。
+"""
+
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base_skill import SkillMetadata
+from .registry import SkillRegistry
+from .snapshot import RegistrySnapshot
+from .search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouterMetrics:
+    """
+    路由统计
+
+    Attributes:
+        messages_scored: 参与打分的用户消息数
+        messages_routed: 至少激活了一个 Skill 的消息数（每条至少节省一轮模型调用）
+        skills_activated: 路由激活的 Skill 总数（等于节省的 Loader 调用数）
+    """
+    messages_scored: int = 0
+    messages_routed: int = 0
+    skills_activated: int = 0
+
+    @property
+    def loader_turns_saved(self) -> int:
+        """节省的 Loader 模型轮数（多个 Skill 同时路由时按一轮计）"""
+        return self.messages_routed
+
+    def to_dict(self) -> Dict[str, int]:
+        """转换为字典格式"""
+        return {
+            "messages_scored": self.messages_scored,
+            "messages_routed": self.messages_routed,
+            "skills_activated": self.skills_activated,
+            "loader_turns_saved": self.loader_turns_saved,
+        }
+
+
+class SkillRouter:
+    """
+    BM25 Skill 路由器
+
+    索引在 Registry 变化（发布新快照）后的第一次打分时重建
+    """
+
+    def __init__(
+        self,
+        registry: SkillRegistry,
+        threshold: float = 3.0,
+        max_skills: int = 1,
+        relative_threshold: float = 0.8,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Args:
+            registry: Skill 注册中心
+            threshold: 激活所需的最低 BM25 得分
+            max_skills: 一条消息最多激活的 Skill 数
+            relative_threshold: 第 2 名及之后的 Skill 得分至少为第 1 名的该比例才会一同激活
+            filter_fn: 可选的过滤函数（只路由到允许的 Skill）
+            k1: BM25 词频饱和参数
+            b: BM25 文档长度归一化参数
+        """
+        self.registry = registry
+        self.threshold = threshold
+        self.max_skills = max_skills
+        self.relative_threshold = relative_threshold
+        self.filter_fn = filter_fn
+        self.k1 = k1
+        self.b = b
+        self.metrics = RouterMetrics()
+
+        # 建索引时使用的快照（按对象身份比较：租户叠加层的快照版本号可能与基础层重合）
+        self._indexed_snapshot: Optional[RegistrySnapshot] = None
+        self._term_freqs: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._avg_length = 0.0
+
+    def _document(self, snapshot: RegistrySnapshot, name: str) -> List[str]:
+        """构建一个 Skill 的检索文档（不会触发清单 Skill 的模块导入）"""
+        meta = snapshot.get_metadata(name)
+        parts = [name, meta.description, " ".join(meta.tags)]
+        for t in snapshot.get(name).get_tools():
+            parts.append(t.name)
+            parts.append(t.description or "")
+        return tokenize(" ".join(parts))
+
+    def _ensure_index(self) -> None:
+        # 在同一个快照上建索引，避免与并发的注册/热重载交错
+        snapshot = self.registry.snapshot()
+        if self._indexed_snapshot is snapshot:
+            return
+
+        term_freqs: Dict[str, Counter] = {}
+        doc_lengths: Dict[str, int] = {}
+        doc_freqs: Counter = Counter()
+
+        for name in snapshot.list_skills(self.filter_fn):
+            if not snapshot.get_metadata(name).enabled:
+                continue
+            tokens = self._document(snapshot, name)
+            counts = Counter(tokens)
+            term_freqs[name] = counts
+            doc_lengths[name] = len(tokens)
+            doc_freqs.update(counts.keys())
+
+        count = len(term_freqs)
+        self._term_freqs = term_freqs
+        self._doc_lengths = doc_lengths
+        self._avg_length = (sum(doc_lengths.values()) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5))
+            for term, df in doc_freqs.items()
+        }
+        self._indexed_snapshot = snapshot
+
+    def score(self, text: str) -> List[Tuple[str, float]]:
+        """
+        对所有 Skill 打分
+
+        Returns:
+            [(skill_name, score)]，按得分降序，只包含得分大于 0 的 Skill
+        """
+        self._ensure_index()
+
+        query_terms = [t for t in set(tokenize(text)) if t in self._idf]
+        if not query_terms:
+            return []
+
+        scores = []
+        for name, counts in self._term_freqs.items():
+            length_norm = self.k1 * (
+                1 - self.b + self.b * self._doc_lengths[name] / (self._avg_length or 1)
+            )
+            total = 0.0
+            for term in query_terms:
+                tf = counts.get(term)
+                if tf:
+                    total += self._idf[term] * tf * (self.k1 + 1) / (tf + length_norm)
+            if total > 0:
+                scores.append((name, total))
+
+        scores.sort(key=lambda item: -item[1])
+        return scores
+
+    def route(self, text: str, exclude: Optional[List[str]] = None) -> List[str]:
+        """
+        选择应当预先激活的 Skills
+
+        Args:
+            text: 用户消息
+            exclude: 已加载、无需再激活的 Skill
+
+        Returns:
+            需要激活的 Skill 名称（可能为空）
+        """
+        self.metrics.messages_scored += 1
+        exclude = set(exclude or [])
+
+        ranked = self.score(text)
+        if not ranked or ranked[0][1] < self.threshold:
+            return []
+
+        top_score = ranked[0][1]
+        selected = [
+            name for name, value in ranked[:self.max_skills]
+            if value >= self.threshold and value >= top_score * self.relative_threshold
+            and name not in exclude
+        ]
+
+        if selected:
+            self.metrics.messages_routed += 1
+            self.metrics.skills_activated += len(selected)
+            logger.info(f"[SkillRouter] Routed to {selected} (top score {top_score:.2f})")
+
+        return selected
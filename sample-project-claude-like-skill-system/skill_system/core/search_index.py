@@ -0,0 +1,275 @@
+"""
+Skill 搜索索引 - 在注册/取消注册时增量维护的倒排索引
+
+索引内容：
+- 标签倒排表：tag -> Skill 名称集合
+- 名称 / 描述 / 标签的词元前缀倒排表：prefix -> Skill 名称集合
+- 可见性分区：visibility -> Skill 名称集合
+
+查询只做集合运算和 O(1) 成员检查，与注册的 Skill 总数基本无关。
+词元前缀都不命中时退回到逐个 Skill 的子串匹配（名称或描述包含查询串，即旧版
+SkillRegistry.search 的语义），像 "df" 这样落在词中间的查询仍能找到结果
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .base_skill import SkillMetadata
+
+# ASCII 词元按字母数字切分（下划线视为分隔符），中日韩字符逐字作为词元
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]")
+
+# 前缀索引的最大长度，更长的查询词元按此长度截断
+MAX_PREFIX_LENGTH = 20
+
+# 各字段命中时的得分权重
+NAME_WEIGHT = 3.0
+TAG_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+EXACT_NAME_BONUS = 5.0
+
+
+def tokenize(text: str) -> List[str]:
+    """将文本切分为小写词元"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _prefixes(tokens: Iterable[str]) -> Set[str]:
+    prefixes = set()
+    for token in tokens:
+        for i in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+            prefixes.add(token[:i])
+    return prefixes
+
+
+class SkillSearchIndex:
+    """
+    Skill 元数据的倒排索引
+
+    由 SkillRegistry 在 register/unregister 时维护，search() 返回按相关度排序的 Skill 名称
+    """
+
+    def __init__(self):
+        self._tags: Dict[str, Set[str]] = {}
+        self._visibility: Dict[str, Set[str]] = {}
+        self._name_prefix: Dict[str, Set[str]] = {}
+        self._tag_prefix: Dict[str, Set[str]] = {}
+        self._desc_prefix: Dict[str, Set[str]] = {}
+        # 每个 Skill 写入过的键，用于取消注册时精确删除
+        self._entries: Dict[str, Dict[str, Set[str]]] = {}
+        # 小写的 (名称, 描述)，子串匹配回退使用
+        self._text: Dict[str, Tuple[str, str]] = {}
+        # 注册顺序，用于同分时保持稳定排序
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        # copy() 之后由本索引新建（可直接修改）的倒排集合 id；None 表示全部归本索引所有
+        self._owned: Optional[Set[int]] = None
+
+    def copy(self) -> "SkillSearchIndex":
+        """
+        写时复制的拷贝
+
+        只复制外层字典，倒排集合与原索引共享；拷贝第一次修改某个集合时才复制该集合。
+        原索引（已发布到 RegistrySnapshot）因此保持不变，而拷贝的代价与索引键数量成正比，
+        与倒排表总大小无关
+        """
+        clone = SkillSearchIndex.__new__(SkillSearchIndex)
+        clone._tags = dict(self._tags)
+        clone._visibility = dict(self._visibility)
+        clone._name_prefix = dict(self._name_prefix)
+        clone._tag_prefix = dict(self._tag_prefix)
+        clone._desc_prefix = dict(self._desc_prefix)
+        clone._entries = dict(self._entries)
+        clone._text = dict(self._text)
+        clone._order = dict(self._order)
+        clone._next_order = self._next_order
+        clone._owned = set()
+        return clone
+
+    def _writable(self, postings: Dict[str, Set[str]], key: str) -> Set[str]:
+        """返回可以直接修改的倒排集合（与其他索引共享时先复制）"""
+        names = postings.get(key)
+        if names is None:
+            names = postings[key] = set()
+        elif self._owned is None or id(names) in self._owned:
+            return names
+        else:
+            names = postings[key] = set(names)
+        if self._owned is not None:
+            self._owned.add(id(names))
+        return names
+
+    def add(self, meta: SkillMetadata) -> None:
+        """索引一个 Skill（同名时先移除旧条目）"""
+        name = meta.name
+        if name in self._entries:
+            self.remove(name)
+
+        tags = {t.lower() for t in meta.tags}
+        tag_tokens = [tok for t in tags for tok in tokenize(t)]
+        entry = {
+            "tags": tags,
+            "visibility": {meta.visibility},
+            "name_prefix": _prefixes(tokenize(name)),
+            "tag_prefix": _prefixes(tag_tokens),
+            "desc_prefix": _prefixes(tokenize(meta.description)),
+        }
+
+        for field_name, keys in entry.items():
+            postings = self._postings(field_name)
+            for key in keys:
+                self._writable(postings, key).add(name)
+
+        self._entries[name] = entry
+        self._text[name] = (name.lower(), meta.description.lower())
+        self._order[name] = self._next_order
+        self._next_order += 1
+
+    def remove(self, name: str) -> None:
+        """从索引中移除一个 Skill"""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+
+        for field_name, keys in entry.items():
+            postings = self._postings(field_name)
+            for key in keys:
+                if key not in postings:
+                    continue
+                names = self._writable(postings, key)
+                names.discard(name)
+                if not names:
+                    del postings[key]
+                    if self._owned is not None:
+                        self._owned.discard(id(names))
+
+        del self._text[name]
+        del self._order[name]
+
+    def search(
+        self,
+        query: str = "",
+        tags: Optional[List[str]] = None,
+        visibility: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        搜索 Skills
+
+        每个查询词元都必须作为名称、标签或描述中某个词的前缀出现（AND 语义）；
+        没有 Skill 满足时退回到子串匹配：名称或描述包含整个查询串即命中。
+        结果按得分降序排列：名称命中 > 标签命中 > 描述命中，完全匹配名称额外加分；
+        同分时保持注册顺序
+
+        Args:
+            query: 搜索关键词
+            tags: 标签过滤（命中任意一个即可）
+            visibility: 可见性过滤
+            limit: 最多返回的结果数
+
+        Returns:
+            排序后的 Skill 名称列表
+        """
+        scores = self.score(query, tags, visibility)
+
+        order = self._order
+        sort_key = lambda name: (-scores[name], order[name])
+        if limit is not None:
+            return heapq.nsmallest(limit, scores, key=sort_key)
+        return sorted(scores, key=sort_key)
+
+    def score(
+        self,
+        query: str = "",
+        tags: Optional[List[str]] = None,
+        visibility: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        返回所有命中 Skill 的得分（未排序），匹配规则同 search()
+
+        供需要合并多个索引结果的调用方（如租户叠加层）使用
+        """
+        candidates: Optional[Set[str]] = None
+
+        if tags:
+            candidates = set()
+            for tag in tags:
+                candidates |= self._tags.get(tag.lower(), set())
+
+        if visibility:
+            partition = self._visibility.get(visibility, set())
+            candidates = partition if candidates is None else candidates & partition
+
+        query_tokens = [t[:MAX_PREFIX_LENGTH] for t in tokenize(query)] if query else []
+        if query and not query_tokens:
+            return self._substring_scores(query, candidates)
+        filtered = candidates
+
+        # 先处理命中最少的词元，使交集尽快变小
+        token_matches = []
+        for token in query_tokens:
+            matched = (
+                self._name_prefix.get(token, set())
+                | self._tag_prefix.get(token, set())
+                | self._desc_prefix.get(token, set())
+            )
+            token_matches.append(matched)
+        for matched in sorted(token_matches, key=len):
+            candidates = set(matched) if candidates is None else candidates & matched
+            if not candidates:
+                return self._substring_scores(query, filtered)
+
+        if candidates is None:
+            candidates = set(self._entries)
+
+        # 按字段权重累加得分：对每个词元只取一次倒排表，用 C 层集合交集代替逐个成员检查
+        scores = dict.fromkeys(candidates, 0.0)
+        weighted_sets = []
+        for token in query_tokens:
+            weighted_sets.append((self._name_prefix.get(token), NAME_WEIGHT))
+            weighted_sets.append((self._tag_prefix.get(token), TAG_WEIGHT))
+            weighted_sets.append((self._desc_prefix.get(token), DESCRIPTION_WEIGHT))
+        for tag in {t.lower() for t in tags} if tags else ():
+            weighted_sets.append((self._tags.get(tag), TAG_WEIGHT))
+
+        for names, weight in weighted_sets:
+            if names:
+                for name in candidates & names:
+                    scores[name] += weight
+
+        query_lower = query.strip().lower()
+        if query_lower in scores:
+            scores[query_lower] += EXACT_NAME_BONUS
+
+        return scores
+
+    def _substring_scores(self, query: str, candidates: Optional[Set[str]]) -> Dict[str, float]:
+        """子串匹配回退：名称或描述包含查询串的 Skill（需要逐个检查，只在前缀索引没有结果时使用）"""
+        needle = query.strip().lower()
+        if not needle:
+            return {}
+        scores = {}
+        for name in self._text if candidates is None else candidates:
+            name_lower, description = self._text[name]
+            if needle in name_lower:
+                scores[name] = NAME_WEIGHT
+            elif needle in description:
+                scores[name] = DESCRIPTION_WEIGHT
+        return scores
+
+    def position(self, name: str) -> int:
+        """Skill 的注册顺序（同分排序使用）"""
+        return self._order[name]
+
+    def _postings(self, field_name: str) -> Dict[str, Set[str]]:
+        return {
+            "tags": self._tags,
+            "visibility": self._visibility,
+            "name_prefix": self._name_prefix,
+            "tag_prefix": self._tag_prefix,
+            "desc_prefix": self._desc_prefix,
+        }[field_name]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,349 @@
+"""
+Registry Snapshot - SkillRegistry 的不可变只读快照
+
+写操作（register/unregister/replace/set_enabled）在 Registry 的写锁内修改工作副本，
+之后的第一次读取构建一个新快照并通过一次属性赋值原子发布。
+读操作（中间件、搜索、工具查找）只访问快照，不加锁，也不会看到写了一半的状态；
+已经取得旧快照的调用（如进行中的模型调用）在整个调用期间看到一致的 Skill 集合。
+"""
+
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from langchain_core.tools import BaseTool
+
+from .base_skill import BaseSkill, SkillMetadata
+from .exceptions import SkillNotFoundError
+from .groups import build_group_loader, group_members
+from .metadata_table import MetadataTable
+from .search_index import SkillSearchIndex
+
+
+class RegistrySnapshot:
+    """
+    某一版本 Registry 内容的只读视图
+
+    快照发布后内容不再改变，因此工具集缓存属于快照本身，写操作无需清空缓存，
+    只需发布新快照
+    """
+
+    # Skill 数不少于该值时，支持 table_mask 的过滤函数改用列式表向量化扫描
+    # （更小的快照上逐个调用过滤函数更快，见 benchmarks.metadata）
+    COLUMNAR_MIN_SKILLS = 512
+
+    def __init__(
+        self,
+        version: int,
+        skills: Dict[str, BaseSkill],
+        metadata: Dict[str, SkillMetadata],
+        search_index: SkillSearchIndex,
+        tools_cache_size: int = 256,
+        stats: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            version: Registry 版本号
+            skills: Skill 名称 -> 实例（快照持有自己的拷贝）
+            metadata: Skill 名称 -> 元数据
+            search_index: 与该版本一致的搜索索引（发布后不再修改）
+            tools_cache_size: 工具集缓存的最大条目数
+            stats: 跨快照累计的缓存命中统计
+        """
+        self.version = version
+        self.skills: Mapping[str, BaseSkill] = MappingProxyType(skills)
+        self.metadata: Mapping[str, SkillMetadata] = MappingProxyType(metadata)
+        self.search_index = search_index
+
+        # (已加载 Skill 集合, filter_fn, include_loaders, 已打开的分组) -> 预构建的工具元组
+        self._tools_cache: "OrderedDict[Tuple[Any, ...], Tuple[BaseTool, ...]]" = OrderedDict()
+        self._tools_cache_size = tools_cache_size
+        self._stats = stats if stats is not None else {"hits": 0, "misses": 0}
+        self._dependency_graph: Optional[Mapping[str, Tuple[str, ...]]] = None
+        self._metadata_table: Optional[MetadataTable] = None
+        # 工具名称 -> 所属 Skill（首次查询时构建）
+        self._tool_owners: Optional[Dict[str, str]] = None
+        # Loader 名称 -> 所属 Skill（首次查询时构建）
+        self._loader_owners: Optional[Dict[str, str]] = None
+        # filter_fn -> {分组名称: 分组 Loader}
+        self._group_loaders: Dict[Any, Dict[str, BaseTool]] = {}
+
+    def get(self, skill_name: str) -> BaseSkill:
+        """获取指定名称的 Skill（不存在时抛出 SkillNotFoundError）"""
+        skill = self.skills.get(skill_name)
+        if skill is None:
+            raise SkillNotFoundError(skill_name)
+        return skill
+
+    def get_metadata(self, skill_name: str) -> SkillMetadata:
+        """获取 Skill 元数据（不存在时抛出 SkillNotFoundError）"""
+        meta = self.metadata.get(skill_name)
+        if meta is None:
+            raise SkillNotFoundError(skill_name)
+        return meta
+
+    def list_skills(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[str]:
+        """列出 Skill 名称（按注册顺序）"""
+        if filter_fn is None:
+            return list(self.skills)
+        table_mask = getattr(filter_fn, "table_mask", None)
+        if table_mask is not None and len(self.metadata) >= self.COLUMNAR_MIN_SKILLS:
+            table = self.metadata_table()
+            mask = table_mask(table)
+            if mask is not None:
+                return table.select(mask)
+        return [name for name, meta in self.metadata.items() if filter_fn(meta)]
+
+    def metadata_table(self) -> MetadataTable:
+        """该快照元数据的列式表（首次调用时构建）"""
+        table = self._metadata_table
+        if table is None:
+            table = MetadataTable(self.metadata)
+            self._metadata_table = table
+        return table
+
+    def get_all_loader_tools(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[BaseTool]:
+        """获取所有已启用 Skill 的 Loader Tools"""
+        return [
+            self.skills[name].get_loader_tool()
+            for name in self.list_skills(filter_fn)
+            if self.metadata[name].enabled
+        ]
+
+    def list_groups(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[str]:
+        """列出至少包含一个可见 Skill 的分组（按注册顺序）"""
+        return list(self._get_group_loaders(filter_fn))
+
+    def get_group_loader_tools(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[BaseTool]:
+        """获取所有分组的 Loader Tools"""
+        return list(self._get_group_loaders(filter_fn).values())
+
+    def _get_group_loaders(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]]
+    ) -> Dict[str, BaseTool]:
+        loaders = self._group_loaders.get(filter_fn)
+        if loaders is None:
+            loaders = {
+                group: build_group_loader(group, [
+                    (self.skills[meta.name].get_loader_tool().name, meta) for meta in members
+                ])
+                for group, members in group_members(self.metadata, filter_fn).items()
+            }
+            self._group_loaders[filter_fn] = loaders
+        return loaders
+
+    def get_all_tools(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[BaseTool]:
+        """获取所有已启用 Skill 的 Loader 和工具"""
+        all_tools = []
+        for name in self.list_skills(filter_fn):
+            if self.metadata[name].enabled:
+                skill = self.skills[name]
+                all_tools.append(skill.get_loader_tool())
+                all_tools.extend(skill.get_tools())
+        return all_tools
+
+    def get_tools_for_skills(
+        self,
+        skill_names: List[str],
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None,
+        include_loaders: bool = True,
+        groups_loaded: Optional[Iterable[str]] = None,
+        stats: Optional[Dict[str, int]] = None
+    ) -> Tuple[BaseTool, ...]:
+        """
+        所有 Loader Tools + 已加载 Skills 的工具（按注册顺序）
+
+        groups_loaded 不为 None 时使用分组模式：Loader 部分为所有分组 Loader、
+        未分组 Skill 的 Loader 和已打开分组内 Skill 的 Loader。
+
+        结果按 (已加载 Skill 集合, filter_fn, include_loaders, groups_loaded) 缓存在快照内。
+        命中统计记入 stats（默认为构造时传入的统计；共享快照的各个 Registry 传入自己的统计）。
+        并发读取不加锁：OrderedDict 的单个操作在 GIL 下是原子的，竞争时最坏只是重复构建同一个结果
+        """
+        key = (
+            frozenset(skill_names),
+            filter_fn,
+            include_loaders,
+            None if groups_loaded is None else frozenset(groups_loaded),
+        )
+
+        if stats is None:
+            stats = self._stats
+        cached = self._tools_cache.get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            try:
+                self._tools_cache.move_to_end(key)
+            except KeyError:
+                # 刚被其他线程淘汰
+                pass
+            return cached
+
+        stats["misses"] += 1
+
+        opened = key[3]
+        if not include_loaders:
+            tools = []
+        elif opened is None:
+            tools = self.get_all_loader_tools(filter_fn)
+        else:
+            tools = self.get_group_loader_tools(filter_fn)
+            tools.extend(
+                self.skills[name].get_loader_tool()
+                for name in self.list_skills(filter_fn)
+                if self.metadata[name].enabled
+                and (not self.metadata[name].group or self.metadata[name].group in opened)
+            )
+        loaded = key[0]
+        for name in self.list_skills(filter_fn):
+            if name in loaded and self.metadata[name].enabled:
+                tools.extend(self.skills[name].get_tools())
+
+        result = tuple(tools)
+        self._tools_cache[key] = result
+        while len(self._tools_cache) > self._tools_cache_size:
+            try:
+                self._tools_cache.popitem(last=False)
+            except KeyError:
+                break
+
+        return result
+
+    def tool_owner(self, tool_name: str) -> Optional[str]:
+        """
+        工具名称 -> 提供该工具的 Skill 名称（反向索引，每个快照构建一次）
+
+        只索引 Skill 的真实工具（不含 Loader）；包含已禁用的 Skill，由调用方判断是否允许。
+        多个 Skill 提供同名工具时取先注册的一个
+        """
+        owners = self._tool_owners
+        if owners is None:
+            owners = {}
+            for name, skill in self.skills.items():
+                for t in skill.get_tools():
+                    owners.setdefault(t.name, name)
+            self._tool_owners = owners
+        return owners.get(tool_name)
+
+    def loader_owner(self, tool_name: str) -> Optional[str]:
+        """Loader 名称 -> 对应的 Skill 名称（反向索引，每个快照构建一次）"""
+        owners = self._loader_owners
+        if owners is None:
+            owners = {skill.get_loader_tool().name: name for name, skill in self.skills.items()}
+            self._loader_owners = owners
+        return owners.get(tool_name)
+
+    def search(
+        self,
+        query: str = "",
+        tags: Optional[List[str]] = None,
+        visibility: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[SkillMetadata]:
+        """搜索 Skills（见 SkillSearchIndex.search），返回按相关度排序的元数据"""
+        names = self.search_index.search(
+            query=query,
+            tags=tags,
+            visibility=visibility,
+            limit=limit
+        )
+        return [self.metadata[name] for name in names]
+
+    def dependency_graph(self) -> Mapping[str, Tuple[str, ...]]:
+        """
+        Skill 依赖图：Skill 名称 -> 它依赖的已注册 Skill
+
+        SkillMetadata.dependencies 中不是已注册 Skill 的名称（如 Python 库）被忽略。
+        每个快照只计算一次
+        """
+        graph = self._dependency_graph
+        if graph is None:
+            graph = MappingProxyType({
+                name: tuple(dep for dep in meta.dependencies if dep in self.metadata and dep != name)
+                for name, meta in self.metadata.items()
+            })
+            self._dependency_graph = graph
+        return graph
+
+    def dependency_closure(
+        self,
+        skill_names: List[str],
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> List[str]:
+        """
+        计算一组 Skill 及其传递依赖
+
+        结果按依赖在前、被依赖的 Skill 在后的顺序排列（请求的 Skill 位于各自依赖之后），
+        这样 FIFO 等截断型 reducer 优先保留用户实际请求的 Skill。
+        不存在、已禁用或被 filter_fn 排除的 Skill 不会被激活
+
+        Args:
+            skill_names: 被请求激活的 Skill
+            filter_fn: 可选的过滤函数
+
+        Returns:
+            去重后的 Skill 名称列表
+        """
+        graph = self.dependency_graph()
+        result: List[str] = []
+        seen = set()
+
+        def visit(name: str) -> None:
+            if name in seen:
+                return
+            seen.add(name)
+            meta = self.metadata.get(name)
+            if meta is None or not meta.enabled or (filter_fn and not filter_fn(meta)):
+                return
+            for dep in graph[name]:
+                visit(dep)
+            result.append(name)
+
+        for name in skill_names:
+            visit(name)
+        return result
+
+    def instruction_tokens(
+        self,
+        filter_fn: Optional[Callable[[SkillMetadata], bool]] = None
+    ) -> Dict[str, int]:
+        """
+        已启用 Skill 的使用说明估算 token 数（每次激活写入上下文的大小）
+
+        说明文本和估算值缓存在 Skill 实例上，只在首次访问时读取和计算
+        """
+        return {
+            name: self.skills[name].instruction_tokens
+            for name in self.list_skills(filter_fn)
+            if self.metadata[name].enabled
+        }
+
+    @property
+    def cached_tool_sets(self) -> int:
+        """当前缓存的工具集条目数"""
+        return len(self._tools_cache)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def __contains__(self, skill_name: str) -> bool:
+        return skill_name in self.skills
+
+    def __repr__(self) -> str:
+        return f"<RegistrySnapshot v{self.version}: {len(self)} skills>"
@@ -62,8 +62,10 @@ class SkillState(MessagesState):
     Attributes:
         skills_loaded: 当前会话中已加载的 Skill 名称列表
         skill_context: 可选的 Skill 上下文数据（用于传递额外信息）
+        groups_loaded: 已打开的 Skill 分组（分组模式下使用，始终累积）
     """
     skills_loaded: Annotated[List[str], skill_list_reducer] = []
+    groups_loaded: Annotated[List[str], skill_list_accumulator] = []
     # 可选：添加 Skill 上下文存储
     # skill_context: Dict[str, Any] = {}
 
@@ -72,9 +74,11 @@ class SkillState(MessagesState):
 class SkillStateAccumulative(MessagesState):
     """累积模式：Skill 一旦加载就保持在整个会话中"""
     skills_loaded: Annotated[List[str], skill_list_accumulator] = []
+    groups_loaded: Annotated[List[str], skill_list_accumulator] = []
 
 
 # 示例：使用 FIFO 模式（最多 3 个 Skill）
 class SkillStateFIFO(MessagesState):
     """FIFO 模式：最多同时加载 3 个 Skill"""
     skills_loaded: Annotated[List[str], skill_list_fifo(3)] = []
+    groups_loaded: Annotated[List[str], skill_list_accumulator] = []
@@ -0,0 +1,259 @@
+"""
+Skill Watcher - Skills 目录热重载
+
+监视 skills_dir 下的每个 Skill 目录，只重新导入内容发生变化的 Skill：
+- 新增目录：加载并注册
+- 修改目录：重新导入、重新验证，通过后通过 SkillRegistry.replace() 原子替换
+- 删除目录：取消注册
+- 重新加载失败：保留旧 Skill，记录错误
+
+变化检测使用文件的 mtime/size 快照（只做 stat，不读文件内容）。
+安装了 watchfiles 时使用系统文件通知（Linux 上为 inotify）唤醒检查，否则按固定间隔轮询。
+
+正在进行中的会话不受影响：SkillMiddleware 会把每次模型调用时提供的工具对象
+固定到对应的 tool_call_id，执行时仍使用旧的工具对象。
+每次替换或取消注册后调用 on_change(旧 Skill, 新 Skill)，
+SkillAgent 借此把变化同步到 Agent 的 ToolNode。
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .base_skill import BaseSkill
+from .manifest import ManifestSkill
+from .registry import SkillRegistry
+from .registry_cache import _IGNORED_DIRS
+
+logger = logging.getLogger(__name__)
+
+_Snapshot = Tuple[Tuple[str, int, int], ...]
+
+# on_change(旧 Skill, 新 Skill)：新增时旧 Skill 为 None，删除时新 Skill 为 None
+ChangeCallback = Callable[[Optional[BaseSkill], Optional[BaseSkill]], None]
+
+
+@dataclass
+class ReloadEvent:
+    """
+    一次热重载动作
+
+    Attributes:
+        path: Skill 目录
+        action: "added" / "reloaded" / "removed" / "failed"
+        skill_name: 相关的 Skill 名称（加载失败且此前未注册时为 None）
+        error: 失败原因
+    """
+    path: Path
+    action: str
+    skill_name: Optional[str] = None
+    error: Optional[str] = None
+
+
+def snapshot_skill_dir(skill_dir: Path) -> _Snapshot:
+    """记录目录下所有文件的 (相对路径, mtime_ns, size)，忽略 __pycache__"""
+    entries = []
+    for path in skill_dir.rglob("*"):
+        relative = path.relative_to(skill_dir)
+        if _IGNORED_DIRS.intersection(relative.parts):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            # 扫描期间被删除
+            continue
+        if path.is_file():
+            entries.append((relative.as_posix(), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
+
+class SkillWatcher:
+    """
+    Skills 目录监视器
+
+    可以手动调用 check() 执行一次检查，也可以 start() 启动后台线程持续监视
+    """
+
+    def __init__(
+        self,
+        registry: SkillRegistry,
+        skills_dir: Path,
+        module_name: str = "skill",
+        use_manifest: bool = True,
+        interval: float = 1.0,
+        backend: str = "auto",
+        on_change: Optional[ChangeCallback] = None
+    ):
+        """
+        Args:
+            registry: Skill 注册中心（通常已通过 discover() 加载）
+            skills_dir: Skills 根目录
+            module_name: Skill 模块文件名
+            use_manifest: 是否使用 skill.yaml 清单
+            interval: 轮询间隔（秒），watchfiles 后端下为最长等待时间
+            backend: "auto"、"poll" 或 "watchfiles"
+            on_change: Registry 变化后在监视线程中调用（在检查锁内，下一次检查前完成）
+        """
+        if backend not in ("auto", "poll", "watchfiles"):
+            raise ValueError(f"Invalid watcher backend: {backend}")
+
+        self.registry = registry
+        self.skills_dir = Path(skills_dir)
+        self.module_name = module_name
+        self.use_manifest = use_manifest
+        self.interval = interval
+        self.backend = backend
+        self.on_change = on_change
+
+        self._snapshots: Dict[Path, _Snapshot] = {}
+        self._dir_to_skill: Dict[Path, str] = {}
+        self._check_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # 已注册 Skill 的目录 -> 名称
+        for name in registry.list_skills():
+            skill_dir = registry.get(name).skill_dir
+            if skill_dir is not None:
+                self._dir_to_skill[Path(skill_dir).resolve()] = name
+
+        # 以当前磁盘状态作为基线，之后只处理变化
+        for skill_dir in self._skill_dirs():
+            self._snapshots[skill_dir] = snapshot_skill_dir(skill_dir)
+
+    def _skill_dirs(self) -> List[Path]:
+        if not self.skills_dir.exists():
+            return []
+        return sorted(
+            p.resolve() for p in self.skills_dir.iterdir()
+            if p.is_dir() and not p.name.startswith("_")
+            and (p / f"{self.module_name}.py").exists()
+        )
+
+    def check(self) -> List[ReloadEvent]:
+        """
+        检查一次目录变化并应用
+
+        Returns:
+            本次执行的热重载动作（无变化时为空列表）
+        """
+        with self._check_lock:
+            events = []
+            current = {d: snapshot_skill_dir(d) for d in self._skill_dirs()}
+
+            for skill_dir in sorted(set(self._snapshots) - set(current)):
+                del self._snapshots[skill_dir]
+                name = self._dir_to_skill.pop(skill_dir, None)
+                if name is not None:
+                    old = self.registry.snapshot().skills.get(name)
+                    self.registry.unregister(name)
+                    self._notify(old, None)
+                    events.append(ReloadEvent(skill_dir, "removed", name))
+
+            for skill_dir, snapshot in current.items():
+                if self._snapshots.get(skill_dir) == snapshot:
+                    continue
+                self._snapshots[skill_dir] = snapshot
+                events.append(self._reload(skill_dir))
+
+        for event in events:
+            if event.action == "failed":
+                logger.error(f"[SkillWatcher] Failed to reload {event.path.name}: {event.error}")
+            else:
+                logger.info(f"[SkillWatcher] {event.action} skill: {event.skill_name}")
+
+        return events
+
+    def _reload(self, skill_dir: Path) -> ReloadEvent:
+        old_name = self._dir_to_skill.get(skill_dir)
+        try:
+            skill = self.registry.load_skill(skill_dir, self.module_name, self.use_manifest)
+            # 只导入这一个 Skill，但要在替换前确认真实模块可用，
+            # 否则坏掉的代码会在下一次 Loader 调用时才暴露
+            if isinstance(skill, ManifestSkill):
+                skill.resolve()
+            self._swap(skill, old_name)
+        except Exception as e:
+            return ReloadEvent(skill_dir, "failed", old_name, str(e))
+
+        name = skill.metadata.name
+        self._dir_to_skill[skill_dir] = name
+        return ReloadEvent(skill_dir, "reloaded" if old_name else "added", name)
+
+    def _swap(self, skill: BaseSkill, old_name: Optional[str]) -> None:
+        name = skill.metadata.name
+        if old_name is None and name in self.registry:
+            raise ValueError(f"Skill '{name}' is already provided by another directory")
+        old = self.registry.snapshot().skills.get(old_name) if old_name else None
+        self.registry.replace(skill, old_name)
+        self._notify(old, skill)
+
+    def _notify(self, old: Optional[BaseSkill], new: Optional[BaseSkill]) -> None:
+        if self.on_change is None:
+            return
+        try:
+            self.on_change(old, new)
+        except Exception as e:
+            # Registry 已经更新，回调失败不应让这次重载被记为失败
+            logger.exception(f"[SkillWatcher] on_change callback failed: {e}")
+
+    def start(self) -> "SkillWatcher":
+        """启动后台监视线程（守护线程）"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+
+        target = self._run_poll
+        if self.backend in ("auto", "watchfiles"):
+            try:
+                import watchfiles  # noqa: F401
+                target = self._run_watchfiles
+            except ImportError:
+                if self.backend == "watchfiles":
+                    raise
+                logger.info("watchfiles not installed, falling back to polling")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=target,
+            name="SkillWatcher",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"[SkillWatcher] Watching {self.skills_dir} ({target.__name__})")
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止后台监视线程"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout if timeout is not None else self.interval + 1.0)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _safe_check(self) -> None:
+        try:
+            self.check()
+        except Exception as e:
+            logger.exception(f"[SkillWatcher] Check failed: {e}")
+
+    def _run_poll(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._safe_check()
+
+    def _run_watchfiles(self) -> None:
+        import watchfiles
+
+        # 通知只用于唤醒；具体哪些 Skill 变化仍由快照比较决定，
+        # 编辑器的临时文件、多次写入等都会在 check() 中合并处理
+        for _ in watchfiles.watch(
+            self.skills_dir,
+            stop_event=self._stop_event,
+            rust_timeout=int(self.interval * 1000),
+            yield_on_timeout=False
+        ):
+            self._safe_check()
@@ -3,17 +3,34 @@ Middleware Module - 使用 LangChain 1.0 API 实现运行时工具过滤和状
 
 核心功能：
 - SkillMiddleware: 根据 skills_loaded 状态动态过滤工具
+- SkillRouterMiddleware: 第一次模型调用前按用户消息预先激活 Skills
+- 直接调用未加载 Skill 的工具时自动激活该 Skill（SkillMiddlewareMetrics 统计节省的轮数）
 - 使用 request.override(tools=...) 替换工具列表
+- RateLimitedSkillMiddleware: 按工具 / Skill 的令牌桶限速和并发上限保护昂贵工具
+  （RateLimitMixin 可与 PermissionAwareSkillMiddleware 组合，见 RateLimitedPermissionAwareSkillMiddleware）
+- ToolResultCacheMiddleware: 声明为可缓存的工具，相同参数的调用直接返回已有结果
 """
 
 from .skill_middleware import (
     SkillMiddleware,
+    SkillMiddlewareMetrics,
     PermissionAwareSkillMiddleware,
+    RateLimitMixin,
     RateLimitedSkillMiddleware,
+    RateLimitedPermissionAwareSkillMiddleware,
 )
+from .rate_limit import RateLimit
+from .result_cache import ToolResultCacheMiddleware
+from .skill_router import SkillRouterMiddleware
 
 __all__ = [
     "SkillMiddleware",
+    "SkillMiddlewareMetrics",
     "PermissionAwareSkillMiddleware",
+    "RateLimitMixin",
     "RateLimitedSkillMiddleware",
+    "RateLimitedPermissionAwareSkillMiddleware",
+    "RateLimit",
+    "ToolResultCacheMiddleware",
+    "SkillRouterMiddleware",
 ]
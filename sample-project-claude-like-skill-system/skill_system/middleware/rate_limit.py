@@ -0,0 +1,189 @@
+"""
+Rate Limit - 令牌桶限速与并发上限
+
+RateLimitMixin（RateLimitedSkillMiddleware 等）为每个受限的工具 / Skill 维护一个 Limiter：
+- TokenBucket：按 rate（每秒令牌数）补充、容量为 burst 的令牌桶；
+  令牌不足时预约下一个令牌并返回需要等待的秒数，等待时间超过上限时不预约
+- InFlightLimiter：同时执行的调用数上限；同步路径用 Condition 阻塞等待，
+  异步路径用 asyncio.sleep 轮询（不阻塞事件循环）
+
+Limiter 属于中间件实例，同一个 Agent 的所有会话共享，用于防止昂贵工具被并发请求击穿。
+"""
+
+import asyncio
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """
+    一个工具或 Skill 的限制
+
+    Attributes:
+        rate: 每秒允许的调用数（None 表示不限速）
+        burst: 令牌桶容量（默认 max(1, ceil(rate))）
+        max_in_flight: 同时执行的最大调用数（None 表示不限制）
+    """
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+    def __post_init__(self):
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError(f"rate must be positive, got {self.rate}")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError(f"burst must be at least 1, got {self.burst}")
+        if self.max_in_flight is not None and self.max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {self.max_in_flight}")
+
+    @classmethod
+    def from_config(cls, value: Any) -> "RateLimit":
+        """从配置值创建（RateLimit 或 {"rate", "burst", "max_in_flight"} 字典）"""
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, dict):
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        unknown = set(value) - {"rate", "burst", "max_in_flight"}
+        if unknown:
+            raise ValueError(f"Unknown rate limit keys: {sorted(unknown)}")
+        return cls(
+            rate=float(value["rate"]) if value.get("rate") is not None else None,
+            burst=int(value["burst"]) if value.get("burst") is not None else None,
+            max_in_flight=int(value["max_in_flight"]) if value.get("max_in_flight") is not None else None,
+        )
+
+
+class TokenBucket:
+    """令牌桶（线程安全）"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: 每秒补充的令牌数
+            burst: 桶容量（初始为满）
+            clock: 单调时钟（测试时可替换）
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        取走一个令牌
+
+        令牌不足时预约下一个可用令牌（令牌数可以为负，后来者排在后面）
+
+        Returns:
+            调用方需要等待的秒数；需要等待超过 max_wait 时返回 None（不取令牌）
+        """
+        with self._lock:
+            self._refill()
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def cancel(self) -> None:
+        """归还 reserve() 取走的令牌"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    def wait_time(self) -> float:
+        """现在取令牌需要等待的秒数（不取令牌）"""
+        with self._lock:
+            self._refill()
+            return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+
+class InFlightLimiter:
+    """同时执行的调用数上限（线程安全）"""
+
+    # 异步等待时的轮询间隔上限（秒）
+    ASYNC_POLL_INTERVAL = 0.05
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            return True
+
+    def acquire(self, timeout: float) -> bool:
+        """阻塞等待一个执行槽位，超时返回 False"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < self.max_in_flight, timeout):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def aacquire(self, timeout: float) -> bool:
+        """异步等待一个执行槽位（轮询，不阻塞事件循环），超时返回 False"""
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while not self.try_acquire():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.ASYNC_POLL_INTERVAL)
+        return True
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+
+class Limiter:
+    """一个工具或 Skill 的令牌桶 + 并发上限"""
+
+    def __init__(self, name: str, limit: RateLimit):
+        """
+        Args:
+            name: 限制对象的名称（用于错误消息）
+            limit: 限制配置
+        """
+        self.name = name
+        self.limit = limit
+        self.bucket: Optional[TokenBucket] = None
+        if limit.rate is not None:
+            burst = limit.burst if limit.burst is not None else max(1, math.ceil(limit.rate))
+            self.bucket = TokenBucket(limit.rate, burst)
+        self.in_flight: Optional[InFlightLimiter] = None
+        if limit.max_in_flight is not None:
+            self.in_flight = InFlightLimiter(limit.max_in_flight)
+
+    def is_saturated(self, max_wait: float) -> bool:
+        """现在调用需要等待超过 max_wait 才能取得令牌"""
+        return self.bucket is not None and self.bucket.wait_time() > max_wait
+
+    def __repr__(self) -> str:
+        return f"<Limiter: {self.name} {self.limit}>"
+
+
+def build_limiters(limits: Optional[Dict[str, Any]]) -> Dict[str, Limiter]:
+    """名称 -> 限制配置 转换为 名称 -> Limiter（没有任何限制的条目被忽略）"""
+    limiters = {}
+    for name, value in (limits or {}).items():
+        limit = RateLimit.from_config(value)
+        if limit.rate is not None or limit.max_in_flight is not None:
+            limiters[name] = Limiter(name, limit)
+    return limiters
@@ -0,0 +1,179 @@
+"""
+Tool Result Cache Middleware - 拦截工具调用，直接返回可缓存工具的已有结果
+
+只缓存通过 core.result_cache.cacheable() 声明的工具，并且只缓存成功的 ToolMessage
+（status 为 error 或内容以 "Error" 开头的结果不缓存，与本仓库工具返回错误的约定一致）。
+命中时不执行工具，只把缓存的消息换成本次调用的 tool_call_id。
+
+放在 SkillMiddleware 之前（外层）：命中的调用不经过限速等待。
+以下调用不使用缓存，直接交给内层中间件处理：
+- 所属 Skill 尚未加载：让 SkillMiddleware 照常自动激活该 Skill
+- 本次请求的用户权限（runtime.context 中的 user_permissions，没有时使用 user_permissions 参数）
+  不满足所属 Skill 的 required_permissions：由 PermissionAwareSkillMiddleware 照常拒绝，
+  缓存不会把已授权会话的结果返回给未授权的调用方
+
+缓存键还包含所属 Skill 的代次：Skill 被 replace、热重载或 add_skill 换成新实例后代次递增，
+旧实例缓存的结果被丢弃，不会返回给新代码。
+
+Loader 的 first action（见 core.loader_action）同样经过缓存：命中时不执行 action。
+"""
+
+import itertools
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from skill_system.core.base_skill import BaseSkill
+from skill_system.core.loader_action import action_policy
+from skill_system.core.permissions import PermissionFilter, context_permissions
+from skill_system.core.registry import SkillRegistry
+from skill_system.core.result_cache import ToolResultCache, cache_options, tool_cache_key
+from skill_system.middleware.skill_middleware import is_error_result
+
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCacheMiddleware(AgentMiddleware):
+    """
+    工具结果缓存中间件
+
+    同一个中间件实例的所有会话共享缓存；命中统计见 get_stats()
+    """
+
+    def __init__(
+        self,
+        skill_registry: Optional[SkillRegistry] = None,
+        max_size: int = 1024,
+        default_ttl: Optional[float] = None,
+        user_permissions: Optional[List[str]] = None,
+        verbose: bool = False
+    ):
+        """
+        Args:
+            skill_registry: Skill 注册中心（提供时，所属 Skill 未加载或未授权的调用不使用缓存）
+            max_size: 最多缓存的结果数
+            default_ttl: 工具没有声明 ttl 时的有效期（秒，None 表示不过期）
+            user_permissions: 用户权限列表（请求 context 中没有提供时使用）
+            verbose: 是否打印详细日志
+        """
+        super().__init__()
+        self.registry = skill_registry
+        self.permission_filter = PermissionFilter.for_permissions(user_permissions)
+        self.cache = ToolResultCache(max_size=max_size, default_ttl=default_ttl)
+        self.verbose = verbose
+        # Skill 名称 -> (缓存结果时的 Skill 实例, 代次)
+        self._owners: Dict[str, Tuple[BaseSkill, int]] = {}
+        self._owners_lock = threading.Lock()
+        self._generations = itertools.count()
+
+    def _lookup(
+        self,
+        request: ToolCallRequest
+    ) -> Tuple[Optional[Tuple[Any, ...]], Optional[Dict[str, Any]], Optional[ToolMessage]]:
+        """返回 (缓存键, 缓存选项, 命中的消息)；不可缓存的调用返回 (None, None, None)"""
+        options = cache_options(request.tool)
+        if options is None:
+            return None, None, None
+        allowed, scope = self._cache_scope(request)
+        if not allowed:
+            return None, None, None
+
+        call = request.tool_call
+        key = (*scope, *tool_cache_key(call["name"], call.get("args") or {}, options.get("file_args") or ()))
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, options, None
+
+        if self.verbose:
+            logger.info(f"[ToolResultCacheMiddleware] Cache hit for {call['name']}")
+        return key, options, cached.model_copy(update={"tool_call_id": call.get("id"), "id": None})
+
+    def _cache_scope(self, request: ToolCallRequest) -> Tuple[bool, Tuple[Any, ...]]:
+        """
+        返回 (是否使用缓存, 键前缀)
+
+        使用缓存要求所属 Skill 已加载，且本次请求的用户权限满足该 Skill 的要求；
+        键前缀为 (所属 Skill, 代次)，不属于任何 Skill 的工具为 (None, None)
+        """
+        if self.registry is None:
+            return True, (None, None)
+        snapshot = self.registry.snapshot()
+        owner = snapshot.tool_owner(request.tool_call["name"])
+        if owner is None:
+            return True, (None, None)
+        state = request.state if isinstance(request.state, dict) else {}
+        if owner not in (state.get("skills_loaded") or []):
+            return False, ()
+
+        permissions = context_permissions(getattr(request.runtime, "context", None))
+        if permissions is None:
+            permission_filter = self.permission_filter
+        else:
+            permission_filter = PermissionFilter.for_permissions(permissions)
+        if not permission_filter(snapshot.metadata[owner]):
+            return False, ()
+        return True, (owner, self._generation(owner, snapshot.skills[owner]))
+
+    def _generation(self, owner: str, skill: BaseSkill) -> int:
+        """所属 Skill 当前实例的代次；实例变化时丢弃旧代次的缓存结果"""
+        with self._owners_lock:
+            known = self._owners.get(owner)
+            if known is not None and known[0] is skill:
+                return known[1]
+            generation = next(self._generations)
+            self._owners[owner] = (skill, generation)
+
+        if known is not None:
+            dropped = self.cache.invalidate(lambda key: key[0] == owner and key[1] != generation)
+            if self.verbose:
+                logger.info(f"[ToolResultCacheMiddleware] Skill '{owner}' changed, dropped {dropped} cached results")
+        return generation
+
+    def _store(
+        self,
+        key: Tuple[Any, ...],
+        options: Dict[str, Any],
+        result: Union[ToolMessage, Command]
+    ) -> None:
+        if not isinstance(result, ToolMessage) or is_error_result(result):
+            return
+        self.cache.put(key, result, options.get("ttl"))
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Union[ToolMessage, Command]]
+    ) -> Union[ToolMessage, Command]:
+        """命中时直接返回缓存结果，否则执行工具并缓存成功的结果"""
+        key, options, cached = self._lookup(request)
+        if cached is not None:
+            return cached
+        with action_policy(self.wrap_tool_call):
+            result = handler(request)
+        if key is not None:
+            self._store(key, options, result)
+        return result
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[Union[ToolMessage, Command]]]
+    ) -> Union[ToolMessage, Command]:
+        """异步版本 - 命中时直接返回缓存结果"""
+        key, options, cached = self._lookup(request)
+        if cached is not None:
+            return cached
+        with action_policy(self.wrap_tool_call):
+            result = await handler(request)
+        if key is not None:
+            self._store(key, options, result)
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """缓存命中、未命中、淘汰、过期次数和当前条目数"""
+        return self.cache.stats()
@@ -6,21 +6,78 @@ Skill Middleware - 使用 LangChain 1.0 正确的 API 实现运行时动态工
 这是 Claude Skills 的核心 - 让模型只看到相关的 5 个工具，而不是全部 50 个
 """
 
+import asyncio
+import dataclasses
 import logging
-from typing import Optional, List, Callable, Any
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, List, Callable, Any, Dict, Awaitable, Tuple, Union
 
 from langchain.agents.middleware import (
     AgentMiddleware,
     ModelRequest,
     ModelResponse,
 )
+from langchain_core.messages import AIMessage, ToolMessage
 from langchain_core.tools import BaseTool
-
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from skill_system.core.exceptions import SkillPermissionError, SkillRateLimitError
+from skill_system.core.loader_action import action_policy
+from skill_system.core.meta_tools import create_meta_tools
+from skill_system.core.metadata_table import CombinedFilter
+from skill_system.core.permissions import PermissionFilter, context_permissions
 from skill_system.core.registry import SkillRegistry
+from skill_system.middleware.rate_limit import Limiter, build_limiters
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SkillMiddlewareMetrics:
+    """
+    中间件统计
+
+    Attributes:
+        auto_activations: 模型直接调用未加载 Skill 的工具时自动激活该 Skill 的次数
+        loader_actions: Loader 调用时同时执行了第一个工具（action）的次数
+        instruction_tokens: 激活 Skill 时写入上下文的使用说明估算 token 总数
+        permission_denials: 因权限不足被拒绝执行的工具调用次数（PermissionAwareSkillMiddleware）
+        rate_limit_waits: 因速率 / 并发限制等待后才执行的工具调用次数（RateLimitMixin）
+        rate_limit_rejections: 等待超时被拒绝执行的工具调用次数（RateLimitMixin）
+    """
+    auto_activations: int = 0
+    loader_actions: int = 0
+    instruction_tokens: int = 0
+    permission_denials: int = 0
+    rate_limit_waits: int = 0
+    rate_limit_rejections: int = 0
+
+    @property
+    def loader_turns_saved(self) -> int:
+        """
+        节省的模型轮数
+
+        每次自动激活省去一轮 Loader 调用和一次重试；每次 Loader action 省去一轮工具调用
+        """
+        return self.auto_activations + self.loader_actions
+
+    def to_dict(self) -> Dict[str, int]:
+        """转换为字典格式"""
+        return {
+            "auto_activations": self.auto_activations,
+            "loader_actions": self.loader_actions,
+            "instruction_tokens": self.instruction_tokens,
+            "permission_denials": self.permission_denials,
+            "rate_limit_waits": self.rate_limit_waits,
+            "rate_limit_rejections": self.rate_limit_rejections,
+            "loader_turns_saved": self.loader_turns_saved,
+        }
+
+
 class SkillMiddleware(AgentMiddleware):
     """
     Skill 中间件 - 实现动态工具过滤
@@ -33,41 +90,106 @@ class SkillMiddleware(AgentMiddleware):
     5. 传递给下一个 handler
 
     这样模型只会看到相关的工具，大大减少 token 使用和错误率
+
+    热重载支持：模型调用返回后，把本轮提供给模型的工具对象按 tool_call_id 固定下来，
+    执行工具时 (wrap_tool_call) 使用固定的对象。Skill 在两者之间被热替换时，
+    进行中的这一轮仍使用旧工具；之后的模型调用才会看到新工具。
+
+    meta 模式 (loader_mode="meta")：不暴露每个 Skill 的 Loader，改为始终提供
+    find_skills / load_skill 两个 Meta Tool，工具列表不随 Skill 数量增长。
+
+    分组模式 (group_loaders=True)：按 SkillMetadata.group 两级加载，只有 groups_loaded
+    中分组的 Skill Loader 可见，其余分组只暴露一个 group_<name> Loader。
+
+    自动激活 (auto_activate=True)：模型跳过 Loader 直接调用某个未加载 Skill 的工具时，
+    只要该 Skill 已启用且通过 filter_fn，就照常执行工具，并在同一步激活该 Skill、
+    把使用说明附在工具结果之后，不把调用退回给模型。工具调用失败时
+    （见 is_error_result）原样返回错误，不激活该 Skill。
     """
 
+    # 最多保留的固定工具条目（未执行的工具调用不会无限累积）
+    MAX_PINNED_TOOL_CALLS = 1024
+
     def __init__(
         self,
         skill_registry: SkillRegistry,
         verbose: bool = False,
-        filter_fn: Optional[Callable[[Any], bool]] = None
+        filter_fn: Optional[Callable[[Any], bool]] = None,
+        loader_mode: str = "per_skill",
+        meta_tools: Optional[List[BaseTool]] = None,
+        group_loaders: bool = False,
+        auto_activate: bool = True
     ):
         """
         Args:
             skill_registry: Skill 注册中心
             verbose: 是否打印详细日志
             filter_fn: 可选的额外过滤函数（用于权限控制等）
+            loader_mode: "per_skill"（每个 Skill 一个 Loader）或 "meta"（find_skills / load_skill）
+            meta_tools: meta 模式下使用的 Meta Tools（默认按 registry 和 filter_fn 创建）
+            group_loaders: 是否按分组两级加载（读取状态中的 groups_loaded）
+            auto_activate: 直接调用未加载 Skill 的工具时是否自动激活该 Skill
         """
         super().__init__()
+        if loader_mode not in ("per_skill", "meta"):
+            raise ValueError(f"loader_mode must be 'per_skill' or 'meta', got {loader_mode!r}")
         self.registry = skill_registry
         self.verbose = verbose
         self.filter_fn = filter_fn
-
-    def _get_filtered_tools(self, skills_loaded: List[str]) -> List[BaseTool]:
+        self.loader_mode = loader_mode
+        if loader_mode == "meta" and meta_tools is None:
+            meta_tools = create_meta_tools(skill_registry, filter_fn)
+        self.meta_tools: List[BaseTool] = list(meta_tools or [])
+        self.group_loaders = group_loaders
+        self.auto_activate = auto_activate
+        self.metrics = SkillMiddlewareMetrics()
+
+        # tool_call_id -> 发起该调用的那一轮模型所看到的工具对象
+        self._pinned_tools: "OrderedDict[str, BaseTool]" = OrderedDict()
+        self._pinned_lock = threading.Lock()
+        # 未被固定的调用（如路由器注入的 Loader 调用）按名称查找 Registry 当前版本的工具
+        self._current_tools: Dict[str, BaseTool] = {}
+        self._current_snapshot: Optional[Any] = None
+
+    def _request_filter(self, request: Union[ModelRequest, ToolCallRequest]) -> Optional[Callable[[Any], bool]]:
+        """本次调用使用的过滤函数（子类可以按请求上下文返回不同的过滤函数）"""
+        return self.filter_fn
+
+    def _get_filtered_tools(
+        self,
+        skills_loaded: List[str],
+        groups_loaded: Optional[List[str]] = None,
+        filter_fn: Optional[Callable[[Any], bool]] = None
+    ) -> List[BaseTool]:
         """
         获取过滤后的工具列表
 
         Args:
             skills_loaded: 已加载的 Skill 名称列表
+            groups_loaded: 已打开的分组（仅分组模式使用）
+            filter_fn: 本次请求的过滤函数（默认使用 self.filter_fn）
 
         Returns:
-            过滤后的工具列表（Loaders + 已加载 Skills 的工具）
+            过滤后的工具列表（Loaders 或 Meta Tools + 已加载 Skills 的工具）
         """
         # 从 Registry 获取工具
-        # 注意：filter_fn 是针对 SkillMetadata 的，已在 Registry 层面应用
-        # 这里不再重复应用 filter_fn
-        tools = self.registry.get_tools_for_skills(skills_loaded)
+        # filter_fn 是针对 SkillMetadata 的，与 skills_loaded 一起作为 Registry 缓存键，
+        # 稳态下每轮只是一次字典查找
+        if filter_fn is None:
+            filter_fn = self.filter_fn
+        if self.loader_mode == "meta":
+            tools = self.registry.get_tools_for_skills(
+                skills_loaded, filter_fn, include_loaders=False
+            )
+            return [*self.meta_tools, *tools]
 
-        return tools
+        tools = self.registry.get_tools_for_skills(
+            skills_loaded,
+            filter_fn,
+            groups_loaded=(groups_loaded or []) if self.group_loaders else None
+        )
+
+        return list(tools)
 
     def wrap_model_call(
         self,
@@ -87,15 +209,20 @@ class SkillMiddleware(AgentMiddleware):
         # 从状态中获取已加载的 Skills
         # AgentState 是 TypedDict (基于 dict)，使用字典方式访问
         skills_loaded = []
+        groups_loaded = []
         if hasattr(request, 'state') and request.state is not None:
             # 优先使用字典访问方式
             if isinstance(request.state, dict):
                 skills_loaded = request.state.get("skills_loaded", [])
+                groups_loaded = request.state.get("groups_loaded", [])
             else:
                 skills_loaded = getattr(request.state, "skills_loaded", [])
+                groups_loaded = getattr(request.state, "groups_loaded", [])
 
         # 获取过滤后的工具
-        relevant_tools = self._get_filtered_tools(skills_loaded)
+        relevant_tools = self._get_filtered_tools(
+            skills_loaded, groups_loaded, self._request_filter(request)
+        )
 
         # 记录日志
         if self.verbose:
@@ -109,7 +236,9 @@ class SkillMiddleware(AgentMiddleware):
         filtered_request = request.override(tools=relevant_tools)
 
         # 调用下一个 handler
-        return handler(filtered_request)
+        response = handler(filtered_request)
+        self._pin_tool_calls(response, relevant_tools)
+        return response
 
     async def awrap_model_call(
         self,
@@ -123,14 +252,19 @@ class SkillMiddleware(AgentMiddleware):
         """
         # 从状态中获取已加载的 Skills (字典方式访问)
         skills_loaded = []
+        groups_loaded = []
         if hasattr(request, 'state') and request.state is not None:
             if isinstance(request.state, dict):
                 skills_loaded = request.state.get("skills_loaded", [])
+                groups_loaded = request.state.get("groups_loaded", [])
             else:
                 skills_loaded = getattr(request.state, "skills_loaded", [])
+                groups_loaded = getattr(request.state, "groups_loaded", [])
 
         # 获取过滤后的工具
-        relevant_tools = self._get_filtered_tools(skills_loaded)
+        relevant_tools = self._get_filtered_tools(
+            skills_loaded, groups_loaded, self._request_filter(request)
+        )
 
         # 记录日志
         if self.verbose:
@@ -144,71 +278,576 @@ class SkillMiddleware(AgentMiddleware):
         filtered_request = request.override(tools=relevant_tools)
 
         # 调用下一个 handler
-        return await handler(filtered_request)
+        response = await handler(filtered_request)
+        self._pin_tool_calls(response, relevant_tools)
+        return response
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Union[ToolMessage, Command]]
+    ) -> Union[ToolMessage, Command]:
+        """执行工具时使用发起调用那一轮固定的工具对象，自动激活未加载的 Skill，并展开 Loader 的依赖"""
+        activation = self._find_auto_activation(request)
+        result = handler(self._resolve_tool_request(request))
+        if activation is not None:
+            result = self._auto_activate(request, result, *activation)
+        self._count_loader_action(request, result)
+        result = self._expand_dependencies(request, result)
+        self._count_instruction_tokens(request, result)
+        return result
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[Union[ToolMessage, Command]]]
+    ) -> Union[ToolMessage, Command]:
+        """异步版本 - 执行工具时使用固定的工具对象，自动激活未加载的 Skill，并展开 Loader 的依赖"""
+        activation = self._find_auto_activation(request)
+        result = await handler(self._resolve_tool_request(request))
+        if activation is not None:
+            result = self._auto_activate(request, result, *activation)
+        self._count_loader_action(request, result)
+        result = self._expand_dependencies(request, result)
+        self._count_instruction_tokens(request, result)
+        return result
+
+    def _find_auto_activation(self, request: ToolCallRequest) -> Optional[Tuple[str, str]]:
+        """
+        被调用的工具属于一个未加载、已启用且允许使用的 Skill 时，返回 (Skill 名称, 使用说明)
+        """
+        if not self.auto_activate:
+            return None
+        snapshot = self.registry.snapshot()
+        owner = snapshot.tool_owner(request.tool_call["name"])
+        if owner is None:
+            return None
+
+        meta = snapshot.metadata[owner]
+        filter_fn = self._request_filter(request)
+        if not meta.enabled or (filter_fn is not None and not filter_fn(meta)):
+            return None
+        state = request.state if isinstance(request.state, dict) else {}
+        if owner in (state.get("skills_loaded") or []):
+            return None
+        return owner, snapshot.get(owner).get_instructions()
+
+    def _auto_activate(
+        self,
+        request: ToolCallRequest,
+        result: Union[ToolMessage, Command],
+        skill_name: str,
+        instructions: str
+    ) -> Union[ToolMessage, Command]:
+        """
+        把工具结果包装成与 Loader 相同的状态更新：结果 + 使用说明，并写入 skills_loaded
+
+        工具调用失败时原样返回结果，不激活 Skill
+        """
+        note = (
+            f"[Skill '{skill_name}' was activated automatically for this call. "
+            f"Instructions:]\n{instructions}"
+        )
+
+        if isinstance(result, ToolMessage):
+            if is_error_result(result):
+                return result
+            result = Command(update={
+                "messages": [_append_text(result, note)],
+                "skills_loaded": [skill_name],
+            })
+        elif isinstance(result, Command) and isinstance(result.update, dict):
+            call_id = request.tool_call.get("id")
+            if any(
+                isinstance(msg, ToolMessage) and msg.tool_call_id == call_id and is_error_result(msg)
+                for msg in result.update.get("messages") or []
+            ):
+                return result
+            messages = [
+                _append_text(msg, note)
+                if isinstance(msg, ToolMessage) and msg.tool_call_id == call_id else msg
+                for msg in result.update.get("messages") or []
+            ]
+            loaded = list(result.update.get("skills_loaded") or [])
+            update = {**result.update, "messages": messages, "skills_loaded": [*loaded, skill_name]}
+            result = dataclasses.replace(result, update=update)
+        else:
+            return result
+
+        self.metrics.auto_activations += 1
+        if self.verbose:
+            logger.info(
+                f"[SkillMiddleware] Auto-activated {skill_name} for direct call to "
+                f"{request.tool_call['name']}"
+            )
+        return result
+
+    def _count_loader_action(self, request: ToolCallRequest, result: Union[ToolMessage, Command]) -> None:
+        """Loader 激活 Skill 的同时执行了 action 时计数"""
+        args = request.tool_call.get("args") or {}
+        if (
+            isinstance(args, dict) and args.get("action")
+            and isinstance(result, Command) and isinstance(result.update, dict)
+            and result.update.get("skills_loaded")
+        ):
+            self.metrics.loader_actions += 1
+            if self.verbose:
+                logger.info(
+                    f"[SkillMiddleware] {request.tool_call['name']} loaded its skill and ran "
+                    f"{args['action']} in one step"
+                )
+
+    def _count_instruction_tokens(self, request: ToolCallRequest, result: Union[ToolMessage, Command]) -> None:
+        """累计本次调用新激活的 Skill 的使用说明 token 数（估算值缓存在 Skill 实例上）"""
+        if not isinstance(result, Command) or not isinstance(result.update, dict):
+            return
+        activated = result.update.get("skills_loaded")
+        if not activated:
+            return
+
+        state = request.state if isinstance(request.state, dict) else {}
+        already_loaded = set(state.get("skills_loaded") or [])
+        snapshot = self.registry.snapshot()
+        self.metrics.instruction_tokens += sum(
+            snapshot.get(name).instruction_tokens
+            for name in activated if name not in already_loaded and name in snapshot
+        )
+
+    def _expand_dependencies(
+        self,
+        request: ToolCallRequest,
+        result: Union[ToolMessage, Command]
+    ) -> Union[ToolMessage, Command]:
+        """
+        Loader 返回的 Command 只激活了自身时，把依赖的 Skill 一并激活
+
+        在同一次状态更新中把 skills_loaded 扩展为依赖闭包，并把尚未加载的依赖的
+        使用说明追加到 Loader 的 ToolMessage，省去模型逐个调用依赖 Loader 的轮次
+        """
+        if not isinstance(result, Command) or not isinstance(result.update, dict):
+            return result
+        requested = result.update.get("skills_loaded")
+        if not requested:
+            return result
+
+        snapshot = self.registry.snapshot()
+        closure = snapshot.dependency_closure(requested, self._request_filter(request))
+        added = [name for name in closure if name not in requested]
+        if not added:
+            return result
+
+        state = request.state if isinstance(request.state, dict) else {}
+        already_loaded = set(state.get("skills_loaded") or [])
+        extra_instructions = [
+            snapshot.get(name).get_instructions()
+            for name in added if name not in already_loaded
+        ]
+
+        messages = list(result.update.get("messages") or [])
+        call_id = request.tool_call.get("id")
+        for i, msg in enumerate(messages):
+            if isinstance(msg, ToolMessage) and msg.tool_call_id == call_id and extra_instructions:
+                content = "\n\n".join([str(msg.content), *extra_instructions])
+                messages[i] = msg.model_copy(update={"content": content})
+                break
+
+        if self.verbose:
+            logger.info(f"[SkillMiddleware] Co-activating dependencies {added} for {requested}")
+
+        update = {**result.update, "skills_loaded": closure}
+        if messages:
+            update["messages"] = messages
+        return dataclasses.replace(result, update=update)
+
+    def _pin_tool_calls(self, response: Any, tools: List[BaseTool]) -> None:
+        """记录模型本轮发起的每个工具调用对应的工具对象"""
+        if isinstance(response, AIMessage):
+            messages = [response]
+        else:
+            messages = getattr(response, "result", None) or []
+
+        tool_calls = [
+            call for msg in messages if isinstance(msg, AIMessage)
+            for call in msg.tool_calls if call.get("id")
+        ]
+        if not tool_calls:
+            return
+
+        tools_by_name = {t.name: t for t in tools}
+        with self._pinned_lock:
+            for call in tool_calls:
+                pinned = tools_by_name.get(call["name"])
+                if pinned is not None:
+                    self._pinned_tools[call["id"]] = pinned
+            while len(self._pinned_tools) > self.MAX_PINNED_TOOL_CALLS:
+                self._pinned_tools.popitem(last=False)
+
+    def _resolve_tool_request(self, request: ToolCallRequest) -> ToolCallRequest:
+        """用固定的（或 Registry 当前的）工具对象替换 ToolNode 创建时注册的工具"""
+        call_id = request.tool_call.get("id")
+        with self._pinned_lock:
+            pinned = self._pinned_tools.pop(call_id, None) if call_id else None
+
+        if pinned is None:
+            pinned = self._get_current_tool(request.tool_call["name"])
+        if pinned is None or pinned is request.tool:
+            return request
+        return request.override(tool=pinned)
+
+    def _get_current_tool(self, tool_name: str) -> Optional[BaseTool]:
+        snapshot = self.registry.snapshot()
+        if self._current_snapshot is not snapshot:
+            self._current_tools = {
+                t.name: t for t in snapshot.get_all_tools(self.filter_fn)
+            }
+            self._current_snapshot = snapshot
+        return self._current_tools.get(tool_name)
+
+
+def is_error_result(message: ToolMessage) -> bool:
+    """
+    工具结果是否表示失败
+
+    本仓库工具返回错误的约定：status 为 error，或字符串内容以 "Error" 开头。
+    失败的结果不触发自动激活，也不进入结果缓存（ToolResultCacheMiddleware）
+    """
+    if message.status == "error":
+        return True
+    return isinstance(message.content, str) and message.content.startswith("Error")
+
+
+def _append_text(message: ToolMessage, text: str) -> ToolMessage:
+    """在 ToolMessage 内容之后追加一段文本（兼容字符串和内容块列表）"""
+    content = message.content
+    if isinstance(content, str):
+        content = f"{content}\n\n{text}" if content else text
+    else:
+        content = [*content, {"type": "text", "text": text}]
+    return message.model_copy(update={"content": content})
 
 
 class PermissionAwareSkillMiddleware(SkillMiddleware):
     """
     带权限控制的 Skill 中间件
 
-    示例：根据用户权限过滤可用的工具
+    Skill 的 required_permissions 在注册时已编译为位掩码（SkillMetadata.permission_mask），
+    用户权限在请求时编译为 PermissionFilter：过滤 Loader 和工具只需对每个 Skill 做一次整数运算，
+    过滤结果按 (权限掩码, skills_loaded) 缓存在 Registry 快照中。
+
+    用户权限默认取构造参数 user_permissions；Agent 调用时在 context 中提供 user_permissions
+    （字典键或属性）可以按请求覆盖。直接调用未授权 Skill 的 Loader 或工具时返回权限错误，
+    不执行工具。
+
+    注意：ToolNode 只能执行创建 Agent 时注册的工具，按请求授予的权限不能超出创建 Agent 时的过滤范围
     """
 
     def __init__(
         self,
         skill_registry: SkillRegistry,
         user_permissions: Optional[List[str]] = None,
-        verbose: bool = False
+        verbose: bool = False,
+        filter_fn: Optional[Callable[[Any], bool]] = None,
+        **kwargs: Any
     ):
         """
         Args:
             skill_registry: Skill 注册中心
-            user_permissions: 用户权限列表
+            user_permissions: 用户权限列表（请求 context 中没有提供时使用）
             verbose: 是否打印详细日志
+            filter_fn: 与权限过滤同时生效的其它过滤函数（如可见性）
+            **kwargs: 传给 SkillMiddleware 的其它参数（loader_mode、group_loaders 等）
         """
-        self.user_permissions = user_permissions or []
-
-        # 定义权限过滤函数
-        def permission_filter(tool: BaseTool) -> bool:
-            # 简化示例：检查工具名称是否在允许列表中
-            # 实际应用中可以使用更复杂的权限模型
-            return True  # 默认允许所有工具
+        self.user_permissions = list(user_permissions or [])
+        self.base_filter = filter_fn
+        # 权限掩码 -> 组合后的过滤函数（值对象，相同掩码命中同一个工具集缓存条目）
+        self._filters: Dict[int, Callable[[Any], bool]] = {}
+        self.permission_filter = PermissionFilter.for_permissions(self.user_permissions)
 
         super().__init__(
             skill_registry=skill_registry,
             verbose=verbose,
-            filter_fn=permission_filter
+            filter_fn=self._combined_filter(self.permission_filter),
+            **kwargs
         )
 
+    def _combined_filter(self, permission_filter: PermissionFilter) -> Callable[[Any], bool]:
+        combined = self._filters.get(permission_filter.mask)
+        if combined is None:
+            if self.base_filter is None:
+                combined = permission_filter
+            else:
+                combined = CombinedFilter(self.base_filter, permission_filter)
+            self._filters[permission_filter.mask] = combined
+        return combined
+
+    def _permission_filter(self, request: Union[ModelRequest, ToolCallRequest]) -> PermissionFilter:
+        """本次请求的用户权限（context 中的 user_permissions 优先）"""
+        runtime = getattr(request, "runtime", None)
+        permissions = context_permissions(getattr(runtime, "context", None))
+        if permissions is None:
+            return self.permission_filter
+        return PermissionFilter.for_permissions(permissions)
+
+    def _request_filter(self, request: Union[ModelRequest, ToolCallRequest]) -> Optional[Callable[[Any], bool]]:
+        permission_filter = self._permission_filter(request)
+        if permission_filter is self.permission_filter:
+            return self.filter_fn
+        return self._combined_filter(permission_filter)
+
+    def _check_permission(self, request: ToolCallRequest) -> Optional[ToolMessage]:
+        """被调用的 Loader 或工具属于未授权的 Skill 时返回权限错误消息"""
+        name = request.tool_call["name"]
+        snapshot = self.registry.snapshot()
+        owner = snapshot.loader_owner(name) or snapshot.tool_owner(name)
+        if owner is None:
+            return None
+
+        permission_filter = self._permission_filter(request)
+        missing = permission_filter.missing(snapshot.metadata[owner])
+        if not missing:
+            return None
+
+        error = SkillPermissionError(owner, ", ".join(missing))
+        self.metrics.permission_denials += 1
+        if self.verbose:
+            logger.info(f"[PermissionAwareSkillMiddleware] {error}")
+        return ToolMessage(
+            content=f"Error: {error}",
+            name=name,
+            tool_call_id=request.tool_call.get("id"),
+            status="error",
+        )
 
-class RateLimitedSkillMiddleware(SkillMiddleware):
-    """
-    带速率限制的 Skill 中间件
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Union[ToolMessage, Command]]
+    ) -> Union[ToolMessage, Command]:
+        denied = self._check_permission(request)
+        if denied is not None:
+            return denied
+        return super().wrap_tool_call(request, handler)
+
+    async def awrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[Union[ToolMessage, Command]]]
+    ) -> Union[ToolMessage, Command]:
+        denied = self._check_permission(request)
+        if denied is not None:
+            return denied
+        return await super().awrap_tool_call(request, handler)
 
-    示例：限制某些工具的调用频率
+
+class RateLimitMixin:
+    """
+    速率限制（与 SkillMiddleware 或其子类组合，写在基类之前）
+
+    按工具名称和 Skill 名称配置令牌桶限速（rate / burst）和并发上限（max_in_flight），
+    限制由同一个中间件实例的所有会话共享：
+    - 工具执行前先在相关的令牌桶预约令牌，再占用执行槽位；等待超过 timeout 时返回限速错误，不执行工具。
+      同步路径阻塞等待，异步路径使用 asyncio.sleep，不阻塞事件循环
+    - 限制只包住真正的工具执行：基类的权限检查等在此之前完成，被拒绝的调用不消耗令牌
+    - Loader 的 first action 经过同样的限制（见 core.loader_action.action_policy）
+    - 模型调用时隐藏需要等待超过 timeout 才能执行的工具，模型不会安排注定被拒绝的调用
     """
 
     def __init__(
         self,
-        skill_registry: SkillRegistry,
-        verbose: bool = False
+        *args: Any,
+        tool_limits: Optional[Dict[str, Any]] = None,
+        skill_limits: Optional[Dict[str, Any]] = None,
+        timeout: float = 30.0,
+        **kwargs: Any
     ):
-        super().__init__(skill_registry=skill_registry, verbose=verbose)
-        self.call_counts = {}  # 工具调用计数
+        """
+        Args:
+            *args: 传给基类的参数（skill_registry、verbose 等）
+            tool_limits: 工具名称 -> RateLimit 或 {"rate", "burst", "max_in_flight"}
+            skill_limits: Skill 名称 -> 限制（作用于该 Skill 全部工具的调用之和）
+            timeout: 单次调用最多等待的秒数（0 表示超出限制时立即拒绝）
+            **kwargs: 传给基类的其它参数（filter_fn、loader_mode、user_permissions 等）
+        """
+        super().__init__(*args, **kwargs)
+        self.tool_limiters: Dict[str, Limiter] = build_limiters(tool_limits)
+        self.skill_limiters: Dict[str, Limiter] = build_limiters(skill_limits)
+        self.timeout = timeout
+        self.call_counts: Dict[str, int] = {}  # 工具名称 -> 已执行的调用数
+        self._counts_lock = threading.Lock()
+
+    def _limiters_for(self, tool_name: str) -> List[Limiter]:
+        """调用该工具时需要满足的限制（工具自身在前，所属 Skill 在后）"""
+        limiters = []
+        tool_limiter = self.tool_limiters.get(tool_name)
+        if tool_limiter is not None:
+            limiters.append(tool_limiter)
+        if self.skill_limiters:
+            owner = self.registry.snapshot().tool_owner(tool_name)
+            skill_limiter = self.skill_limiters.get(owner) if owner else None
+            if skill_limiter is not None:
+                limiters.append(skill_limiter)
+        return limiters
+
+    def _get_filtered_tools(
+        self,
+        skills_loaded: List[str],
+        groups_loaded: Optional[List[str]] = None,
+        filter_fn: Optional[Callable[[Any], bool]] = None
+    ) -> List[BaseTool]:
+        tools = super()._get_filtered_tools(skills_loaded, groups_loaded, filter_fn)
+        if not self.tool_limiters and not self.skill_limiters:
+            return tools
+        available = [
+            t for t in tools
+            if not any(limiter.is_saturated(self.timeout) for limiter in self._limiters_for(t.name))
+        ]
+        if self.verbose and len(available) < len(tools):
+            hidden = sorted({t.name for t in tools} - {t.name for t in available})
+            logger.info(f"[{type(self).__name__}] Hiding rate-limited tools: {hidden}")
+        return available
+
+    def _reserve(self, limiters: List[Limiter]) -> Tuple[float, Optional[Limiter]]:
+        """
+        在所有相关令牌桶中预约令牌
 
-    def wrap_model_call(
+        Returns:
+            (需要等待的秒数, 超出限制的 Limiter)；任一令牌桶超出限制时归还已预约的令牌
+        """
+        reserved: List[Limiter] = []
+        wait = 0.0
+        for limiter in limiters:
+            if limiter.bucket is None:
+                continue
+            limiter_wait = limiter.bucket.reserve(self.timeout)
+            if limiter_wait is None:
+                for done in reserved:
+                    done.bucket.cancel()
+                return 0.0, limiter
+            reserved.append(limiter)
+            wait = max(wait, limiter_wait)
+        return wait, None
+
+    def _reject(self, request: ToolCallRequest, limiter: Limiter, reason: str) -> ToolMessage:
+        error = SkillRateLimitError(limiter.name, reason)
+        self.metrics.rate_limit_rejections += 1
+        if self.verbose:
+            logger.info(f"[{type(self).__name__}] {error}")
+        return ToolMessage(
+            content=f"Error: {error}. Try again later.",
+            name=request.tool_call["name"],
+            tool_call_id=request.tool_call.get("id"),
+            status="error",
+        )
+
+    def _count_call(self, tool_name: str, waited: bool) -> None:
+        with self._counts_lock:
+            self.call_counts[tool_name] = self.call_counts.get(tool_name, 0) + 1
+            if waited:
+                self.metrics.rate_limit_waits += 1
+
+    def _limited_call(
         self,
-        request: ModelRequest,
-        handler: Callable[[ModelRequest], ModelResponse]
-    ) -> ModelResponse:
-        # 可以在这里添加速率限制逻辑
-        # 例如：记录每个工具的调用次数，超过阈值则拒绝
-        return super().wrap_model_call(request, handler)
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Union[ToolMessage, Command]]
+    ) -> Union[ToolMessage, Command]:
+        """取得令牌和执行槽位后执行 handler（同时作为 Loader action 的包装函数）"""
+        limiters = self._limiters_for(request.tool_call["name"])
+        if not limiters:
+            with action_policy(self._limited_call):
+                return handler(request)
+
+        deadline = time.monotonic() + self.timeout
+        wait, rejected = self._reserve(limiters)
+        if rejected is not None:
+            return self._reject(request, rejected, f"more than {self.timeout}s until the next slot")
+        if wait:
+            time.sleep(wait)
+
+        acquired: List[Limiter] = []
+        waited = wait > 0
+        try:
+            for limiter in limiters:
+                if limiter.in_flight is None:
+                    continue
+                if not limiter.in_flight.try_acquire():
+                    waited = True
+                    if not limiter.in_flight.acquire(max(0.0, deadline - time.monotonic())):
+                        return self._reject(
+                            request, limiter, f"{limiter.in_flight.max_in_flight} calls already in flight"
+                        )
+                acquired.append(limiter)
+            self._count_call(request.tool_call["name"], waited)
+            with action_policy(self._limited_call):
+                return handler(request)
+        finally:
+            for limiter in acquired:
+                limiter.in_flight.release()
+
+    async def _alimited_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[Union[ToolMessage, Command]]]
+    ) -> Union[ToolMessage, Command]:
+        """异步版本 - 等待令牌和执行槽位时不阻塞事件循环"""
+        limiters = self._limiters_for(request.tool_call["name"])
+        if not limiters:
+            with action_policy(self._limited_call):
+                return await handler(request)
+
+        deadline = time.monotonic() + self.timeout
+        wait, rejected = self._reserve(limiters)
+        if rejected is not None:
+            return self._reject(request, rejected, f"more than {self.timeout}s until the next slot")
+        if wait:
+            await asyncio.sleep(wait)
+
+        acquired: List[Limiter] = []
+        waited = wait > 0
+        try:
+            for limiter in limiters:
+                if limiter.in_flight is None:
+                    continue
+                if not limiter.in_flight.try_acquire():
+                    waited = True
+                    if not await limiter.in_flight.aacquire(max(0.0, deadline - time.monotonic())):
+                        return self._reject(
+                            request, limiter, f"{limiter.in_flight.max_in_flight} calls already in flight"
+                        )
+                acquired.append(limiter)
+            self._count_call(request.tool_call["name"], waited)
+            with action_policy(self._limited_call):
+                return await handler(request)
+        finally:
+            for limiter in acquired:
+                limiter.in_flight.release()
+
+    def wrap_tool_call(
+        self,
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Union[ToolMessage, Command]]
+    ) -> Union[ToolMessage, Command]:
+        return super().wrap_tool_call(request, lambda req: self._limited_call(req, handler))
 
-    async def awrap_model_call(
+    async def awrap_tool_call(
         self,
-        request: ModelRequest,
-        handler: Callable[[ModelRequest], ModelResponse]
-    ) -> ModelResponse:
-        # 异步版本的速率限制
-        return await super().awrap_model_call(request, handler)
+        request: ToolCallRequest,
+        handler: Callable[[ToolCallRequest], Awaitable[Union[ToolMessage, Command]]]
+    ) -> Union[ToolMessage, Command]:
+        return await super().awrap_tool_call(request, lambda req: self._alimited_call(req, handler))
+
+
+class RateLimitedSkillMiddleware(RateLimitMixin, SkillMiddleware):
+    """
+    带速率限制的 Skill 中间件
+
+    RateLimitedSkillMiddleware(skill_registry, tool_limits=..., skill_limits=..., timeout=...)，
+    其余参数与 SkillMiddleware 相同；限速行为见 RateLimitMixin
+    """
+
+
+class RateLimitedPermissionAwareSkillMiddleware(RateLimitMixin, PermissionAwareSkillMiddleware):
+    """
+    同时带权限控制和速率限制的 Skill 中间件（create_skill_agent 配置了限速时使用）
+
+    先按请求权限检查，通过后才预约令牌和执行槽位
+    """
@@ -76,7 +76,7 @@ def create_skill_aware_tools(
     if skills_loaded is None:
         skills_loaded = []
 
-    return registry.get_tools_for_skills(skills_loaded)
+    return list(registry.get_tools_for_skills(skills_loaded))
 
 
 # 为了向后兼容，提供一个占位符类
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Skill Router Middleware - 在第一次模型调用前预先激活可能用到的 Skills
+
+对于单 Skill 任务，模型原本需要先花一整轮调用 skill_<name> Loader 才能使用真实工具。
+该中间件在 Agent 开始时用 SkillRouter 对用户消息打分，置信度足够时直接写入
+skills_loaded，并补上一对等价于 Loader 调用的 AIMessage / ToolMessage，
+模型在第一轮就能看到使用说明和真实工具。
+
+调用时在 context 中提供 user_permissions 时，只路由到这些权限允许的 Skill
+（与 PermissionAwareSkillMiddleware 按请求覆盖权限的方式一致）。
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from skill_system.core.meta_tools import LOAD_SKILL_TOOL_NAME
+from skill_system.core.metadata_table import CombinedFilter
+from skill_system.core.permissions import PermissionFilter, context_permissions
+from skill_system.core.registry import SkillRegistry
+from skill_system.core.router import SkillRouter
+
+logger = logging.getLogger(__name__)
+
+
+class SkillRouterMiddleware(AgentMiddleware):
+    """
+    轮前路由中间件
+
+    工作流程：
+    1. before_agent：读取最后一条用户消息
+    2. SkillRouter 打分，选出高于阈值且尚未加载的 Skill
+    3. 返回状态更新：skills_loaded + 合成的 Loader 调用和使用说明
+    4. 随后的 SkillMiddleware 按新的 skills_loaded 过滤工具
+    """
+
+    def __init__(
+        self,
+        skill_registry: SkillRegistry,
+        router: Optional[SkillRouter] = None,
+        verbose: bool = False,
+        loader_mode: str = "per_skill"
+    ):
+        """
+        Args:
+            skill_registry: Skill 注册中心
+            router: 路由器（默认使用 SkillRouter 默认参数）
+            verbose: 是否打印详细日志
+            loader_mode: 与 SkillMiddleware 一致；"meta" 时合成的是 load_skill 调用
+        """
+        super().__init__()
+        self.registry = skill_registry
+        self.router = router or SkillRouter(skill_registry)
+        self.verbose = verbose
+        self.loader_mode = loader_mode
+
+    @property
+    def metrics(self):
+        """路由统计（包括节省的 Loader 轮数）"""
+        return self.router.metrics
+
+    def _route(self, state: Any, runtime: Any = None) -> Optional[Dict[str, Any]]:
+        if isinstance(state, dict):
+            messages = state.get("messages", [])
+            skills_loaded = state.get("skills_loaded", []) or []
+        else:
+            messages = getattr(state, "messages", [])
+            skills_loaded = getattr(state, "skills_loaded", []) or []
+
+        if not messages or not isinstance(messages[-1], HumanMessage):
+            return None
+
+        content = messages[-1].content
+        if isinstance(content, str):
+            text = content
+        else:
+            text = " ".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        selected = self.router.route(text, exclude=skills_loaded)
+        filter_fn = self.router.filter_fn
+        permissions = context_permissions(getattr(runtime, "context", None))
+        if permissions is not None:
+            # 本次请求的权限：路由器索引只按创建时的过滤函数构建，这里再排除未授权的 Skill
+            permission_filter = PermissionFilter.for_permissions(permissions)
+            metadata = self.registry.snapshot().metadata
+            selected = [
+                name for name in selected
+                if name in metadata and permission_filter(metadata[name])
+            ]
+            filter_fn = permission_filter if filter_fn is None else CombinedFilter(filter_fn, permission_filter)
+        if not selected:
+            return None
+
+        # 连同依赖一起激活；已加载的依赖不再重复注入说明
+        selected = self.registry.get_dependency_closure(selected, filter_fn)
+
+        tool_calls = []
+        tool_messages: List[ToolMessage] = []
+        for name in selected:
+            if name in skills_loaded:
+                continue
+            skill = self.registry.get(name)
+            call_id = f"route_{uuid.uuid4().hex[:12]}"
+            if self.loader_mode == "meta":
+                loader_name, args = LOAD_SKILL_TOOL_NAME, {"name": name}
+            else:
+                loader_name, args = skill.get_loader_tool().name, {}
+            tool_calls.append({"name": loader_name, "args": args, "id": call_id})
+            tool_messages.append(ToolMessage(
+                content=skill.get_instructions(),
+                tool_call_id=call_id,
+                name=loader_name
+            ))
+
+        if self.verbose:
+            logger.info(f"[SkillRouterMiddleware] Pre-activated skills: {selected}")
+
+        return {
+            "messages": [AIMessage(content="", tool_calls=tool_calls), *tool_messages],
+            # 与 Loader 返回的更新一致，合并方式交给状态的 reducer 决定
+            "skills_loaded": selected,
+        }
+
+    def before_agent(self, state: Any, runtime: Any) -> Optional[Dict[str, Any]]:
+        return self._route(state, runtime)
+
+    async def abefore_agent(self, state: Any, runtime: Any) -> Optional[Dict[str, Any]]:
+        return self._route(state, runtime)
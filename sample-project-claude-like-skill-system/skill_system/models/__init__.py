@@ -4,8 +4,11 @@ Models Module - 自定义模型支持
 支持的模型:
 - DeepSeekReasonerChatModel: DeepSeek Reasoner 模型，支持 reasoning_content
 - 未来可以添加更多自定义模型
+
+BoundModelCache: 按工具集缓存 bind_tools() 的结果，自定义模型可以直接复用
 """
 
+from .bound_cache import BoundModelCache
 from .deepseek_reasoner import DeepSeekReasonerChatModel
 
-__all__ = ["DeepSeekReasonerChatModel"]
+__all__ = ["DeepSeekReasonerChatModel", "BoundModelCache"]
@@ -0,0 +1,95 @@
+"""
+Bound Model Cache - 按工具集缓存 bind_tools() 的结果
+
+create_agent 每次模型调用都会用 SkillMiddleware 给出的工具列表重新执行 bind_tools()：
+逐个工具生成 JSON schema，并构造一个新的模型实例。
+SkillMiddleware 给出的工具来自 Registry 的工具集缓存（同一组 Skill 得到同一批工具对象），
+因此可以用工具对象的身份作为指纹：工具集不变的轮次直接复用上次绑定的模型和序列化的工具定义。
+
+缓存条目持有工具对象的引用，指纹中的 id 在条目存活期间不会被复用；
+热重载替换工具后指纹随之变化，不会命中旧条目。
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Sequence, Tuple
+
+
+def tool_set_fingerprint(tools: Sequence[Any], kwargs: Dict[str, Any]) -> Tuple[Hashable, ...]:
+    """
+    工具集指纹：工具对象身份（字典形式的内置工具按内容）+ 绑定参数
+
+    工具顺序是指纹的一部分（顺序不同时发送给模型的工具定义也不同）
+    """
+    tool_keys = tuple(
+        json.dumps(t, sort_keys=True, default=str) if isinstance(t, dict) else id(t)
+        for t in tools
+    )
+    return tool_keys, json.dumps(kwargs, sort_keys=True, default=str)
+
+
+class BoundModelCache:
+    """
+    bind_tools() 结果的 LRU 缓存（线程安全）
+
+    Attributes:
+        max_size: 最多缓存的工具集数量
+        hits / misses: 命中和未命中次数
+    """
+
+    def __init__(self, max_size: int = 32):
+        """
+        Args:
+            max_size: 最多缓存的工具集数量（超出时淘汰最久未使用的条目）
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Tuple[Any, ...], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_bind(
+        self,
+        tools: Sequence[Any],
+        kwargs: Dict[str, Any],
+        bind: Callable[[], Any]
+    ) -> Any:
+        """
+        返回该工具集已绑定的模型，未命中时调用 bind() 构建并缓存
+
+        Args:
+            tools: 工具列表
+            kwargs: bind_tools 的其它参数（tool_choice 等）
+            bind: 实际执行绑定的函数
+        """
+        key = tool_set_fingerprint(tools, kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        bound = bind()
+        with self._lock:
+            self.misses += 1
+            # 持有工具引用，保证指纹中的 id 不被其它对象复用
+            self._entries[key] = (tuple(tools), bound)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return bound
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """命中、未命中次数和当前条目数"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
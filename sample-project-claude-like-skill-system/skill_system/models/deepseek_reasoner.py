@@ -21,8 +21,11 @@ from langchain_core.messages import (
 from langchain_core.outputs import ChatResult, ChatGeneration
 from langchain_core.callbacks import CallbackManagerForLLMRun
 from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from pydantic import Field
 
+from .bound_cache import BoundModelCache
+
 try:
     from openai import OpenAI
 except ImportError:
@@ -58,9 +61,14 @@ class DeepSeekReasonerChatModel(BaseChatModel):
     temperature: float = Field(default=0.7)
     timeout: float = Field(default=60.0)
     bound_tools: Optional[List[Dict]] = Field(default=None)
+    # bind_tools 的其它参数（tool_choice、parallel_tool_calls 等），随请求一起发送
+    bound_kwargs: Dict[str, Any] = Field(default_factory=dict)
+    bound_cache_size: int = Field(default=32)
 
     # OpenAI 客户端（不序列化）
     _client: Optional[Any] = None
+    # 工具集 -> 已绑定的模型实例（绑定后的实例共享同一个缓存和客户端）
+    _bound_cache: Optional[BoundModelCache] = None
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -84,6 +92,7 @@ class DeepSeekReasonerChatModel(BaseChatModel):
             base_url=self.base_url,
             timeout=self.timeout
         )
+        self._bound_cache = BoundModelCache(self.bound_cache_size)
 
     @property
     def _llm_type(self) -> str:
@@ -218,6 +227,7 @@ class DeepSeekReasonerChatModel(BaseChatModel):
         # 添加工具（如果有绑定）
         if self.bound_tools:
             request_params["tools"] = self.bound_tools
+            request_params.update(self.bound_kwargs)
 
         # 添加停止词
         if stop:
@@ -240,40 +250,39 @@ class DeepSeekReasonerChatModel(BaseChatModel):
     ) -> "DeepSeekReasonerChatModel":
         """
         绑定工具到模型
+
+        与 ChatOpenAI.bind_tools 一致，tool_choice、parallel_tool_calls 等参数随请求发送给 API
+        （tool_choice 转换为 OpenAI 格式："any" / True 表示 "required"，其它字符串表示工具名）。
+
+        SkillMiddleware 每轮都会触发一次绑定；工具集（工具对象和参数）与之前某一轮相同时
+        直接返回缓存的实例，不再生成 JSON schema 或创建新的 OpenAI 客户端
         """
-        # 转换 LangChain 工具为 OpenAI 格式
-        openai_tools = []
-        for tool in tools:
-            tool_def = {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                }
-            }
-
-            # 添加参数 schema
-            if hasattr(tool, 'args_schema') and tool.args_schema:
-                tool_def["function"]["parameters"] = tool.args_schema.model_json_schema()
-            else:
-                tool_def["function"]["parameters"] = {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
+        return self._bound_cache.get_or_bind(tools, kwargs, lambda: self._bind(tools, kwargs))
 
-            openai_tools.append(tool_def)
+    def _bind(self, tools: List[BaseTool], kwargs: Dict[str, Any]) -> "DeepSeekReasonerChatModel":
+        # 转换 LangChain 工具为 OpenAI 格式（使用 tool_call_schema，不含 runtime 等注入参数）
+        openai_tools = [convert_to_openai_tool(tool) for tool in tools]
 
-        # 创建新实例，绑定工具
-        return self.__class__(
-            api_key=self.api_key,
-            base_url=self.base_url,
-            model_name=self.model_name,
-            temperature=self.temperature,
-            timeout=self.timeout,
-            bound_tools=openai_tools,
-            **kwargs
-        )
+        request_kwargs = dict(kwargs)
+        tool_choice = request_kwargs.pop("tool_choice", None)
+        if tool_choice is not None:
+            request_kwargs["tool_choice"] = _convert_tool_choice(tool_choice)
+
+        # 复制实例并绑定工具：共享 OpenAI 客户端和绑定缓存，不重新执行 __init__
+        return self.model_copy(update={"bound_tools": openai_tools, "bound_kwargs": request_kwargs})
+
+    def get_bound_cache_stats(self) -> Dict[str, int]:
+        """返回绑定缓存的统计信息（命中、未命中、条目数）"""
+        return self._bound_cache.stats()
+
+
+def _convert_tool_choice(tool_choice: Any) -> Any:
+    """把 bind_tools 的 tool_choice 转换为 OpenAI API 的格式"""
+    if tool_choice is True or tool_choice == "any":
+        return "required"
+    if isinstance(tool_choice, str) and tool_choice not in ("auto", "none", "required"):
+        return {"type": "function", "function": {"name": tool_choice}}
+    return tool_choice
 
 
 # 方便导入
@@ -14,6 +14,7 @@ from langchain_core.messages import ToolMessage
 from langgraph.types import Command
 
 from skill_system.core.base_skill import BaseSkill, SkillMetadata
+from skill_system.core.result_cache import cacheable
 
 
 class DataAnalysisSkill(BaseSkill):
@@ -31,8 +32,8 @@ class DataAnalysisSkill(BaseSkill):
             author="MuyuCheney"
         )
 
-    def get_loader_tool(self) -> BaseTool:
-        """返回 Loader Tool"""
+    def build_loader_tool(self) -> BaseTool:
+        """构建 Loader Tool"""
         skill_instance = self
 
         @tool
@@ -59,8 +60,8 @@ class DataAnalysisSkill(BaseSkill):
 
         return skill_data_analysis
 
-    def get_tools(self) -> List[BaseTool]:
-        """返回实际工具"""
+    def build_tools(self) -> List[BaseTool]:
+        """构建实际工具"""
         return [
             self._create_calculate_statistics_tool(),
             self._create_generate_chart_tool(),
@@ -131,7 +132,7 @@ class DataAnalysisSkill(BaseSkill):
             except Exception as e:
                 return f"Error calculating statistics: {str(e)}"
 
-        return calculate_statistics
+        return cacheable(calculate_statistics)
 
     def _create_generate_chart_tool(self) -> BaseTool:
         """创建图表生成工具"""
@@ -256,7 +257,7 @@ Data Quality:
             except Exception as e:
                 return f"Error generating summary: {str(e)}"
 
-        return summarize_data
+        return cacheable(summarize_data)
 
     def _create_correlation_analysis_tool(self) -> BaseTool:
         """创建相关性分析工具"""
@@ -319,7 +320,7 @@ Interpretation:
             except Exception as e:
                 return f"Error analyzing correlation: {str(e)}"
 
-        return analyze_correlation
+        return cacheable(analyze_correlation)
 
 
 def create_skill(skill_dir: Path) -> BaseSkill:
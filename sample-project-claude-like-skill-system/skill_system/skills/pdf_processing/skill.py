@@ -14,6 +14,7 @@ from langchain_core.messages import ToolMessage
 from langgraph.types import Command
 
 from skill_system.core.base_skill import BaseSkill, SkillMetadata
+from skill_system.core.result_cache import cacheable
 
 
 class PDFProcessingSkill(BaseSkill):
@@ -31,8 +32,8 @@ class PDFProcessingSkill(BaseSkill):
             author="MuyuCheney"
         )
 
-    def get_loader_tool(self) -> BaseTool:
-        """返回 Loader Tool"""
+    def build_loader_tool(self) -> BaseTool:
+        """构建 Loader Tool"""
         skill_instance = self
 
         @tool
@@ -59,8 +60,8 @@ class PDFProcessingSkill(BaseSkill):
 
         return skill_pdf_processing
 
-    def get_tools(self) -> List[BaseTool]:
-        """返回实际工具"""
+    def build_tools(self) -> List[BaseTool]:
+        """构建实际工具"""
         return [
             self._create_pdf_to_csv_tool(),
             self._create_extract_text_tool(),
@@ -106,7 +107,7 @@ class PDFProcessingSkill(BaseSkill):
             except Exception as e:
                 return f"Error converting PDF to CSV: {str(e)}"
 
-        return pdf_to_csv
+        return cacheable(pdf_to_csv, file_args=["file_path"])
 
     def _create_extract_text_tool(self) -> BaseTool:
         """创建文本提取工具"""
@@ -145,7 +146,7 @@ class PDFProcessingSkill(BaseSkill):
             except Exception as e:
                 return f"Error extracting text from PDF: {str(e)}"
 
-        return extract_pdf_text
+        return cacheable(extract_pdf_text, file_args=["file_path"])
 
     def _create_parse_tables_tool(self) -> BaseTool:
         """创建表格解析工具"""
@@ -188,7 +189,7 @@ class PDFProcessingSkill(BaseSkill):
             except Exception as e:
                 return f"Error parsing tables: {str(e)}"
 
-        return parse_pdf_tables
+        return cacheable(parse_pdf_tables, file_args=["file_path"])
 
 
 def create_skill(skill_dir: Path) -> BaseSkill:
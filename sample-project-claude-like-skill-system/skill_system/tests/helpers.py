@@ -0,0 +1,237 @@
+"""
+测试共用的辅助函数和测试 Skill
+
+各测试模块只从这里导入共用代码，测试模块之间互不依赖
+"""
+
+import textwrap
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Optional, Union
+import sys
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.tools import BaseTool, tool
+from langgraph.prebuilt.tool_node import ToolCallRequest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry, SkillMetadata, BaseSkill
+
+SKILLS_DIR = Path(__file__).parent.parent / "skills"
+
+
+class FakeToolModel(GenericFakeChatModel):
+    """按顺序返回预设消息、忽略工具绑定的测试模型"""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_registry() -> SkillRegistry:
+    """加载仓库自带 Skills 的注册中心"""
+    registry = SkillRegistry()
+    registry.discover_and_load(SKILLS_DIR)
+    return registry
+
+
+def tool_request(
+    name: Union[str, BaseTool],
+    args: Optional[Dict[str, Any]] = None,
+    call_id: str = "call-1",
+    skills_loaded: Iterable[str] = (),
+    context: Optional[Dict[str, Any]] = None,
+) -> ToolCallRequest:
+    """
+    构造直接传给中间件 wrap_tool_call 的工具调用请求
+
+    Args:
+        name: 被调用的工具名；传入工具实例时同时作为 request.tool
+        args: 调用参数
+        call_id: tool_call_id
+        skills_loaded: 状态中已加载的 Skills
+        context: runtime.context（如 {"user_permissions": [...]}），None 时不带 runtime
+    """
+    tool = name if isinstance(name, BaseTool) else None
+    if tool is not None:
+        name = tool.name
+    return ToolCallRequest(
+        tool_call={"name": name, "args": args or {}, "id": call_id},
+        tool=tool,
+        state={"messages": [], "skills_loaded": list(skills_loaded)},
+        runtime=SimpleNamespace(context=context) if context is not None else None,
+    )
+
+
+def make_skill(name: str, visibility: str = "public", group=None, required_permissions=()) -> BaseSkill:
+    """创建一个带一个工具的测试 Skill"""
+
+    class _Skill(BaseSkill):
+        @property
+        def metadata(self):
+            return SkillMetadata(
+                name=name,
+                description=f"{name} skill",
+                visibility=visibility,
+                group=group,
+                required_permissions=list(required_permissions)
+            )
+
+        def get_tools(self):
+            @tool(f"{name}_action")
+            def action() -> str:
+                """Run action"""
+                return name
+
+            return [action]
+
+        def get_loader_tool(self):
+            @tool(f"skill_{name}")
+            def loader() -> str:
+                """Load skill"""
+                return "loaded"
+
+            return loader
+
+    return _Skill()
+
+
+class DependentSkill(BaseSkill):
+    """声明了依赖的测试 Skill"""
+
+    def __init__(self, name: str, dependencies=()):
+        super().__init__()
+        self.name = name
+        self.dependencies = list(dependencies)
+
+    @property
+    def metadata(self):
+        return SkillMetadata(
+            name=self.name,
+            description=f"{self.name} skill",
+            dependencies=self.dependencies
+        )
+
+    def get_instructions(self) -> str:
+        return f"{self.name} instructions"
+
+    def build_tools(self):
+        @tool(f"{self.name}_action")
+        def action() -> str:
+            """Run action"""
+            return self.name
+
+        return [action]
+
+    def build_loader_tool(self):
+        @tool(f"skill_{self.name}")
+        def loader() -> str:
+            """Load skill"""
+            return "loaded"
+
+        return loader
+
+
+# 写入 Skills 目录的 skill.py 模板（热重载等需要真实目录的测试）
+SKILL_TEMPLATE = textwrap.dedent('''
+    from langchain_core.tools import tool
+    from skill_system.core.base_skill import BaseSkill, SkillMetadata
+
+
+    class {cls}(BaseSkill):
+        @property
+        def metadata(self):
+            return SkillMetadata(name="{name}", description="{name} skill")
+
+        def build_tools(self):
+            @tool("{name}")
+            def run(text: str) -> str:
+                """Run {name}"""
+                return "{reply}: " + text
+
+            return [run]
+
+        def build_loader_tool(self):
+            @tool("skill_{name}")
+            def loader() -> str:
+                """Load {name}"""
+                return "loaded"
+
+            return loader
+
+
+    def create_skill(skill_dir):
+        return {cls}(skill_dir)
+''')
+
+
+def write_skill(skills_dir: Path, name: str, reply: str) -> Path:
+    """在 skills_dir 下写入一个名为 name 的 Skill 目录"""
+    skill_dir = skills_dir / name
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "skill.py").write_text(
+        SKILL_TEMPLATE.format(cls=name.title() + "Skill", name=name, reply=reply)
+    )
+    return skill_dir
+
+
+# 清单 / 发现 / 注册缓存测试使用的 echo Skill（导入时写入 imported 标记文件）
+ECHO_SKILL_PY = textwrap.dedent('''
+    from pathlib import Path
+    from langchain_core.tools import tool
+    from skill_system.core.base_skill import BaseSkill, SkillMetadata
+
+    # 导入时留下标记，用于验证延迟导入
+    (Path(__file__).parent / "imported").write_text("yes")
+
+
+    class EchoSkill(BaseSkill):
+        @property
+        def metadata(self):
+            return SkillMetadata(name="echo", description="Echo skill")
+
+        def build_tools(self):
+            @tool
+            def echo(text: str) -> str:
+                """Echo text back"""
+                return f"echo: {text}"
+
+            return [echo]
+
+        def build_loader_tool(self):
+            @tool
+            def skill_echo() -> str:
+                """Load echo"""
+                return "loaded"
+
+            return skill_echo
+
+
+    def create_skill(skill_dir):
+        return EchoSkill(skill_dir)
+''')
+
+ECHO_SKILL_YAML = textwrap.dedent('''
+    name: echo
+    description: Echo skill
+    tags: [text]
+    tools:
+      - name: echo
+        description: Echo text back
+        parameters:
+          type: object
+          properties:
+            text: {type: string}
+          required: [text]
+''')
+
+
+def write_echo_skill(root: Path, manifest: bool = True) -> Path:
+    """在 root 下写入 echo Skill 目录（manifest 为 True 时同时写入 skill.yaml）"""
+    skill_dir = root / "echo"
+    skill_dir.mkdir()
+    (skill_dir / "skill.py").write_text(ECHO_SKILL_PY)
+    if manifest:
+        (skill_dir / "skill.yaml").write_text(ECHO_SKILL_YAML)
+    return skill_dir
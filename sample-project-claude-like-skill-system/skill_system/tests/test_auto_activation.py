@@ -0,0 +1,92 @@
+"""
+工具名称反向索引与自动激活测试
+"""
+
+from pathlib import Path
+import sys
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.types import Command
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.middleware import SkillMiddleware
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR, make_registry, tool_request
+
+
+def call_tool(middleware, tool_name, skills_loaded=(), content="result", status="success"):
+    return middleware.wrap_tool_call(
+        tool_request(tool_name, skills_loaded=skills_loaded),
+        lambda req: ToolMessage(content=content, tool_call_id="call-1", status=status)
+    )
+
+
+class TestToolOwnerIndex:
+    """测试工具名称 -> Skill 反向索引"""
+
+    def test_lookup(self):
+        registry = make_registry()
+
+        assert registry.get_skill_for_tool("pdf_to_csv") == "pdf_processing"
+        assert registry.get_skill_for_tool("calculate_statistics") == "data_analysis"
+        # Loader 不属于索引
+        assert registry.get_skill_for_tool("skill_pdf_processing") is None
+        assert registry.get_skill_for_tool("missing") is None
+
+
+class TestAutoActivation:
+    """测试直接调用未加载 Skill 的工具时自动激活"""
+
+    def test_direct_call_activates_skill(self):
+        middleware = SkillMiddleware(make_registry())
+
+        result = call_tool(middleware, "pdf_to_csv")
+
+        assert isinstance(result, Command)
+        assert result.update["skills_loaded"] == ["pdf_processing"]
+        content = result.update["messages"][0].content
+        assert content.startswith("result\n\n[Skill 'pdf_processing' was activated")
+        assert middleware.metrics.loader_turns_saved == 1
+
+    def test_failed_call_does_not_activate(self):
+        middleware = SkillMiddleware(make_registry())
+
+        for result in (
+            call_tool(middleware, "pdf_to_csv", content="Error: file not found"),
+            call_tool(middleware, "pdf_to_csv", content="boom", status="error"),
+        ):
+            assert isinstance(result, ToolMessage)
+            assert "was activated" not in result.content
+        assert middleware.metrics.auto_activations == 0
+
+    def test_loaded_filtered_or_disabled_untouched(self):
+        registry = make_registry()
+
+        assert isinstance(call_tool(SkillMiddleware(registry), "pdf_to_csv", ["pdf_processing"]), ToolMessage)
+        no_pdf = SkillMiddleware(registry, filter_fn=lambda meta: meta.name != "pdf_processing")
+        assert isinstance(call_tool(no_pdf, "pdf_to_csv"), ToolMessage)
+        assert isinstance(call_tool(SkillMiddleware(registry, auto_activate=False), "pdf_to_csv"), ToolMessage)
+
+        registry.set_enabled("pdf_processing", False)
+        assert isinstance(call_tool(SkillMiddleware(registry), "pdf_to_csv"), ToolMessage)
+
+    def test_agent_skips_loader_turn(self):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{
+                "name": "calculate_statistics",
+                "args": {"data": [1, 2, 3], "metrics": "mean"},
+                "id": "call-1",
+            }]),
+            AIMessage(content="done"),
+        ]))
+        agent = create_skill_agent(model=model, config=SkillSystemConfig(skills_dir=SKILLS_DIR))
+
+        result = agent.invoke({
+            "messages": [{"role": "user", "content": "calculate the mean of 1, 2, 3"}]
+        })
+
+        assert result["skills_loaded"] == ["data_analysis"]
+        assert "mean: 2.0000" in result["messages"][2].content
+        assert agent.skill_middleware.metrics.auto_activations == 1
@@ -0,0 +1,102 @@
+"""
+按工具集缓存 bind_tools() 结果的测试
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.models.bound_cache import BoundModelCache
+from skill_system.tests.helpers import make_registry
+
+
+class TestBoundModelCache:
+    """测试指纹和 LRU 淘汰"""
+
+    def test_same_tool_objects_hit(self):
+        registry = make_registry()
+        cache = BoundModelCache()
+        tools = registry.get_tools_for_skills(["pdf_processing"])
+        calls = []
+
+        def bind():
+            calls.append(1)
+            return object()
+
+        first = cache.get_or_bind(list(tools), {"tool_choice": None}, bind)
+        # Registry 工具集缓存返回相同的工具对象，再次绑定直接命中
+        again = registry.get_tools_for_skills(["pdf_processing"])
+        assert cache.get_or_bind(list(again), {"tool_choice": None}, bind) is first
+        assert len(calls) == 1
+
+        # 参数或工具集不同则重新绑定
+        cache.get_or_bind(list(tools), {"tool_choice": "any"}, bind)
+        cache.get_or_bind(list(registry.get_tools_for_skills([])), {"tool_choice": None}, bind)
+        assert cache.stats() == {"hits": 1, "misses": 3, "size": 3}
+
+    def test_lru_eviction(self):
+        tools = make_registry().get_all_tools()
+        cache = BoundModelCache(max_size=2)
+
+        a = cache.get_or_bind(tools[:1], {}, object)
+        cache.get_or_bind(tools[:2], {}, object)
+        assert cache.get_or_bind(tools[:1], {}, object) is a
+        cache.get_or_bind(tools[:3], {}, object)
+
+        # tools[:2] 最久未使用，被淘汰
+        assert len(cache) == 2
+        assert cache.get_or_bind(tools[:1], {}, object) is a
+        misses = cache.misses
+        cache.get_or_bind(tools[:2], {}, object)
+        assert cache.misses == misses + 1
+
+
+class TestDeepSeekBinding:
+    """测试 DeepSeekReasonerChatModel 复用已绑定的实例"""
+
+    def test_bind_tools_reuses_instance(self):
+        pytest.importorskip("openai")
+        from skill_system.models import DeepSeekReasonerChatModel
+
+        model = DeepSeekReasonerChatModel(api_key="test-key")
+        tools = list(make_registry().get_tools_for_skills(["data_analysis"]))
+
+        bound = model.bind_tools(tools, tool_choice=None)
+        assert model.bind_tools(list(tools), tool_choice=None) is bound
+        assert bound._client is model._client
+        assert model.get_bound_cache_stats()["hits"] == 1
+
+        definitions = {t["function"]["name"]: t["function"] for t in bound.bound_tools}
+        # Loader 的 runtime 是注入参数，不出现在发送给模型的 schema 中
+        assert set(definitions["skill_data_analysis"]["parameters"]["properties"]) == {"action", "action_args"}
+        assert "data" in definitions["calculate_statistics"]["parameters"]["properties"]
+
+    def test_bind_kwargs_reach_request(self):
+        pytest.importorskip("openai")
+        from skill_system.models import DeepSeekReasonerChatModel
+
+        model = DeepSeekReasonerChatModel(api_key="test-key")
+        tools = list(make_registry().get_tools_for_skills(["data_analysis"]))
+        requests = []
+
+        class Sent(Exception):
+            pass
+
+        def create(**params):
+            requests.append(params)
+            raise Sent()
+
+        bound = model.bind_tools(tools, tool_choice="calculate_statistics", parallel_tool_calls=False)
+        assert model.bind_tools(tools, tool_choice="any") is not bound
+        bound._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        with pytest.raises(Sent):
+            bound.invoke("hi")
+
+        assert requests[0]["tool_choice"] == {"type": "function", "function": {"name": "calculate_statistics"}}
+        assert requests[0]["parallel_tool_calls"] is False
+        assert model.bind_tools(tools, tool_choice="any").bound_kwargs == {"tool_choice": "required"}
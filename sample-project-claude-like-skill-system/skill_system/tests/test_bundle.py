@@ -0,0 +1,98 @@
+"""
+预编译 Skill 归档测试
+"""
+
+from pathlib import Path
+import json
+import sys
+import zipfile
+
+import pytest
+from langchain_core.messages import AIMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.core import ManifestSkill, SkillBundle, SkillLoadError, SkillRegistry, build_bundle
+from skill_system.core.bundle import BUNDLE_INDEX_NAME
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "skills.zip"
+    assert build_bundle(SKILLS_DIR, path) == ["data_analysis", "pdf_processing"]
+    return path
+
+
+class TestSkillBundle:
+    """测试打包和从归档加载"""
+
+    def test_bundle_is_reproducible(self, bundle, tmp_path):
+        build_bundle(SKILLS_DIR, tmp_path / "again.zip")
+        assert (tmp_path / "again.zip").read_bytes() == bundle.read_bytes()
+
+    def test_lazy_load(self, bundle):
+        registry = SkillRegistry()
+        result = registry.discover(bundle)
+
+        assert result.loaded == ["data_analysis", "pdf_processing"]
+        skill = registry.get("data_analysis")
+        assert isinstance(skill, ManifestSkill) and not skill.is_resolved
+        assert skill.get_instructions() == (SKILLS_DIR / "data_analysis" / "instructions.md").read_text(encoding="utf-8")
+
+        # 代理工具在第一次执行时通过 zipimport 导入模块
+        tool = [t for t in skill.get_tools() if t.name == "calculate_statistics"][0]
+        assert "mean: 2.0000" in tool.invoke({"data": [1, 2, 3], "metrics": "mean"})
+        assert skill.is_resolved
+        assert skill.resolve().get_instructions() == skill.get_instructions()
+
+    def test_eager_load(self, bundle):
+        registry = SkillRegistry()
+        registry.discover(bundle, use_manifest=False)
+
+        skill = registry.get("pdf_processing")
+        assert type(skill).__name__ == "PDFProcessingSkill"
+        assert skill.get_instructions().startswith("# PDF Processing Skill")
+
+    def test_invalid_bundle(self, tmp_path):
+        path = tmp_path / "broken.zip"
+        path.write_bytes(b"not a zip")
+
+        with pytest.raises(SkillLoadError):
+            SkillRegistry().discover(path)
+
+    def test_bytecode_version_mismatch(self, bundle, tmp_path):
+        # 换成其它解释器版本的 magic number 重新写入 bundle.json
+        with zipfile.ZipFile(bundle) as source:
+            index = json.loads(source.read(BUNDLE_INDEX_NAME))
+            files = {info.filename: source.read(info) for info in source.infolist()}
+        index["magic"] = "00000d0a"
+        files[BUNDLE_INDEX_NAME] = json.dumps(index).encode("utf-8")
+        path = tmp_path / "other_python.zip"
+        with zipfile.ZipFile(path, "w") as target:
+            for name, data in files.items():
+                target.writestr(name, data)
+
+        with pytest.raises(SkillLoadError, match="different Python bytecode version"):
+            SkillBundle(path)
+
+    def test_agent_from_bundle(self, bundle):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{
+                "name": "skill_data_analysis",
+                "args": {"action": "calculate_statistics", "action_args": {"data": [2, 4], "metrics": "mean"}},
+                "id": "call-1",
+            }]),
+            AIMessage(content="done"),
+        ]))
+        config = SkillSystemConfig(skills_dir=bundle, hot_reload=True)
+        agent = create_skill_agent(model=model, config=config)
+
+        result = agent.invoke({"messages": [{"role": "user", "content": "mean of 2 and 4"}]})
+
+        assert result["skills_loaded"] == ["data_analysis"]
+        assert "mean: 3.0000" in result["messages"][2].content
+        # 归档是只读的，不启动热重载
+        assert agent.watcher is None
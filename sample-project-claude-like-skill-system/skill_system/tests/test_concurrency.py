@@ -0,0 +1,165 @@
+"""
+同一轮中多个工具调用并发执行测试
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.core import BaseSkill, SkillMetadata
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR
+
+CALLS = 4
+# 等待其它调用的上限（秒）：调用串行执行时在此之后失败，而不是死锁
+TIMEOUT = 5.0
+
+
+class OverlapProbe:
+    """
+    记录同时执行的工具调用数
+
+    require_overlap 为 True 时，每个调用都要等到 CALLS 个调用同时在执行才返回；
+    调用被串行执行时等待超时，工具报错，测试失败
+    """
+
+    def __init__(self, require_overlap: bool):
+        self.require_overlap = require_overlap
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._barrier = threading.Barrier(CALLS, timeout=TIMEOUT)
+        self._arrived = 0
+        self._all_arrived = asyncio.Event()
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.current -= 1
+
+    def run(self, i: int) -> None:
+        self._enter()
+        try:
+            if self.require_overlap:
+                self._barrier.wait()
+            else:
+                time.sleep(0.01)
+            if i == 0:
+                # 第一个调用最后完成，结果仍应排在最前
+                time.sleep(0.05)
+        finally:
+            self._exit()
+
+    async def arun(self, i: int) -> None:
+        self._enter()
+        try:
+            if self.require_overlap:
+                with self._lock:
+                    self._arrived += 1
+                    if self._arrived == CALLS:
+                        self._all_arrived.set()
+                await asyncio.wait_for(self._all_arrived.wait(), TIMEOUT)
+            else:
+                await asyncio.sleep(0.01)
+            if i == 0:
+                await asyncio.sleep(0.05)
+        finally:
+            self._exit()
+
+
+class ProbeSkill(BaseSkill):
+    """通过 OverlapProbe 执行的测试 Skill（同步和异步工具各一个）"""
+
+    def __init__(self, probe: OverlapProbe):
+        super().__init__()
+        self.probe = probe
+
+    @property
+    def metadata(self):
+        return SkillMetadata(name="probe", description="Probe tools")
+
+    def get_instructions(self) -> str:
+        return "probe instructions"
+
+    def build_tools(self):
+        probe = self.probe
+
+        @tool
+        def nap(i: int) -> str:
+            """Run the probe, then echo i"""
+            probe.run(i)
+            return f"nap {i}"
+
+        @tool
+        async def anap(i: int) -> str:
+            """Run the probe asynchronously, then echo i"""
+            await probe.arun(i)
+            return f"anap {i}"
+
+        return [nap, anap]
+
+    def build_loader_tool(self):
+        @tool
+        def skill_probe() -> str:
+            """Load probe tools."""
+            return "probe instructions"
+
+        return skill_probe
+
+
+def run(tool_name, probe, tool_concurrency=None, use_async=False):
+    turns = [
+        AIMessage(content="", tool_calls=[
+            {"name": tool_name, "args": {"i": i}, "id": f"call-{i}"} for i in range(CALLS)
+        ]),
+        AIMessage(content="done"),
+    ]
+    config = SkillSystemConfig(skills_dir=SKILLS_DIR, tool_concurrency=tool_concurrency)
+    agent = create_skill_agent(model=FakeToolModel(messages=iter(turns)), config=config)
+    agent.add_skill(ProbeSkill(probe))
+    input_data = {"messages": [{"role": "user", "content": "nap"}], "skills_loaded": ["probe"]}
+
+    if use_async:
+        result = asyncio.run(agent.ainvoke(input_data))
+    else:
+        result = agent.invoke(input_data)
+    return [m.content for m in result["messages"][2:2 + CALLS]]
+
+
+class TestConcurrentToolCalls:
+    """测试同一轮的调用同时执行，结果保持调用顺序"""
+
+    @pytest.mark.parametrize("tool_name,use_async", [("nap", False), ("anap", True), ("nap", True)])
+    def test_calls_run_concurrently(self, tool_name, use_async):
+        probe = OverlapProbe(require_overlap=True)
+
+        outputs = run(tool_name, probe, use_async=use_async)
+
+        assert outputs == [f"{tool_name} {i}" for i in range(CALLS)]
+        assert probe.peak == CALLS
+
+    @pytest.mark.parametrize("tool_name,use_async", [("nap", False), ("anap", True)])
+    def test_concurrency_limit(self, tool_name, use_async):
+        probe = OverlapProbe(require_overlap=False)
+
+        outputs = run(tool_name, probe, tool_concurrency=1, use_async=use_async)
+
+        assert outputs == [f"{tool_name} {i}" for i in range(CALLS)]
+        assert probe.peak == 1
+
+    def test_invalid_setting(self):
+        with pytest.raises(ValueError):
+            SkillSystemConfig(tool_concurrency=0)
@@ -0,0 +1,103 @@
+"""
+Skill 依赖图与联动激活测试
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry, SkillDependencyError
+from skill_system.middleware import SkillMiddleware
+from skill_system.tests.helpers import DependentSkill
+
+
+@pytest.fixture
+def registry():
+    registry = SkillRegistry()
+    registry.register(DependentSkill("pdf", ["pdfplumber"]))
+    registry.register(DependentSkill("charts", ["pandas"]))
+    registry.register(DependentSkill("report", ["pdf", "charts", "numpy"]))
+    return registry
+
+
+class TestDependencyGraph:
+    """测试依赖图、闭包和循环检测"""
+
+    def test_graph_ignores_libraries(self, registry):
+        graph = registry.snapshot().dependency_graph()
+
+        assert graph["report"] == ("pdf", "charts")
+        assert graph["pdf"] == ()
+
+    def test_closure_lists_dependencies_first(self, registry):
+        assert registry.get_dependency_closure(["report"]) == ["pdf", "charts", "report"]
+        assert registry.get_dependency_closure(["pdf"]) == ["pdf"]
+
+    def test_closure_skips_disabled_and_filtered(self, registry):
+        registry.set_enabled("charts", False)
+        assert registry.get_dependency_closure(["report"]) == ["pdf", "report"]
+
+        no_pdf = lambda meta: meta.name != "pdf"
+        assert registry.get_dependency_closure(["report"], no_pdf) == ["report"]
+
+    def test_cycle_is_rejected(self, registry):
+        with pytest.raises(SkillDependencyError) as exc_info:
+            registry.register(DependentSkill("pdf", ["report"]))
+
+        assert exc_info.value.cycle == ["pdf", "report", "pdf"]
+        # 注册失败时 Registry 保持不变
+        assert registry.get_metadata("pdf").dependencies == ("pdfplumber",)
+
+    def test_self_dependency_is_rejected(self, registry):
+        with pytest.raises(SkillDependencyError):
+            registry.register(DependentSkill("loop", ["loop"]))
+
+
+class TestCoActivation:
+    """测试 Loader 调用一次激活整个依赖闭包"""
+
+    def _load(self, middleware, skill_name, state=None):
+        request = ToolCallRequest(
+            tool_call={"name": f"skill_{skill_name}", "args": {}, "id": "call_1"},
+            tool=None,
+            state=state or {"messages": [], "skills_loaded": []},
+            runtime=None,
+        )
+        command = Command(update={
+            "messages": [ToolMessage(content=f"{skill_name} instructions", tool_call_id="call_1")],
+            "skills_loaded": [skill_name],
+        })
+        return middleware.wrap_tool_call(request, lambda req: command)
+
+    def test_loader_command_activates_closure(self, registry):
+        result = self._load(SkillMiddleware(registry), "report")
+
+        assert result.update["skills_loaded"] == ["pdf", "charts", "report"]
+        content = result.update["messages"][0].content
+        assert content == "report instructions\n\npdf instructions\n\ncharts instructions"
+
+    def test_loaded_dependencies_not_repeated(self, registry):
+        state = {"messages": [], "skills_loaded": ["pdf"]}
+        result = self._load(SkillMiddleware(registry), "report", state)
+
+        assert result.update["skills_loaded"] == ["pdf", "charts", "report"]
+        assert "pdf instructions" not in result.update["messages"][0].content
+
+    def test_skill_without_dependencies_untouched(self, registry):
+        middleware = SkillMiddleware(registry)
+        request = ToolCallRequest(
+            tool_call={"name": "skill_pdf", "args": {}, "id": "call_1"},
+            tool=None,
+            state={},
+            runtime=None,
+        )
+        command = Command(update={"messages": [], "skills_loaded": ["pdf"]})
+
+        assert middleware.wrap_tool_call(request, lambda req: command) is command
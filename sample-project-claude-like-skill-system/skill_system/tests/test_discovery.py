@@ -0,0 +1,51 @@
+"""
+并行发现与结构化加载报告测试
+"""
+
+from pathlib import Path
+import sys
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry
+from skill_system.tests.helpers import ECHO_SKILL_PY
+
+
+class TestParallelDiscovery:
+    """测试并行发现和结构化结果"""
+
+    def _make_skills(self, root: Path, count: int) -> None:
+        for i in range(count):
+            skill_dir = root / f"skill_{i:02d}"
+            skill_dir.mkdir()
+            (skill_dir / "skill.py").write_text(
+                ECHO_SKILL_PY.replace('name="echo"', f'name="echo_{i:02d}"')
+                        .replace("def echo(", f"def echo_{i:02d}(")
+                        .replace("[echo]", f"[echo_{i:02d}]")
+            )
+
+    def test_parallel_registration_order_is_deterministic(self, tmp_path):
+        self._make_skills(tmp_path, 6)
+
+        serial = SkillRegistry()
+        serial.discover(tmp_path, max_workers=1)
+        parallel = SkillRegistry()
+        result = parallel.discover(tmp_path, max_workers=4)
+
+        assert parallel.list_skills() == serial.list_skills()
+        assert result.loaded == [f"echo_{i:02d}" for i in range(6)]
+        assert all(r.load_time >= 0 for r in result.reports)
+
+    def test_failures_are_reported(self, tmp_path):
+        self._make_skills(tmp_path, 2)
+        broken = tmp_path / "broken"
+        broken.mkdir()
+        (broken / "skill.py").write_text("raise RuntimeError('boom')\n")
+
+        result = SkillRegistry().discover(tmp_path, max_workers=2)
+
+        assert len(result.loaded) == 2
+        assert [r.path.name for r in result.failed] == ["broken"]
+        assert "boom" in result.failed[0].error
+        assert result.to_dict()["reports"][0]["path"].endswith("broken")
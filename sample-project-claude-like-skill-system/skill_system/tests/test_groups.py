@@ -0,0 +1,95 @@
+"""
+Skill 分组（两级渐进加载）测试
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.core import SkillRegistry
+from skill_system.middleware import SkillMiddleware
+from skill_system.tests.helpers import FakeToolModel, make_skill
+from skill_system.utils import generate_system_prompt
+
+
+@pytest.fixture
+def registry():
+    registry = SkillRegistry()
+    registry.register(make_skill("pdf", group="Documents"))
+    registry.register(make_skill("word", group="Documents"))
+    registry.register(make_skill("stats", group="data"))
+    registry.register(make_skill("secret", visibility="internal", group="ops"))
+    registry.register(make_skill("chat"))
+    return registry
+
+
+def names(tools):
+    return [t.name for t in tools]
+
+
+class TestSkillGroups:
+    """测试分组 Loader 和分组模式下的工具可见性"""
+
+    def test_list_groups_respects_filter(self, registry):
+        assert registry.list_groups() == ["Documents", "data", "ops"]
+        assert registry.list_groups(VisibilityFilter(frozenset(["public"]))) == ["Documents", "data"]
+
+    def test_closed_groups_hide_member_loaders(self, registry):
+        tools = registry.get_tools_for_skills([], groups_loaded=[])
+
+        assert names(tools) == ["group_documents", "group_data", "group_ops", "skill_chat"]
+
+    def test_opened_group_reveals_member_loaders(self, registry):
+        tools = registry.get_tools_for_skills(["stats"], groups_loaded=["Documents"])
+
+        assert names(tools) == [
+            "group_documents", "group_data", "group_ops",
+            "skill_pdf", "skill_word", "skill_chat", "stats_action",
+        ]
+        # 不传 groups_loaded 时保持原来的平铺行为
+        assert "group_data" not in names(registry.get_tools_for_skills([]))
+
+    def test_group_loader_opens_group(self, registry):
+        loader = registry.get_group_loader_tools()[0]
+
+        command = loader.func(SimpleNamespace(tool_call_id="call-1"))
+        assert command.update["groups_loaded"] == ["Documents"]
+        message = command.update["messages"][0]
+        assert "- skill_pdf: pdf skill" in message.content
+        assert message.tool_call_id == "call-1"
+
+    def test_middleware_reads_groups_from_state(self, registry):
+        middleware = SkillMiddleware(registry, group_loaders=True)
+
+        closed = names(middleware._get_filtered_tools([], []))
+        opened = names(middleware._get_filtered_tools([], ["data"]))
+        assert "skill_stats" not in closed
+        assert "skill_stats" in opened
+
+    def test_prompt_lists_groups(self):
+        prompt = generate_system_prompt(["chat"], available_groups=["Documents"])
+
+        assert "- skill_chat:" in prompt
+        assert "- group_documents: Open the Documents skill group" in prompt
+
+    def test_agent_opens_group_then_loads_skill(self, registry):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{"name": "group_data", "args": {}, "id": "call-1"}]),
+            AIMessage(content="", tool_calls=[{"name": "skill_stats", "args": {}, "id": "call-2"}]),
+            AIMessage(content="done"),
+        ]))
+        config = SkillSystemConfig(group_loaders=True)
+        agent = create_skill_agent(model=model, config=config, registry=registry)
+
+        result = agent.invoke({"messages": [{"role": "user", "content": "hi"}]})
+
+        assert result["groups_loaded"] == ["data"]
+        assert "- skill_stats: stats skill" in result["messages"][2].content
@@ -0,0 +1,212 @@
+"""
+Skills 目录热重载测试
+"""
+
+import textwrap
+import time
+from pathlib import Path
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain.agents.middleware import ModelRequest
+from langgraph.prebuilt.tool_node import ToolCallRequest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.core import SkillRegistry, SkillWatcher
+from skill_system.middleware import SkillMiddleware
+from skill_system.tests.helpers import FakeToolModel, write_skill
+
+
+def run_tool(registry: SkillRegistry, name: str, text: str = "hi") -> str:
+    return registry.get(name).get_tools()[0].invoke({"text": text})
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    write_skill(tmp_path, "echo", "v1")
+    write_skill(tmp_path, "shout", "loud")
+    return tmp_path
+
+
+@pytest.fixture
+def registry(skills_dir):
+    registry = SkillRegistry()
+    registry.discover_and_load(skills_dir)
+    return registry
+
+
+class TestSkillWatcher:
+    """测试目录变化检测与原子替换"""
+
+    def test_no_changes(self, registry, skills_dir):
+        watcher = SkillWatcher(registry, skills_dir)
+        assert watcher.check() == []
+
+    def test_reloads_only_changed_skill(self, registry, skills_dir):
+        watcher = SkillWatcher(registry, skills_dir)
+        untouched = registry.get("shout")
+        version = registry.version
+
+        write_skill(skills_dir, "echo", "version two")
+        events = watcher.check()
+
+        assert [(e.action, e.skill_name) for e in events] == [("reloaded", "echo")]
+        assert run_tool(registry, "echo") == "version two: hi"
+        assert registry.get("shout") is untouched
+        assert registry.version == version + 1
+        assert watcher.check() == []
+
+    def test_failed_reload_keeps_old_skill(self, registry, skills_dir):
+        watcher = SkillWatcher(registry, skills_dir)
+        old = registry.get("echo")
+
+        (skills_dir / "echo" / "skill.py").write_text("def create_skill(:\n")
+        events = watcher.check()
+
+        assert events[0].action == "failed"
+        assert events[0].skill_name == "echo"
+        assert registry.get("echo") is old
+        assert run_tool(registry, "echo") == "v1: hi"
+
+        # 修复后再次变化即可恢复
+        write_skill(skills_dir, "echo", "fixed again")
+        assert watcher.check()[0].action == "reloaded"
+        assert run_tool(registry, "echo") == "fixed again: hi"
+
+    def test_added_and_removed(self, registry, skills_dir):
+        watcher = SkillWatcher(registry, skills_dir)
+
+        write_skill(skills_dir, "whisper", "quiet")
+        (skills_dir / "shout" / "skill.py").unlink()
+        events = watcher.check()
+
+        assert sorted((e.action, e.skill_name) for e in events) == [
+            ("added", "whisper"),
+            ("removed", "shout"),
+        ]
+        assert "shout" not in registry
+        assert run_tool(registry, "whisper") == "quiet: hi"
+
+    def test_manifest_reload_validates_module(self, registry, skills_dir):
+        watcher = SkillWatcher(registry, skills_dir)
+
+        # 清单声明了模块中不存在的工具：替换前就应发现并保留旧 Skill
+        (skills_dir / "echo" / "skill.yaml").write_text(textwrap.dedent('''
+            name: echo
+            description: echo skill
+            tools:
+              - name: missing_tool
+        '''))
+        events = watcher.check()
+
+        assert events[0].action == "failed"
+        assert "missing_tool" in events[0].error
+        assert run_tool(registry, "echo") == "v1: hi"
+
+    def test_background_polling(self, registry, skills_dir):
+        watcher = registry.watch(skills_dir, interval=0.05, backend="poll")
+        try:
+            write_skill(skills_dir, "echo", "from the thread")
+            deadline = time.time() + 5
+            while time.time() < deadline and run_tool(registry, "echo") != "from the thread: hi":
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert run_tool(registry, "echo") == "from the thread: hi"
+        assert not watcher.running
+
+
+class TestAgentHotReload:
+    """测试热重载的变化同步到 Agent 的 ToolNode"""
+
+    def _agent(self, skills_dir, messages):
+        config = SkillSystemConfig(skills_dir=skills_dir, hot_reload=True, hot_reload_interval=0.05)
+        return create_skill_agent(model=FakeToolModel(messages=iter(messages)), config=config)
+
+    def _wait_for(self, agent, condition):
+        deadline = time.time() + 5
+        while time.time() < deadline and not condition():
+            time.sleep(0.05)
+        # 在检查锁上同步：正在进行的检查（包括 on_change 回调）完成后才返回
+        agent.watcher.check()
+
+    def test_added_skill_is_executable(self, skills_dir):
+        agent = self._agent(skills_dir, [
+            AIMessage(content="", tool_calls=[{"name": "skill_whisper", "args": {}, "id": "call-1"}]),
+            AIMessage(content="", tool_calls=[{"name": "whisper", "args": {"text": "hi"}, "id": "call-2"}]),
+            AIMessage(content="done"),
+        ])
+        try:
+            write_skill(skills_dir, "whisper", "psst")
+            self._wait_for(agent, lambda: "whisper" in agent.list_skills())
+
+            result = agent.invoke({"messages": [{"role": "user", "content": "whisper hi"}]})
+        finally:
+            agent.stop_watching()
+
+        assert result["messages"][2].content == "loaded"
+        assert result["messages"][4].content.startswith("psst: hi")
+        assert result["messages"][-1].content == "done"
+
+    def test_removed_skill_leaves_tool_node(self, skills_dir):
+        agent = self._agent(skills_dir, [])
+        tool_node = agent._tool_node()
+        try:
+            assert "shout" in tool_node.tools_by_name
+            for path in (skills_dir / "shout").iterdir():
+                path.unlink()
+            (skills_dir / "shout").rmdir()
+            self._wait_for(agent, lambda: "shout" not in agent.list_skills())
+        finally:
+            agent.stop_watching()
+
+        assert "shout" not in tool_node.tools_by_name
+        assert "skill_shout" not in tool_node.tools_by_name
+        assert "echo" in tool_node.tools_by_name
+
+
+class TestInFlightPinning:
+    """测试进行中的调用继续使用旧工具对象"""
+
+    def _model_turn(self, middleware, call_id):
+        request = ModelRequest(
+            model=FakeToolModel(messages=iter([])),
+            messages=[HumanMessage(content="hi")],
+            state={"messages": [], "skills_loaded": ["echo"]},
+        )
+        response = AIMessage(
+            content="",
+            tool_calls=[{"name": "echo", "args": {"text": "hi"}, "id": call_id}]
+        )
+        middleware.wrap_model_call(request, lambda req: response)
+
+    def _execute(self, middleware, call_id, registered_tool):
+        request = ToolCallRequest(
+            tool_call={"name": "echo", "args": {"text": "hi"}, "id": call_id},
+            tool=registered_tool,
+            state={},
+            runtime=None,
+        )
+        return middleware.wrap_tool_call(
+            request, lambda req: req.tool.invoke(req.tool_call["args"])
+        )
+
+    def test_in_flight_call_uses_old_tool(self, registry, skills_dir):
+        middleware = SkillMiddleware(registry)
+        watcher = SkillWatcher(registry, skills_dir)
+        # ToolNode 创建时注册的工具
+        registered_tool = registry.get("echo").get_tools()[0]
+
+        self._model_turn(middleware, "call_1")
+
+        write_skill(skills_dir, "echo", "new code")
+        watcher.check()
+
+        assert self._execute(middleware, "call_1", registered_tool) == "v1: hi"
+        # 新的调用（未固定）使用 Registry 中的新版本
+        assert self._execute(middleware, "call_2", registered_tool) == "new code: hi"
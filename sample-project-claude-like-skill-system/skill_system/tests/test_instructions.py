@@ -0,0 +1,94 @@
+"""
+使用说明缓存与 token 估算测试
+"""
+
+from pathlib import Path
+import sys
+
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry, SkillWatcher
+from skill_system.middleware import SkillMiddleware
+from skill_system.tests.helpers import make_registry, write_skill
+from skill_system.utils import estimate_tokens
+
+
+def make_skill_dir(tmp_path, text="Use echo carefully."):
+    skill_dir = write_skill(tmp_path, "echo", "v1")
+    (skill_dir / "instructions.md").write_text(text, encoding="utf-8")
+    return skill_dir
+
+
+class TestInstructionsCache:
+    """测试使用说明只读取一次"""
+
+    def test_read_once_until_invalidated(self, tmp_path):
+        skill_dir = make_skill_dir(tmp_path)
+        registry = SkillRegistry()
+        registry.discover_and_load(tmp_path)
+        skill = registry.get("echo")
+
+        assert skill.get_instructions() == "Use echo carefully."
+        (skill_dir / "instructions.md").write_text("Changed.", encoding="utf-8")
+        assert skill.get_instructions() == "Use echo carefully."
+
+        skill.invalidate_instructions()
+        assert skill.get_instructions() == "Changed."
+
+    def test_watcher_replaces_on_change(self, tmp_path):
+        skill_dir = make_skill_dir(tmp_path)
+        registry = SkillRegistry()
+        registry.discover_and_load(tmp_path)
+        watcher = SkillWatcher(registry, tmp_path)
+        registry.get("echo").get_instructions()
+
+        (skill_dir / "instructions.md").write_text("A much longer set of instructions.", encoding="utf-8")
+        events = watcher.check()
+
+        assert [e.action for e in events] == ["reloaded"]
+        assert registry.get("echo").get_instructions() == "A much longer set of instructions."
+
+    def test_token_estimates(self, tmp_path):
+        make_skill_dir(tmp_path)
+        registry = SkillRegistry()
+        registry.discover_and_load(tmp_path)
+
+        tokens = registry.get_instruction_tokens("echo")
+        assert tokens == estimate_tokens("Use echo carefully.")
+        assert registry.get_instruction_token_report() == {"echo": tokens}
+
+        registry.set_enabled("echo", False)
+        assert registry.get_instruction_token_report() == {}
+
+
+class TestActivationCost:
+    """测试中间件统计每次激活的说明 token 数"""
+
+    def test_metrics_count_new_activations(self):
+        registry = make_registry()
+        middleware = SkillMiddleware(registry)
+        expected = registry.get_instruction_tokens("pdf_processing")
+
+        def load(skills_loaded):
+            request = ToolCallRequest(
+                tool_call={"name": "skill_pdf_processing", "args": {}, "id": "call-1"},
+                tool=None,
+                state={"messages": [], "skills_loaded": skills_loaded},
+                runtime=None,
+            )
+            command = Command(update={
+                "messages": [ToolMessage(content="instructions", tool_call_id="call-1")],
+                "skills_loaded": ["pdf_processing"],
+            })
+            return middleware.wrap_tool_call(request, lambda req: command)
+
+        load([])
+        assert middleware.metrics.instruction_tokens == expected > 0
+        # 已加载的 Skill 不重复计入
+        load(["pdf_processing"])
+        assert middleware.metrics.instruction_tokens == expected
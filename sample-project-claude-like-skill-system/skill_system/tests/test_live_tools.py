@@ -0,0 +1,134 @@
+"""
+运行时增删 Skill（不重建 Agent）测试
+"""
+
+from pathlib import Path
+import sys
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import ToolNode
+from langgraph.types import Command
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import agent_factory, create_skill_agent, SkillSystemConfig
+from skill_system.core import BaseSkill, SkillMetadata
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR
+
+
+class WeatherSkill(BaseSkill):
+    """Loader 需要注入 runtime 的测试 Skill"""
+
+    @property
+    def metadata(self):
+        return SkillMetadata(name="weather", description="Weather forecasts")
+
+    def get_instructions(self) -> str:
+        return "weather instructions"
+
+    def build_tools(self):
+        @tool
+        def forecast(city: str) -> str:
+            """Get the forecast for a city"""
+            return f"sunny in {city}"
+
+        return [forecast]
+
+    def build_loader_tool(self):
+        @tool
+        def skill_weather(runtime) -> Command:
+            """Load weather capabilities."""
+            return Command(update={
+                "messages": [ToolMessage(content="weather instructions", tool_call_id=runtime.tool_call_id)],
+                "skills_loaded": ["weather"],
+            })
+
+        return skill_weather
+
+
+def run(messages, setup):
+    model = FakeToolModel(messages=iter(messages))
+    agent = create_skill_agent(model=model, config=SkillSystemConfig(skills_dir=SKILLS_DIR))
+    setup(agent)
+    return agent, agent.invoke({"messages": [{"role": "user", "content": "weather in Paris?"}]})
+
+
+def weather_turns():
+    return [
+        AIMessage(content="", tool_calls=[{"name": "skill_weather", "args": {}, "id": "call-1"}]),
+        AIMessage(content="", tool_calls=[{"name": "forecast", "args": {"city": "Paris"}, "id": "call-2"}]),
+        AIMessage(content="done"),
+    ]
+
+
+class TestLiveToolUniverse:
+    """测试 SkillAgent.add_skill / remove_skill / set_skill_enabled"""
+
+    def test_added_skill_is_executable(self):
+        agent, result = run(weather_turns(), lambda agent: agent.add_skill(WeatherSkill()))
+
+        assert result["skills_loaded"] == ["weather"]
+        assert result["messages"][2].content == "weather instructions"
+        assert result["messages"][4].content == "sunny in Paris"
+        assert "skill_weather" in [t.name for t in agent.skill_middleware._get_filtered_tools([])]
+
+    def test_removed_skill_is_not_executable(self):
+        def setup(agent):
+            agent.add_skill(WeatherSkill())
+            agent.remove_skill("weather")
+
+        agent, result = run(weather_turns(), setup)
+
+        assert "weather" not in agent.list_skills()
+        assert result["skills_loaded"] == []
+        assert "not a valid tool" in result["messages"][2].content
+
+    def test_disable_and_enable(self):
+        call = [
+            AIMessage(content="", tool_calls=[{
+                "name": "calculate_statistics",
+                "args": {"data": [1, 2, 3], "metrics": "mean"},
+                "id": "call-1",
+            }]),
+            AIMessage(content="done"),
+        ]
+
+        _, disabled = run(list(call), lambda agent: agent.set_skill_enabled("data_analysis", False))
+        assert "not a valid tool" in disabled["messages"][2].content
+
+        def toggle(agent):
+            agent.set_skill_enabled("data_analysis", False)
+            agent.set_skill_enabled("data_analysis", True)
+
+        _, enabled = run(list(call), toggle)
+        assert "mean: 2.0000" in enabled["messages"][2].content
+
+
+class TestToolNodeInternals:
+    """运行时增删依赖 LangGraph ToolNode 的内部结构；升级 LangGraph 后这里应最先失败"""
+
+    def make_agent(self):
+        model = FakeToolModel(messages=iter([AIMessage(content="done")]))
+        return create_skill_agent(model=model, config=SkillSystemConfig(skills_dir=SKILLS_DIR))
+
+    def test_installed_langgraph_supports_mutation(self):
+        tool_node = self.make_agent().agent.nodes["tools"].bound
+
+        assert isinstance(tool_node, ToolNode)
+        assert agent_factory.supports_tool_mutation(tool_node), (
+            "LangGraph ToolNode no longer exposes tools_by_name / _injected_args / "
+            "_get_all_injected_args; update SkillAgent._register_tools"
+        )
+        assert set(tool_node._injected_args) == set(tool_node.tools_by_name)
+
+    def test_falls_back_when_unsupported(self, monkeypatch, caplog):
+        agent = self.make_agent()
+        monkeypatch.setattr(agent_factory, "_get_all_injected_args", None)
+
+        agent.add_skill(WeatherSkill())
+
+        assert "weather" in agent.list_skills()
+        assert "forecast" not in agent.agent.nodes["tools"].bound.tools_by_name
+        assert "does not support adding or removing tools" in caplog.text
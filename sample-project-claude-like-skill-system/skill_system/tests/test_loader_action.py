@@ -0,0 +1,89 @@
+"""
+Loader 第一个动作（加载并执行工具）测试
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+from langchain_core.messages import AIMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.tests.helpers import DependentSkill, FakeToolModel, SKILLS_DIR, make_registry
+
+
+def load(registry, skill_name, **args):
+    loader = registry.snapshot().get(skill_name).get_loader_tool()
+    return loader.func(runtime=SimpleNamespace(tool_call_id="call-1"), **args)
+
+
+class TestLoaderAction:
+    """测试 Loader 的 action / action_args 参数"""
+
+    def test_schema_exposes_optional_action(self):
+        loader = make_registry().snapshot().get("pdf_processing").get_loader_tool()
+
+        schema = loader.tool_call_schema
+        assert set(schema["properties"]) == {"action", "action_args"}
+        assert not schema.get("required")
+        assert "pdf_to_csv" in schema["properties"]["action"]["description"]
+
+    def test_without_action_unchanged(self):
+        command = load(make_registry(), "data_analysis")
+
+        assert command.update["skills_loaded"] == ["data_analysis"]
+        assert "Result of" not in command.update["messages"][0].content
+
+    def test_action_result_appended(self):
+        command = load(
+            make_registry(), "data_analysis",
+            action="calculate_statistics", action_args={"data": [1, 2, 3], "metrics": "mean"}
+        )
+
+        assert command.update["skills_loaded"] == ["data_analysis"]
+        content = command.update["messages"][0].content
+        assert "\n\nResult of calculate_statistics:\n" in content
+        assert "mean: 2.0000" in content
+
+    def test_bad_action_reported(self):
+        registry = make_registry()
+
+        unknown = load(registry, "data_analysis", action="pdf_to_csv")
+        assert "'pdf_to_csv' is not a tool of this skill" in unknown.update["messages"][0].content
+        assert unknown.update["skills_loaded"] == ["data_analysis"]
+
+        invalid = load(registry, "data_analysis", action="calculate_statistics", action_args={})
+        assert "Result of calculate_statistics:\nError: ValidationError" in invalid.update["messages"][0].content
+
+    def test_string_loader(self):
+        loader = DependentSkill("pdf").get_loader_tool()
+
+        assert loader.func(runtime=SimpleNamespace(tool_call_id="call-1")) == "loaded"
+        result = loader.func(runtime=SimpleNamespace(tool_call_id="call-1"), action="pdf_action")
+        assert result == "loaded\n\nResult of pdf_action:\npdf"
+
+    def test_agent_loads_and_runs_in_one_turn(self):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{
+                "name": "skill_data_analysis",
+                "args": {
+                    "action": "calculate_statistics",
+                    "action_args": {"data": [1, 2, 3], "metrics": "mean"},
+                },
+                "id": "call-1",
+            }]),
+            AIMessage(content="done"),
+        ]))
+        agent = create_skill_agent(model=model, config=SkillSystemConfig(skills_dir=SKILLS_DIR))
+
+        result = agent.invoke({
+            "messages": [{"role": "user", "content": "calculate the mean of 1, 2, 3"}]
+        })
+
+        assert result["skills_loaded"] == ["data_analysis"]
+        assert "mean: 2.0000" in result["messages"][2].content
+        assert agent.skill_middleware.metrics.loader_actions == 1
+        assert agent.skill_middleware.metrics.loader_turns_saved == 1
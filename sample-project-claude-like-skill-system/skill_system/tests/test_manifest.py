@@ -0,0 +1,127 @@
+"""
+清单延迟加载测试
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry, ManifestSkill, build_manifest, load_manifest
+from skill_system.core.exceptions import SkillLoadError
+from skill_system.tests.helpers import ECHO_SKILL_PY, ECHO_SKILL_YAML, SKILLS_DIR, write_echo_skill
+
+
+@pytest.fixture
+def echo_dir(tmp_path):
+    write_echo_skill(tmp_path)
+    return tmp_path
+
+
+class TestManifestDiscovery:
+    """测试基于清单的延迟发现"""
+
+    def test_manifest_does_not_import_module(self, echo_dir):
+        registry = SkillRegistry()
+
+        assert registry.discover_and_load(echo_dir) == 1
+
+        skill = registry.get("echo")
+        assert isinstance(skill, ManifestSkill)
+        assert not skill.is_resolved
+        assert registry.get_metadata("echo").tags == ("text",)
+        assert [t.name for t in registry.get_all_tools()] == ["skill_echo", "echo"]
+        assert not (echo_dir / "echo" / "imported").exists()
+
+    def test_loader_resolves_module(self, echo_dir):
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir)
+        skill = registry.get("echo")
+
+        result = skill.get_loader_tool().func(runtime=SimpleNamespace(tool_call_id="call-1"))
+
+        assert skill.is_resolved
+        assert (echo_dir / "echo" / "imported").exists()
+        # 返回真实 Skill 的 Loader 的结果，而不是代理自己拼出的说明
+        assert result == "loaded"
+
+    def test_loader_delegates_to_real_loader(self):
+        registry = SkillRegistry()
+        registry.discover_and_load(SKILLS_DIR)
+        real = SkillRegistry()
+        real.discover_and_load(SKILLS_DIR, use_manifest=False)
+        runtime = SimpleNamespace(tool_call_id="call-1")
+
+        for name in registry.list_skills():
+            proxied = registry.get(name).get_loader_tool().func(runtime=runtime)
+            expected = real.get(name).get_loader_tool().func(runtime=runtime)
+            assert proxied.update == expected.update
+
+    def test_proxy_tool_forwards_to_real_tool(self, echo_dir):
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir)
+
+        echo = registry.get("echo").get_tools()[0]
+
+        assert echo.invoke({"text": "hi"}) == "echo: hi"
+
+    def test_manifest_tool_missing_in_module(self, echo_dir):
+        manifest = echo_dir / "echo" / "skill.yaml"
+        manifest.write_text(ECHO_SKILL_YAML.replace("name: echo\n    description: Echo text", "name: shout\n    description: Echo text"))
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir)
+
+        with pytest.raises(SkillLoadError):
+            registry.get("echo").resolve()
+
+    def test_module_tool_missing_in_manifest(self, echo_dir):
+        (echo_dir / "echo" / "skill.py").write_text(ECHO_SKILL_PY.replace(
+            "return [echo]",
+            "@tool\n        def shout(text: str) -> str:\n"
+            "            \"\"\"Shout text\"\"\"\n"
+            "            return text.upper()\n\n"
+            "        return [echo, shout]"
+        ))
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir)
+
+        with pytest.raises(SkillLoadError, match="missing from manifest"):
+            registry.get("echo").resolve()
+
+    def test_manifest_schema_out_of_date(self, echo_dir):
+        (echo_dir / "echo" / "skill.py").write_text(
+            ECHO_SKILL_PY.replace("def echo(text: str)", "def echo(text: str, times: int)")
+        )
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir)
+
+        with pytest.raises(SkillLoadError, match="out of date"):
+            registry.get("echo").resolve()
+
+    def test_manifest_disabled(self, echo_dir):
+        registry = SkillRegistry()
+        registry.discover_and_load(echo_dir, use_manifest=False)
+
+        assert not isinstance(registry.get("echo"), ManifestSkill)
+        assert (echo_dir / "echo" / "imported").exists()
+
+    def test_invalid_manifest(self, echo_dir):
+        manifest = echo_dir / "echo" / "skill.yaml"
+        manifest.write_text("name: echo\n")
+
+        with pytest.raises(SkillLoadError):
+            load_manifest(manifest)
+
+    def test_bundled_manifests_match_modules(self):
+        registry = SkillRegistry()
+        registry.discover_and_load(SKILLS_DIR, use_manifest=False)
+
+        assert registry.list_skills()
+        for name in registry.list_skills():
+            skill = registry.get(name)
+            # 修改 skill.py 后需要用 write_manifest() 重新生成 skill.yaml
+            assert load_manifest(skill.skill_dir / "skill.yaml") == build_manifest(skill)
@@ -0,0 +1,126 @@
+"""
+meta 模式（find_skills / load_skill）测试
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.benchmarks.prompt_tokens import bench_size
+from skill_system.core import SkillRouter, create_meta_tools
+from skill_system.middleware import SkillMiddleware, SkillRouterMiddleware
+from skill_system.tests.helpers import DependentSkill, FakeToolModel, SKILLS_DIR, make_registry
+
+
+# 直接调用 Meta Tool 函数时使用的 runtime（不带 context）
+RUNTIME = SimpleNamespace(tool_call_id="call-1", context=None)
+
+
+def names(tools):
+    return [t.name for t in tools]
+
+
+class TestMetaTools:
+    """测试 find_skills / load_skill"""
+
+    def test_find_skills_lists_matches(self):
+        find_skills, _ = create_meta_tools(make_registry())
+
+        result = find_skills.func("pdf", RUNTIME)
+        assert "- pdf_processing:" in result
+        assert "data_analysis" not in result
+
+        # 子串检索不到时用 BM25 按描述补足
+        assert "data_analysis" in find_skills.func("chart statistics", RUNTIME)
+        assert "No skills match" in find_skills.func("zzz", RUNTIME)
+
+    def test_find_skills_respects_filter_and_enabled(self):
+        registry = make_registry()
+        registry.set_enabled("pdf_processing", False)
+        find_skills, _ = create_meta_tools(registry, filter_fn=lambda m: m.name != "data_analysis")
+
+        assert "No skills match" in find_skills.func("pdf chart", RUNTIME)
+
+    def test_load_skill_returns_loader_update(self):
+        _, load_skill = create_meta_tools(make_registry())
+
+        command = load_skill.func("pdf_processing", RUNTIME)
+        assert command.update["skills_loaded"] == ["pdf_processing"]
+        assert command.update["messages"][0].tool_call_id == "call-1"
+
+        unknown = load_skill.func("missing", RUNTIME)
+        assert "skills_loaded" not in unknown.update
+        assert "Unknown skill" in unknown.update["messages"][0].content
+
+    def test_load_skill_runs_skill_loader(self):
+        registry = make_registry()
+        registry.register(DependentSkill("custom"))
+        _, load_skill = create_meta_tools(registry)
+
+        # DependentSkill 的 Loader 返回 "loaded" 而不是使用说明
+        command = load_skill.func("custom", RUNTIME)
+        assert command.update["messages"][0].content == "loaded"
+        assert command.update["messages"][0].tool_call_id == "call-1"
+        assert command.update["skills_loaded"] == ["custom"]
+
+
+class TestMetaMode:
+    """测试 meta 模式下的中间件和 Agent"""
+
+    def test_middleware_hides_loaders(self):
+        middleware = SkillMiddleware(make_registry(), loader_mode="meta")
+
+        assert names(middleware._get_filtered_tools([])) == ["find_skills", "load_skill"]
+        loaded = names(middleware._get_filtered_tools(["pdf_processing"]))
+        assert loaded[:2] == ["find_skills", "load_skill"]
+        assert "pdf_to_csv" in loaded
+        assert not any(name.startswith("skill_") for name in loaded)
+
+    def test_router_emits_load_skill_calls(self):
+        registry = make_registry()
+        middleware = SkillRouterMiddleware(
+            registry, SkillRouter(registry, threshold=2.0), loader_mode="meta"
+        )
+
+        update = middleware.before_agent(
+            {"messages": [HumanMessage("calculate the mean and std")], "skills_loaded": []},
+            None
+        )
+
+        call = update["messages"][0].tool_calls[0]
+        assert call["name"] == "load_skill"
+        assert call["args"] == {"name": "data_analysis"}
+
+    def test_prompt_size_constant(self):
+        small, large = bench_size(10, tool_count=1), bench_size(200, tool_count=1)
+
+        assert small["meta"]["total_tokens"] == large["meta"]["total_tokens"]
+        assert large["per_skill"]["total_tokens"] > 10 * large["meta"]["total_tokens"]
+
+    def test_agent_finds_and_loads_skill(self):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{
+                "name": "load_skill", "args": {"name": "data_analysis"}, "id": "call-1",
+            }]),
+            AIMessage(content="", tool_calls=[{
+                "name": "calculate_statistics",
+                "args": {"data": [1, 2, 3], "metrics": "mean"},
+                "id": "call-2",
+            }]),
+            AIMessage(content="done"),
+        ]))
+        config = SkillSystemConfig(skills_dir=SKILLS_DIR, loader_mode="meta")
+        agent = create_skill_agent(model=model, config=config)
+
+        result = agent.invoke({
+            "messages": [{"role": "user", "content": "calculate the mean of 1, 2, 3"}]
+        })
+
+        assert result["skills_loaded"] == ["data_analysis"]
+        assert "mean: 2.0000" in result["messages"][-2].content
@@ -0,0 +1,101 @@
+"""
+紧凑元数据与列式元数据表测试
+"""
+
+from dataclasses import FrozenInstanceError, replace
+from pathlib import Path
+import sys
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.benchmarks.synthetic import make_skills
+from skill_system.core import CombinedFilter, MetadataTable, RegistrySnapshot, SkillMetadata, SkillRegistry, TagFilter
+
+
+@pytest.fixture(scope="module")
+def metadata():
+    return {skill.name: skill.metadata for skill in make_skills(300, tool_count=0)}
+
+
+FILTERS = [
+    VisibilityFilter(frozenset(["public"])),
+    VisibilityFilter(frozenset(["internal", "unknown"])),
+    VisibilityFilter(None),
+    TagFilter(frozenset(["missing"])),
+    CombinedFilter(VisibilityFilter(frozenset(["public"])), TagFilter(frozenset(["missing"]))),
+]
+
+
+class TestSkillMetadata:
+    """测试 slots + 冻结的 SkillMetadata"""
+
+    def test_frozen_and_slotted(self):
+        meta = SkillMetadata(name="a", description="A")
+
+        with pytest.raises(FrozenInstanceError):
+            meta.enabled = False
+        assert not hasattr(meta, "__dict__")
+        assert replace(meta, enabled=False).enabled is False
+
+    def test_sequences_are_tuples(self):
+        meta = SkillMetadata(name="a", description="A", tags=["x"], dependencies=["b"],
+                             required_permissions=["p:read"])
+
+        assert (meta.tags, meta.dependencies, meta.required_permissions) == (("x",), ("b",), ("p:read",))
+        assert hash(meta) == hash(SkillMetadata(name="a", description="A", tags=("x",),
+                                                dependencies=("b",), required_permissions=("p:read",)))
+        assert meta.to_dict()["tags"] == ["x"]
+
+    def test_strings_interned(self):
+        first = SkillMetadata(name="a", description="A", tags=["".join(["p", "df"])],
+                              visibility="".join(["pub", "lic"]))
+        second = SkillMetadata(name="b", description="B", tags=["pdf"], visibility="public")
+
+        assert first.tags[0] is second.tags[0]
+        assert first.visibility is second.visibility
+
+    def test_null_visibility(self):
+        assert SkillMetadata(name="a", description="A", visibility=None).visibility == "public"
+        with pytest.raises(ValueError, match="Skill 'a' has invalid visibility"):
+            SkillMetadata(name="a", description="A", visibility=1)
+
+
+class TestMetadataTable:
+    """测试列式扫描与逐个调用过滤函数的结果一致"""
+
+    @pytest.mark.parametrize("filter_fn", FILTERS)
+    def test_mask_matches_per_row(self, metadata, filter_fn):
+        table = MetadataTable(metadata)
+
+        expected = [name for name, meta in metadata.items() if filter_fn(meta)]
+        assert table.select(filter_fn.table_mask(table)) == expected
+
+    @pytest.mark.parametrize("match_all", [False, True])
+    def test_tag_mask_with_and_without_bitsets(self, metadata, match_all, monkeypatch):
+        tags = list(next(iter(metadata.values())).tags[:2])
+        filter_fn = TagFilter(frozenset(tags), match_all=match_all)
+        expected = [name for name, meta in metadata.items() if filter_fn(meta)]
+        assert expected
+
+        assert MetadataTable(metadata).select(filter_fn.table_mask(MetadataTable(metadata))) == expected
+        monkeypatch.setattr(MetadataTable, "MAX_TAG_BITS", 0)
+        table = MetadataTable(metadata)
+        assert table.select(filter_fn.table_mask(table)) == expected
+
+    def test_snapshot_uses_table_for_large_registries(self, monkeypatch):
+        monkeypatch.setattr(RegistrySnapshot, "COLUMNAR_MIN_SKILLS", 0)
+        registry = SkillRegistry()
+        for skill in make_skills(50, tool_count=1):
+            registry.register(skill)
+
+        public = VisibilityFilter(frozenset(["public"]))
+        expected = [n for n in registry.list_skills() if registry.get_metadata(n).visibility == "public"]
+        assert registry.list_skills(public) == expected
+        assert registry.snapshot()._metadata_table is not None
+        # 不支持 table_mask 的组合过滤函数回退为逐个调用
+        mixed = CombinedFilter(public, lambda meta: meta.enabled)
+        assert registry.list_skills(mixed) == expected
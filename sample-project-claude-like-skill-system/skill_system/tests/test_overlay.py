@@ -0,0 +1,124 @@
+"""
+多租户叠加层测试
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.core import SkillRegistry, SkillRegistryOverlay
+from skill_system.core.exceptions import SkillNotFoundError
+from skill_system.tests.helpers import make_skill
+
+
+@pytest.fixture
+def base():
+    registry = SkillRegistry()
+    for name in ["alpha", "beta", "gamma"]:
+        registry.register(make_skill(name))
+    registry.register(make_skill("ops", visibility="internal"))
+    return registry
+
+
+def names(tools):
+    return [t.name for t in tools]
+
+
+class TestSkillRegistryOverlay:
+    """测试叠加层的添加、隐藏和启停"""
+
+    def test_untouched_overlay_shares_base_snapshot(self, base):
+        tenant = base.overlay()
+
+        assert isinstance(tenant, SkillRegistryOverlay)
+        assert tenant.snapshot() is base.snapshot()
+        assert tenant.get_tools_for_skills(["alpha"]) is base.get_tools_for_skills(["alpha"])
+
+    def test_private_skill_visible_only_to_tenant(self, base):
+        tenant = base.overlay()
+        other = base.overlay()
+        tenant.register(make_skill("acme_crm"))
+
+        assert tenant.list_skills() == ["alpha", "beta", "gamma", "ops", "acme_crm"]
+        assert "acme_crm" not in other
+        assert "acme_crm" not in base
+        # 基础 Skill 实例与基础层共享，不复制
+        assert tenant.get("alpha") is base.get("alpha")
+
+    def test_hide_and_unregister_do_not_touch_base(self, base):
+        tenant = base.overlay()
+        tenant.hide("beta")
+        tenant.unregister("gamma")
+
+        assert tenant.list_skills() == ["alpha", "ops"]
+        assert base.list_skills() == ["alpha", "beta", "gamma", "ops"]
+        assert "skill_beta" not in names(tenant.get_tools_for_skills([]))
+
+        tenant.unhide("beta")
+        assert "beta" in tenant
+
+    def test_set_enabled_is_per_tenant(self, base):
+        tenant = base.overlay()
+        tenant.set_enabled("alpha", False)
+
+        assert not tenant.get_metadata("alpha").enabled
+        assert base.get_metadata("alpha").enabled
+        assert "skill_alpha" not in names(tenant.get_all_loader_tools())
+        assert "skill_alpha" in names(base.get_all_loader_tools())
+
+        with pytest.raises(SkillNotFoundError):
+            tenant.set_enabled("missing", False)
+
+    def test_equivalent_tenants_share_derived_snapshot(self, base):
+        first, second = base.overlay(), base.overlay()
+        first.hide("gamma")
+        second.hide("gamma")
+
+        assert first.snapshot() is second.snapshot()
+
+        allowed = VisibilityFilter(frozenset(["public"]))
+        tools = first.get_tools_for_skills(["alpha"], allowed)
+        assert second.get_tools_for_skills(["alpha"], VisibilityFilter(frozenset(["public"]))) is tools
+        assert names(tools) == ["skill_alpha", "skill_beta", "alpha_action"]
+
+    def test_cache_stats_are_per_tenant(self, base):
+        first, second = base.overlay(), base.overlay()
+        first.hide("gamma")
+        second.hide("gamma")
+
+        first.get_tools_for_skills(["alpha"])
+        second.get_tools_for_skills(["alpha"])
+        second.get_tools_for_skills(["alpha"])
+        # 未修改的叠加层使用基础层快照，命中不记到基础层
+        untouched = base.overlay()
+        untouched.get_tools_for_skills(["beta"])
+
+        assert first.snapshot() is second.snapshot()
+        assert (first.get_cache_stats()["hits"], first.get_cache_stats()["misses"]) == (0, 1)
+        assert (second.get_cache_stats()["hits"], second.get_cache_stats()["misses"]) == (2, 0)
+        assert untouched.get_cache_stats()["misses"] == 1
+        assert base.get_cache_stats()["misses"] == 0
+
+    def test_follows_base_changes(self, base):
+        tenant = base.overlay()
+        tenant.register(make_skill("acme_crm"))
+        tenant.snapshot()
+
+        base.register(make_skill("delta"))
+
+        assert "delta" in tenant
+        assert tenant.list_skills()[-1] == "acme_crm"
+
+    def test_search_merges_base_and_private(self, base):
+        tenant = base.overlay()
+        tenant.register(make_skill("alpha_private"))
+        tenant.hide("alpha")
+
+        assert [m.name for m in tenant.search("alpha")] == ["alpha_private"]
+        assert [m.name for m in base.search("alpha")] == ["alpha"]
+        assert [m.name for m in tenant.search("skill", limit=2)] == ["beta", "gamma"]
@@ -0,0 +1,199 @@
+"""
+权限位掩码测试
+"""
+
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.agent_factory import VisibilityFilter
+from skill_system.core import (
+    BaseSkill, CombinedFilter, MetadataTable, PermissionFilter, SkillMetadata, SkillRouter,
+    compile_permissions, create_meta_tools
+)
+from skill_system.middleware import PermissionAwareSkillMiddleware, SkillRouterMiddleware
+from skill_system.tests.helpers import FakeToolModel, make_registry, tool_request
+
+# 带 secrets:read 权限的 runtime.context
+GRANTED = {"user_permissions": ["secrets:read"]}
+
+
+class VaultSkill(BaseSkill):
+    """需要 secrets:read 权限的测试 Skill"""
+
+    @property
+    def metadata(self):
+        return SkillMetadata(
+            name="vault",
+            description="Read secrets from the vault",
+            required_permissions=["secrets:read"],
+        )
+
+    def get_instructions(self) -> str:
+        return "vault instructions"
+
+    def build_tools(self):
+        @tool
+        def read_secret(key: str) -> str:
+            """Read a secret"""
+            return f"secret {key}"
+
+        return [read_secret]
+
+    def build_loader_tool(self):
+        @tool
+        def skill_vault() -> str:
+            """Load vault capabilities."""
+            return "vault instructions"
+
+        return skill_vault
+
+
+def make_permission_registry():
+    registry = make_registry()
+    registry.register(VaultSkill())
+    return registry
+
+
+class TestPermissionMasks:
+    """测试权限编译和过滤"""
+
+    def test_metadata_mask(self):
+        meta = SkillMetadata(name="a", description="a", required_permissions=["x:read", "x:write"])
+
+        assert meta.permission_mask == compile_permissions(["x:write", "x:read"])
+        assert SkillMetadata(name="b", description="b").permission_mask == 0
+        assert replace(meta, required_permissions=["x:read"]).permission_mask == compile_permissions(["x:read"])
+
+    def test_filter(self):
+        meta = SkillMetadata(name="a", description="a", required_permissions=["x:read", "x:write"])
+
+        assert PermissionFilter.for_permissions(["x:read", "x:write", "other"])(meta)
+        assert not PermissionFilter.for_permissions(["x:read"])(meta)
+        assert PermissionFilter.for_permissions(["x:read"]).missing(meta) == ["x:write"]
+        assert PermissionFilter.for_permissions(None)(SkillMetadata(name="b", description="b"))
+        assert PermissionFilter.for_permissions(["x:read"]) is PermissionFilter.for_permissions({"x:read"})
+
+    def test_table_mask_matches_per_row(self):
+        metadata = {
+            f"s{i}": SkillMetadata(
+                name=f"s{i}", description="d", required_permissions=[f"p{i % 3}"] if i % 2 else []
+            )
+            for i in range(20)
+        }
+        table = MetadataTable(metadata)
+        for granted in ([], ["p0"], ["p1", "p2"], ["p0", "p1", "p2"]):
+            filter_fn = PermissionFilter.for_permissions(granted)
+            expected = [name for name, meta in metadata.items() if filter_fn(meta)]
+            assert table.select(filter_fn.table_mask(table)) == expected
+
+    def test_registry_filtering_is_cached_per_mask(self):
+        registry = make_permission_registry()
+        public = VisibilityFilter(frozenset(["public"]))
+        denied = CombinedFilter(public, PermissionFilter.for_permissions([]))
+        granted = CombinedFilter(public, PermissionFilter.for_permissions(["secrets:read"]))
+
+        assert "vault" not in registry.list_skills(denied)
+        assert "vault" in registry.list_skills(granted)
+
+        tools = registry.get_tools_for_skills(["vault"], granted)
+        assert "read_secret" in [t.name for t in tools]
+        assert "read_secret" not in [t.name for t in registry.get_tools_for_skills(["vault"], denied)]
+        same_mask = CombinedFilter(public, PermissionFilter.for_permissions(["secrets:read"]))
+        assert registry.get_tools_for_skills(["vault"], same_mask) is tools
+
+
+class TestPermissionAwareMiddleware:
+    """测试中间件按请求权限过滤和拒绝调用"""
+
+    def test_tools_follow_request_permissions(self):
+        middleware = PermissionAwareSkillMiddleware(make_permission_registry())
+        denied = middleware._request_filter(tool_request("skill_vault"))
+        granted = middleware._request_filter(tool_request("skill_vault", context=GRANTED))
+
+        assert "skill_vault" not in [t.name for t in middleware._get_filtered_tools([], filter_fn=denied)]
+        assert "skill_vault" in [t.name for t in middleware._get_filtered_tools([], filter_fn=granted)]
+        assert middleware._request_filter(tool_request("skill_vault", context=GRANTED)) is granted
+
+    def test_denies_unauthorized_calls(self):
+        middleware = PermissionAwareSkillMiddleware(make_permission_registry())
+        executed = []
+
+        def handler(request):
+            executed.append(request.tool_call["name"])
+            return ToolMessage(content="ok", tool_call_id="call-1")
+
+        for name in ("skill_vault", "read_secret"):
+            result = middleware.wrap_tool_call(tool_request(name, {"key": "db"}), handler)
+            assert result.status == "error"
+            assert "requires 'secrets:read'" in result.content
+        assert executed == []
+        assert middleware.metrics.permission_denials == 2
+
+        middleware.wrap_tool_call(tool_request("read_secret", {"key": "db"}, context=GRANTED), handler)
+        assert executed == ["read_secret"]
+
+
+class TestRequestScopedPermissions:
+    """测试路由器和 Meta Tools 按请求 context 中的权限过滤"""
+
+    def test_router_skips_unauthorized_skills(self):
+        registry = make_permission_registry()
+        middleware = SkillRouterMiddleware(registry, SkillRouter(registry, threshold=0.5))
+        state = {"messages": [HumanMessage("read secrets from the vault")], "skills_loaded": []}
+
+        update = middleware.before_agent(state, SimpleNamespace(context=GRANTED))
+        assert update["skills_loaded"] == ["vault"]
+        assert middleware.before_agent(state, SimpleNamespace(context={"user_permissions": []})) is None
+
+    def test_meta_tools_follow_request_permissions(self):
+        find_skills, load_skill = create_meta_tools(make_permission_registry())
+        granted = SimpleNamespace(tool_call_id="call-1", context=GRANTED)
+        denied = SimpleNamespace(tool_call_id="call-1", context={"user_permissions": []})
+
+        assert "- vault:" in find_skills.func("vault", granted)
+        assert "- vault:" not in find_skills.func("vault", denied)
+        assert load_skill.func("vault", granted).update["skills_loaded"] == ["vault"]
+        assert "skills_loaded" not in load_skill.func("vault", denied).update
+
+
+class TestAgentPermissions:
+    """测试 SkillSystemConfig.user_permissions 和按请求的 context 权限生效"""
+
+    def run(self, user_permissions):
+        registry = make_permission_registry()
+        model = FakeToolModel(messages=iter([AIMessage(content="done")]))
+        config = SkillSystemConfig(user_permissions=user_permissions)
+        agent = create_skill_agent(model=model, config=config, registry=registry)
+        return agent.skill_middleware._get_filtered_tools([])
+
+    def test_config_permissions(self):
+        assert "skill_vault" not in [t.name for t in self.run([])]
+        assert "skill_vault" in [t.name for t in self.run(["secrets:read"])]
+
+    def test_request_permissions_narrow_config(self):
+        registry = make_permission_registry()
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{"name": "read_secret", "args": {"key": "db"}, "id": "call-1"}]),
+            AIMessage(content="done"),
+        ]))
+        config = SkillSystemConfig(user_permissions=["secrets:read"])
+        agent = create_skill_agent(model=model, config=config, registry=registry)
+
+        result = agent.invoke(
+            {"messages": [{"role": "user", "content": "read the db secret"}]},
+            context={"user_permissions": []}
+        )
+
+        assert isinstance(agent.skill_middleware, PermissionAwareSkillMiddleware)
+        assert result["messages"][2].status == "error"
+        assert "requires 'secrets:read'" in result["messages"][2].content
+        assert agent.skill_middleware.metrics.permission_denials == 1
@@ -0,0 +1,238 @@
+"""
+令牌桶限速与并发上限测试
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.middleware import (
+    RateLimit, RateLimitedPermissionAwareSkillMiddleware, RateLimitedSkillMiddleware
+)
+from skill_system.middleware.rate_limit import TokenBucket
+from skill_system.tests.helpers import FakeToolModel, make_registry, make_skill, tool_request
+
+
+LOADED = ["pdf_processing", "data_analysis"]
+
+
+class ConcurrencyProbe:
+    """记录同时执行的最大调用数的工具处理器"""
+
+    def __init__(self, duration=0.02):
+        self.duration = duration
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.duration)
+        with self._lock:
+            self.current -= 1
+        return ToolMessage(content="ok", tool_call_id=request.tool_call["id"])
+
+    async def acall(self, request):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        await asyncio.sleep(self.duration)
+        with self._lock:
+            self.current -= 1
+        return ToolMessage(content="ok", tool_call_id=request.tool_call["id"])
+
+
+class TestTokenBucket:
+    """测试令牌桶"""
+
+    def test_reserve_and_refill(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=1.0, burst=2, clock=lambda: now[0])
+
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == 0
+        assert bucket.reserve(max_wait=5) == pytest.approx(1.0)
+        # 下一个令牌已被预约，再来的调用排在后面
+        assert bucket.reserve(max_wait=1.5) is None
+        now[0] = 3.0
+        assert bucket.wait_time() == 0
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            RateLimit.from_config({"rate": 0})
+        with pytest.raises(ValueError):
+            RateLimit.from_config({"max_inflight": 2})
+        assert RateLimit.from_config({"rate": 2, "max_in_flight": 1}) == RateLimit(rate=2.0, max_in_flight=1)
+
+
+class TestRateLimitedMiddleware:
+    """测试工具执行路径和模型调用路径上的限制"""
+
+    def test_in_flight_cap(self):
+        middleware = RateLimitedSkillMiddleware(
+            make_registry(), tool_limits={"extract_pdf_text": {"max_in_flight": 2}}
+        )
+        probe = ConcurrencyProbe()
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(
+                lambda i: middleware.wrap_tool_call(
+                    tool_request("extract_pdf_text", call_id=f"call-{i}", skills_loaded=LOADED), probe
+                ),
+                range(6)
+            ))
+
+        assert all(r.content == "ok" for r in results)
+        assert probe.peak == 2
+        assert middleware.call_counts["extract_pdf_text"] == 6
+        assert middleware.metrics.rate_limit_waits > 0
+
+    def test_rate_limit_rejects_after_timeout(self):
+        middleware = RateLimitedSkillMiddleware(
+            make_registry(), tool_limits={"generate_chart": {"rate": 0.1, "burst": 1}}, timeout=0
+        )
+        probe = ConcurrencyProbe(duration=0)
+
+        assert middleware.wrap_tool_call(tool_request("generate_chart", skills_loaded=LOADED), probe).content == "ok"
+        rejected = middleware.wrap_tool_call(tool_request("generate_chart", skills_loaded=LOADED), probe)
+
+        assert rejected.status == "error"
+        assert "Rate limit exceeded for 'generate_chart'" in rejected.content
+        assert middleware.metrics.rate_limit_rejections == 1
+        # 模型调用时隐藏已饱和的工具
+        names = [t.name for t in middleware._get_filtered_tools(["data_analysis"])]
+        assert "generate_chart" not in names and "calculate_statistics" in names
+
+    def test_skill_limit_covers_all_tools(self):
+        middleware = RateLimitedSkillMiddleware(
+            make_registry(), skill_limits={"data_analysis": {"max_in_flight": 1}}, timeout=0
+        )
+        started, release = threading.Event(), threading.Event()
+
+        def slow(request):
+            started.set()
+            release.wait(5)
+            return ToolMessage(content="ok", tool_call_id=request.tool_call["id"])
+
+        worker = threading.Thread(
+            target=middleware.wrap_tool_call, args=(tool_request("generate_chart", skills_loaded=LOADED), slow)
+        )
+        worker.start()
+        started.wait(5)
+        try:
+            rejected = middleware.wrap_tool_call(
+                tool_request("summarize_data", call_id="call-2", skills_loaded=LOADED), slow
+            )
+            allowed = middleware.wrap_tool_call(
+                tool_request("extract_pdf_text", call_id="call-3", skills_loaded=LOADED), ConcurrencyProbe(duration=0)
+            )
+        finally:
+            release.set()
+            worker.join()
+
+        assert "Rate limit exceeded for 'data_analysis'" in rejected.content
+        assert allowed.content == "ok"
+
+    def test_async_waits_without_blocking(self):
+        middleware = RateLimitedSkillMiddleware(
+            make_registry(), tool_limits={"extract_pdf_text": {"max_in_flight": 1}}
+        )
+        probe = ConcurrencyProbe()
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            tick_task = asyncio.create_task(ticker())
+            results = await asyncio.gather(*(
+                middleware.awrap_tool_call(
+                    tool_request("extract_pdf_text", call_id=f"call-{i}", skills_loaded=LOADED), probe.acall
+                )
+                for i in range(4)
+            ))
+            tick_task.cancel()
+            return results, ticks
+
+        results, ticks = asyncio.run(main())
+
+        assert all(r.content == "ok" for r in results)
+        assert probe.peak == 1
+        assert ticks > 4
+
+    def test_loader_action_is_limited(self):
+        registry = make_registry()
+        middleware = RateLimitedSkillMiddleware(
+            registry, tool_limits={"calculate_statistics": {"max_in_flight": 1}}, timeout=0
+        )
+        loader = registry.get("data_analysis").get_loader_tool()
+        args = {"action": "calculate_statistics", "action_args": {"data": [1, 2, 3], "metrics": "mean"}}
+
+        def run_loader(request):
+            runtime = SimpleNamespace(tool_call_id=request.tool_call["id"], state=request.state, context=None)
+            return loader.func(runtime=runtime, **request.tool_call["args"])
+
+        # 另一个调用占用了唯一的执行槽位
+        assert middleware.tool_limiters["calculate_statistics"].in_flight.try_acquire()
+        saturated = middleware.wrap_tool_call(tool_request(loader, args), run_loader)
+        middleware.tool_limiters["calculate_statistics"].in_flight.release()
+        allowed = middleware.wrap_tool_call(tool_request(loader, args, "call-2"), run_loader)
+
+        assert "Rate limit exceeded for 'calculate_statistics'" in saturated.update["messages"][0].content
+        assert saturated.update["skills_loaded"] == ["data_analysis"]
+        assert "mean: 2.0000" in allowed.update["messages"][0].content
+        assert middleware.metrics.rate_limit_rejections == 1
+        assert middleware.call_counts == {"calculate_statistics": 1}
+
+    def test_factory_uses_config(self):
+        model = FakeToolModel(messages=iter([AIMessage(content="done")]))
+        config = SkillSystemConfig(tool_rate_limits={"extract_pdf_text": {"rate": 2, "max_in_flight": 1}})
+        agent = create_skill_agent(model=model, config=config)
+
+        assert isinstance(agent.skill_middleware, RateLimitedPermissionAwareSkillMiddleware)
+        assert set(agent.skill_middleware.tool_limiters) == {"extract_pdf_text"}
+
+
+class TestPermissionsWithRateLimits:
+    """测试限速与按请求权限组合"""
+
+    def test_denied_calls_do_not_consume_tokens(self):
+        registry = make_registry()
+        registry.register(make_skill("vault", required_permissions=["secrets:read"]))
+        middleware = RateLimitedPermissionAwareSkillMiddleware(
+            registry, tool_limits={"vault_action": {"rate": 0.1, "burst": 1}}, timeout=0
+        )
+        probe = ConcurrencyProbe(duration=0)
+        granted = {"user_permissions": ["secrets:read"]}
+
+        denied = middleware.wrap_tool_call(tool_request("vault_action", skills_loaded=["vault"]), probe)
+        allowed = middleware.wrap_tool_call(
+            tool_request("vault_action", call_id="call-2", skills_loaded=["vault"], context=granted), probe
+        )
+        limited = middleware.wrap_tool_call(
+            tool_request("vault_action", call_id="call-3", skills_loaded=["vault"], context=granted), probe
+        )
+
+        assert "requires 'secrets:read'" in denied.content
+        assert allowed.content == "ok"
+        assert "Rate limit exceeded for 'vault_action'" in limited.content
+        assert middleware.metrics.permission_denials == 1
+        assert middleware.metrics.rate_limit_rejections == 1
+        assert middleware.call_counts == {"vault_action": 1}
@@ -0,0 +1,99 @@
+"""
+按内容哈希的磁盘注册缓存测试
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.core import SkillRegistry, RegistryCache, fingerprint_skill_dir
+from skill_system.tests.helpers import FakeToolModel, write_echo_skill
+
+
+class TestRegistryCache:
+    """测试按内容哈希的磁盘注册缓存"""
+
+    @pytest.fixture
+    def module_only_dir(self, tmp_path):
+        skills_dir = tmp_path / "skills"
+        skills_dir.mkdir()
+        skill_dir = write_echo_skill(skills_dir, manifest=False)
+        (skill_dir / "instructions.md").write_text("Echo instructions")
+        return skills_dir
+
+    def test_unchanged_skill_served_from_cache(self, module_only_dir, tmp_path):
+        cache_path = tmp_path / "cache" / "registry.json"
+        marker = module_only_dir / "echo" / "imported"
+
+        first = SkillRegistry().discover(module_only_dir, cache_path=cache_path)
+        assert first.cached == []
+        assert cache_path.exists()
+        marker.unlink()
+
+        registry = SkillRegistry()
+        second = registry.discover(module_only_dir, cache_path=cache_path)
+
+        assert second.cached == ["echo"]
+        assert not marker.exists()
+        skill = registry.get("echo")
+        assert skill.get_instructions() == "Echo instructions"
+        assert skill.get_tools()[0].invoke({"text": "x"}) == "echo: x"
+
+    def test_changed_skill_is_reimported(self, module_only_dir, tmp_path):
+        cache_path = tmp_path / "registry.json"
+        SkillRegistry().discover(module_only_dir, cache_path=cache_path)
+        (module_only_dir / "echo" / "imported").unlink()
+
+        (module_only_dir / "echo" / "instructions.md").write_text("Changed")
+        result = SkillRegistry().discover(module_only_dir, cache_path=cache_path)
+
+        assert result.cached == []
+        (module_only_dir / "echo" / "imported").unlink()
+        assert SkillRegistry().discover(module_only_dir, cache_path=cache_path).cached == ["echo"]
+
+    def test_removed_skill_is_pruned(self, module_only_dir, tmp_path):
+        cache_path = tmp_path / "registry.json"
+        SkillRegistry().discover(module_only_dir, cache_path=cache_path)
+        assert len(RegistryCache(cache_path)) == 1
+
+        (module_only_dir / "echo" / "skill.py").unlink()
+        SkillRegistry().discover(module_only_dir, cache_path=cache_path)
+
+        assert len(RegistryCache(cache_path)) == 0
+
+    def test_fingerprint_ignores_pycache(self, module_only_dir):
+        skill_dir = module_only_dir / "echo"
+        before = fingerprint_skill_dir(skill_dir)
+        (skill_dir / "__pycache__").mkdir()
+        (skill_dir / "__pycache__" / "skill.pyc").write_bytes(b"\0")
+
+        assert fingerprint_skill_dir(skill_dir) == before
+
+    def test_cache_hit_keeps_custom_loader(self, module_only_dir, tmp_path):
+        skill_file = module_only_dir / "echo" / "skill.py"
+        skill_file.write_text(skill_file.read_text().replace('return "loaded"', 'return "CUSTOM LOADER OUTPUT"'))
+        cache_path = tmp_path / "registry.json"
+
+        def run():
+            registry = SkillRegistry()
+            result = registry.discover(module_only_dir, cache_path=cache_path)
+            model = FakeToolModel(messages=iter([
+                AIMessage(content="", tool_calls=[{"name": "skill_echo", "args": {}, "id": "call-1"}]),
+                AIMessage(content="done"),
+            ]))
+            agent = create_skill_agent(model=model, config=SkillSystemConfig(), registry=registry)
+            state = agent.invoke({"messages": [{"role": "user", "content": "echo"}]})
+            return result.cached, state["messages"][2].content, state["skills_loaded"]
+
+        cold = run()
+        (module_only_dir / "echo" / "imported").unlink()
+        warm = run()
+
+        assert cold == ([], "CUSTOM LOADER OUTPUT", [])
+        assert warm == (["echo"], "CUSTOM LOADER OUTPUT", [])
@@ -0,0 +1,253 @@
+"""
+工具结果缓存中间件测试
+"""
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system import create_skill_agent, SkillSystemConfig
+from skill_system.core import BaseSkill, SkillMetadata, SkillRegistry, ToolResultCache, cacheable
+from skill_system.core.result_cache import cache_options, tool_cache_key
+from skill_system.middleware import PermissionAwareSkillMiddleware, ToolResultCacheMiddleware
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR, make_registry, tool_request
+
+LOADED = ["data_analysis"]
+
+
+class SecretSkill(BaseSkill):
+    """工具可缓存、需要 secrets:read 权限的测试 Skill"""
+
+    @property
+    def metadata(self):
+        return SkillMetadata(name="secret", description="Secrets", required_permissions=["secrets:read"])
+
+    def build_tools(self):
+        @tool
+        def read_secret(key: str) -> str:
+            """Read a secret"""
+            return f"secret {key}"
+
+        return [cacheable(read_secret)]
+
+    def build_loader_tool(self):
+        @tool
+        def skill_secret() -> str:
+            """Load secrets."""
+            return "loaded"
+
+        return skill_secret
+
+
+class RotatedSecretSkill(SecretSkill):
+    """替换 SecretSkill 的新版本（工具名相同，结果不同）"""
+
+    def build_tools(self):
+        @tool
+        def read_secret(key: str) -> str:
+            """Read a secret"""
+            return f"rotated {key}"
+
+        return [cacheable(read_secret)]
+
+
+class CountingHandler:
+    """执行工具并计数的处理器"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        output = request.tool.invoke(request.tool_call["args"])
+        return ToolMessage(content=str(output), tool_call_id=request.tool_call["id"])
+
+
+class TestCacheKey:
+    """测试缓存键"""
+
+    def test_canonical_arguments(self):
+        assert tool_cache_key("t", {"a": 1, "b": [1, 2]}) == tool_cache_key("t", {"b": [1, 2], "a": 1})
+        assert tool_cache_key("t", {"a": 1}) != tool_cache_key("t", {"a": 2})
+        assert tool_cache_key("t", {"a": 1}) != tool_cache_key("u", {"a": 1})
+
+    def test_file_arguments_track_changes(self, tmp_path):
+        path = tmp_path / "report.pdf"
+        path.write_bytes(b"v1")
+        before = tool_cache_key("t", {"file_path": str(path)}, ["file_path"])
+        assert tool_cache_key("t", {"file_path": str(path)}, ["file_path"]) == before
+
+        path.write_bytes(b"version 2")
+        os.utime(path, ns=(1, 1))
+        assert tool_cache_key("t", {"file_path": str(path)}, ["file_path"]) != before
+        # 不存在的文件也能生成键
+        assert tool_cache_key("t", {"file_path": str(tmp_path / "missing")}, ["file_path"])
+
+
+class TestToolResultCache:
+    """测试 LRU 和 TTL"""
+
+    def test_lru_and_ttl(self):
+        now = [0.0]
+        cache = ToolResultCache(max_size=2, clock=lambda: now[0])
+        cache.put(("a",), 1)
+        cache.put(("b",), 2, ttl=10)
+        assert cache.get(("a",)) == 1
+        cache.put(("c",), 3)
+
+        assert cache.get(("b",)) is None  # 最久未使用，已淘汰
+        assert cache.get(("a",)) == 1
+        cache.put(("d",), 4, ttl=5)
+        now[0] = 6.0
+        assert cache.get(("d",)) is None
+        assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 2, "expirations": 1, "size": 1}
+
+
+class TestToolResultCacheMiddleware:
+    """测试中间件拦截可缓存的工具调用"""
+
+    def test_hits_skip_execution(self):
+        registry = make_registry()
+        middleware = ToolResultCacheMiddleware(registry)
+        stats_tool = next(t for t in registry.get("data_analysis").get_tools() if t.name == "calculate_statistics")
+        handler = CountingHandler()
+
+        first = middleware.wrap_tool_call(tool_request(stats_tool, {"data": [1, 2, 3]}, skills_loaded=LOADED), handler)
+        second = middleware.wrap_tool_call(
+            tool_request(stats_tool, {"metrics": "all", "data": [1, 2, 3]}, "call-2", LOADED), handler
+        )
+        again = middleware.wrap_tool_call(tool_request(stats_tool, {"data": [1, 2, 3]}, "call-3", LOADED), handler)
+
+        assert handler.calls == 2  # metrics 参数不同，是另一个键
+        assert again.content == first.content
+        assert again.tool_call_id == "call-3"
+        assert second.tool_call_id == "call-2"
+        assert middleware.get_stats()["hits"] == 1
+
+    def test_only_cacheable_successes(self):
+        middleware = ToolResultCacheMiddleware()
+
+        @tool
+        def plain(x: int) -> str:
+            """Not cacheable"""
+            return str(x)
+
+        @tool
+        def failing(x: int) -> str:
+            """Cacheable but failing"""
+            return "Error: broken"
+
+        cacheable(failing)
+        handler = CountingHandler()
+        for t in (plain, failing):
+            middleware.wrap_tool_call(tool_request(t, {"x": 1}, skills_loaded=LOADED), handler)
+            middleware.wrap_tool_call(tool_request(t, {"x": 1}, skills_loaded=LOADED), handler)
+
+        assert handler.calls == 4
+        assert cache_options(plain) is None and cache_options(failing) == {}
+
+    def test_bypassed_until_skill_loaded(self):
+        registry = make_registry()
+        middleware = ToolResultCacheMiddleware(registry)
+        stats_tool = next(t for t in registry.get("data_analysis").get_tools() if t.name == "calculate_statistics")
+        handler = CountingHandler()
+
+        for _ in range(2):
+            middleware.wrap_tool_call(tool_request(stats_tool, {"data": [1.0]}), handler)
+
+        assert handler.calls == 2
+        assert len(middleware.cache) == 0
+
+    def test_hits_require_request_permissions(self):
+        registry = SkillRegistry()
+        registry.register(SecretSkill())
+        cache = ToolResultCacheMiddleware(registry)
+        permissions = PermissionAwareSkillMiddleware(registry)
+        read_secret = registry.get("secret").get_tools()[0]
+        handler = CountingHandler()
+
+        def call(context):
+            request = tool_request(read_secret, {"key": "db"}, skills_loaded=["secret"], context=context)
+            return cache.wrap_tool_call(request, lambda r: permissions.wrap_tool_call(r, handler))
+
+        granted = {"user_permissions": ["secrets:read"]}
+        assert call(granted).content == "secret db"
+        assert call(granted).content == "secret db"
+        assert handler.calls == 1
+
+        # 已缓存的结果不会返回给没有权限的调用方
+        for context in ({"user_permissions": []}, None):
+            denied = call(context)
+            assert denied.status == "error"
+            assert "secrets:read" in denied.content
+        assert handler.calls == 1
+        assert cache.get_stats()["hits"] == 1
+
+    def test_replaced_skill_drops_cached_results(self):
+        registry = SkillRegistry()
+        registry.register(SecretSkill())
+        middleware = ToolResultCacheMiddleware(registry, user_permissions=["secrets:read"])
+        handler = CountingHandler()
+
+        def call():
+            read_secret = registry.get("secret").get_tools()[0]
+            request = tool_request(read_secret, {"key": "db"}, skills_loaded=["secret"])
+            return middleware.wrap_tool_call(request, handler)
+
+        assert call().content == "secret db"
+        assert call().content == "secret db"
+        registry.replace(RotatedSecretSkill())
+
+        assert call().content == "rotated db"
+        assert call().content == "rotated db"
+        assert handler.calls == 2
+        assert len(middleware.cache) == 1
+
+    def test_loader_action_uses_cache(self):
+        registry = make_registry()
+        middleware = ToolResultCacheMiddleware(registry)
+        loader = registry.get("data_analysis").get_loader_tool()
+        args = {"action": "calculate_statistics", "action_args": {"data": [1, 2, 3], "metrics": "mean"}}
+
+        def run_loader(request):
+            runtime = SimpleNamespace(tool_call_id=request.tool_call["id"], state=request.state, context=None)
+            return loader.func(runtime=runtime, **request.tool_call["args"])
+
+        first = middleware.wrap_tool_call(tool_request(loader, args), run_loader)
+        second = middleware.wrap_tool_call(tool_request(loader, args, "call-2"), run_loader)
+
+        assert "mean: 2.0000" in first.update["messages"][0].content
+        assert second.update["messages"][0].content == first.update["messages"][0].content
+        assert middleware.get_stats()["hits"] == 1
+
+    def test_manifest_keeps_cache_declaration(self):
+        registry = make_registry()
+        tools = {t.name: t for t in registry.get("pdf_processing").get_tools()}
+
+        assert cache_options(tools["extract_pdf_text"]) == {"file_args": ["file_path"]}
+
+
+class TestAgentToolCache:
+    """测试 create_skill_agent 默认启用结果缓存"""
+
+    def test_repeated_call_in_session(self):
+        call = {"name": "calculate_statistics", "args": {"data": [1, 2, 3], "metrics": "mean"}}
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{**call, "id": f"call-{i}"}]) for i in range(3)
+        ] + [AIMessage(content="done")]))
+        agent = create_skill_agent(model=model, config=SkillSystemConfig(skills_dir=SKILLS_DIR))
+        result = agent.invoke({"messages": [{"role": "user", "content": "mean of 1 2 3"}]})
+
+        # 第一次调用自动激活 Skill（不使用缓存），第二次执行并缓存，第三次命中
+        assert result["messages"][6].content == result["messages"][4].content
+        assert "mean: 2.0000" in result["messages"][6].content
+        assert agent.tool_cache_middleware.get_stats() == {
+            "hits": 1, "misses": 1, "evictions": 0, "expirations": 0, "size": 1
+        }
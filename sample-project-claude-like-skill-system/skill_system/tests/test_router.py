@@ -0,0 +1,102 @@
+"""
+轮前 Skill 路由测试
+"""
+
+from pathlib import Path
+import sys
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from skill_system import create_skill_agent, load_config, SkillSystemConfig
+from skill_system.core import SkillRouter
+from skill_system.middleware import SkillRouterMiddleware
+from skill_system.tests.helpers import FakeToolModel, SKILLS_DIR, make_registry
+
+
+class TestSkillRouter:
+    """测试 BM25 路由器"""
+
+    def test_routes_confident_message(self):
+        router = SkillRouter(make_registry())
+
+        assert router.route("Convert report.pdf to CSV") == ["pdf_processing"]
+        assert router.route("generate a bar chart of these numbers") == ["data_analysis"]
+        assert router.metrics.loader_turns_saved == 2
+
+    def test_ignores_unrelated_message(self):
+        router = SkillRouter(make_registry())
+
+        assert router.route("hello, how are you?") == []
+        assert router.metrics.to_dict()["messages_scored"] == 1
+        assert router.metrics.skills_activated == 0
+
+    def test_skips_already_loaded_skill(self):
+        router = SkillRouter(make_registry())
+
+        assert router.route("extract text from the pdf", exclude=["pdf_processing"]) == []
+
+    def test_respects_filter_and_registry_changes(self):
+        registry = make_registry()
+        router = SkillRouter(
+            registry,
+            threshold=2.0,
+            filter_fn=lambda meta: meta.name != "pdf_processing"
+        )
+        assert router.route("extract text from the pdf") == []
+
+        router.filter_fn = None
+        registry.set_enabled("data_analysis", False)
+        assert router.route("extract text from the pdf") == ["pdf_processing"]
+        assert "data_analysis" not in dict(router.score("generate a bar chart"))
+
+
+class TestSkillRouterMiddleware:
+    """测试路由中间件"""
+
+    def test_before_agent_seeds_state(self):
+        registry = make_registry()
+        middleware = SkillRouterMiddleware(registry, SkillRouter(registry, threshold=2.0))
+
+        update = middleware.before_agent(
+            {"messages": [HumanMessage("calculate the mean and std")], "skills_loaded": []},
+            None
+        )
+
+        assert update["skills_loaded"] == ["data_analysis"]
+        ai_message, tool_message = update["messages"]
+        assert ai_message.tool_calls[0]["name"] == "skill_data_analysis"
+        assert tool_message.tool_call_id == ai_message.tool_calls[0]["id"]
+        assert "calculate_statistics" in tool_message.content
+
+    def test_agent_uses_skill_tool_on_first_turn(self):
+        model = FakeToolModel(messages=iter([
+            AIMessage(content="", tool_calls=[{
+                "name": "calculate_statistics",
+                "args": {"data": [1, 2, 3], "metrics": "mean"},
+                "id": "call-1",
+            }]),
+            AIMessage(content="done"),
+        ]))
+        config = SkillSystemConfig(skills_dir=SKILLS_DIR, router_enabled=True)
+        agent = create_skill_agent(model=model, config=config)
+
+        result = agent.invoke({
+            "messages": [{"role": "user", "content": "calculate the mean of 1, 2, 3"}]
+        })
+
+        assert result["skills_loaded"] == ["data_analysis"]
+        assert "mean: 2.0000" in result["messages"][-2].content
+
+    def test_router_settings_from_env(self, monkeypatch):
+        monkeypatch.setenv("SKILL_SYSTEM_ROUTER_ENABLED", "true")
+        monkeypatch.setenv("SKILL_SYSTEM_ROUTER_THRESHOLD", "1.5")
+        monkeypatch.setenv("SKILL_SYSTEM_ROUTER_MAX_SKILLS", "2")
+
+        config = load_config()
+
+        assert config.router_enabled
+        assert config.router_threshold == 1.5
+        assert config.router_max_skills == 2
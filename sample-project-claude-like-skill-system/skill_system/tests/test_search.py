@@ -0,0 +1,80 @@
+"""
+Skill 搜索索引测试
+"""
+
+from pathlib import Path
+import sys
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillMetadata, SkillSearchIndex
+
+
+def build_index() -> SkillSearchIndex:
+    index = SkillSearchIndex()
+    index.add(SkillMetadata(
+        name="pdf_processing",
+        description="PDF 文档处理能力，包括文本提取",
+        tags=["pdf", "document"],
+    ))
+    index.add(SkillMetadata(
+        name="data_analysis",
+        description="Statistics and charts, can read pdf reports",
+        tags=["data", "statistics"],
+    ))
+    index.add(SkillMetadata(
+        name="email_sender",
+        description="Send emails",
+        tags=["email"],
+        visibility="internal",
+    ))
+    return index
+
+
+class TestSkillSearchIndex:
+    """测试倒排索引搜索"""
+
+    def test_name_match_ranks_above_description_match(self):
+        assert build_index().search("pdf") == ["pdf_processing", "data_analysis"]
+
+    def test_prefix_and_multi_token_query(self):
+        index = build_index()
+
+        assert index.search("stat") == ["data_analysis"]
+        assert index.search("pdf reports") == ["data_analysis"]
+        assert index.search("pdf nothing") == []
+
+    def test_substring_fallback(self):
+        index = build_index()
+
+        # 词中间的片段没有前缀命中，按名称 / 描述子串匹配
+        assert index.search("df") == ["pdf_processing", "data_analysis"]
+        assert index.search("mails") == ["email_sender"]
+        assert index.search("_anal") == ["data_analysis"]
+        assert index.search("mails", visibility="public") == []
+        assert index.search("zzz") == []
+
+    def test_cjk_query(self):
+        assert build_index().search("文本提取") == ["pdf_processing"]
+
+    def test_tag_and_visibility_filters(self):
+        index = build_index()
+
+        assert index.search(tags=["email", "data"]) == ["data_analysis", "email_sender"]
+        assert index.search(visibility="internal") == ["email_sender"]
+        assert index.search(tags=["email"], visibility="public") == []
+
+    def test_limit(self):
+        assert build_index().search(limit=2) == ["pdf_processing", "data_analysis"]
+
+    def test_remove_and_readd(self):
+        index = build_index()
+        index.remove("pdf_processing")
+
+        assert index.search("pdf") == ["data_analysis"]
+        assert index.search(tags=["document"]) == []
+        assert len(index) == 2
+
+        index.add(SkillMetadata(name="pdf_processing", description="PDF", tags=["pdf"]))
+        assert index.search("pdf")[0] == "pdf_processing"
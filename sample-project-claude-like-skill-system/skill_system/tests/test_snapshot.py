@@ -0,0 +1,126 @@
+"""
+Registry 快照（写时复制）测试
+"""
+
+import threading
+from pathlib import Path
+import sys
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from skill_system.core import SkillRegistry, SkillSearchIndex, SkillMetadata
+from skill_system.tests.helpers import make_skill
+
+
+def make_registry(*names: str) -> SkillRegistry:
+    registry = SkillRegistry()
+    for name in names:
+        registry.register(make_skill(name))
+    return registry
+
+
+class TestRegistrySnapshot:
+    """测试快照的发布与隔离"""
+
+    def test_snapshot_reused_until_write(self):
+        registry = make_registry("alpha")
+
+        first = registry.snapshot()
+        assert registry.snapshot() is first
+
+        registry.register(make_skill("beta"))
+        second = registry.snapshot()
+
+        assert second is not first
+        assert second.version == first.version + 1
+
+    def test_old_snapshot_unaffected_by_writes(self):
+        registry = make_registry("alpha", "beta")
+        old = registry.snapshot()
+        old_tools = old.get_tools_for_skills(["alpha"])
+
+        registry.unregister("alpha")
+        registry.register(make_skill("gamma"))
+
+        assert old.list_skills() == ["alpha", "beta"]
+        assert old.get_tools_for_skills(["alpha"]) is old_tools
+        assert registry.list_skills() == ["beta", "gamma"]
+
+    def test_set_enabled_does_not_mutate_published_metadata(self):
+        registry = make_registry("alpha")
+        old = registry.snapshot()
+
+        registry.set_enabled("alpha", False)
+
+        assert old.get_metadata("alpha").enabled
+        assert not registry.get_metadata("alpha").enabled
+        # 启用状态只记录在 Registry 的元数据中，Skill 实例声明的元数据不变
+        assert registry.get("alpha").metadata.enabled
+        assert "skill_alpha" in [t.name for t in old.get_all_loader_tools()]
+        assert registry.get_all_loader_tools() == []
+
+    def test_old_snapshot_search_unaffected(self):
+        registry = make_registry("alpha", "beta")
+        old = registry.snapshot()
+
+        registry.unregister("alpha")
+        registry.register(make_skill("alphabet"))
+
+        assert [m.name for m in old.search("alpha")] == ["alpha"]
+        assert [m.name for m in registry.search("alpha")] == ["alphabet"]
+
+
+class TestSearchIndexCopy:
+    """测试搜索索引的写时复制"""
+
+    def test_copy_shares_until_modified(self):
+        index = SkillSearchIndex()
+        index.add(SkillMetadata(name="pdf_tools", description="read pdf", tags=["pdf"]))
+        index.add(SkillMetadata(name="csv", description="tables"))
+
+        clone = index.copy()
+        clone.add(SkillMetadata(name="pdf_export", description="write pdf", tags=["pdf"]))
+        clone.remove("pdf_tools")
+
+        assert index.search("pdf") == ["pdf_tools"]
+        assert index.search(tags=["pdf"]) == ["pdf_tools"]
+        assert clone.search("pdf") == ["pdf_export"]
+        # 未修改的倒排集合仍然共享
+        assert clone._name_prefix["csv"] is index._name_prefix["csv"]
+
+
+class TestConcurrentAccess:
+    """测试并发读写"""
+
+    def test_readers_never_fail_during_writes(self):
+        registry = make_registry(*[f"s{i}" for i in range(50)])
+        stop = threading.Event()
+        errors = []
+
+        def reader():
+            while not stop.is_set():
+                try:
+                    snapshot = registry.snapshot()
+                    names = snapshot.list_skills()
+                    tools = snapshot.get_tools_for_skills(names[:3])
+                    # 同一快照内的数据必须一致
+                    assert len(tools) == len(names) + min(3, len(names))
+                    registry.search("s1")
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(100):
+            name = f"s{i % 50}"
+            registry.unregister(name)
+            registry.register(make_skill(name))
+            registry.set_enabled(name, True)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len(registry) == 50
@@ -0,0 +1,140 @@
+"""
+工具集缓存测试
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from langchain_core.tools import tool
+
+from skill_system.core import SkillRegistry, SkillMetadata, BaseSkill
+from skill_system.core.exceptions import SkillNotFoundError
+from skill_system.tests.helpers import make_skill
+
+
+@pytest.fixture
+def registry():
+    registry = SkillRegistry()
+    registry.register(make_skill("alpha"))
+    registry.register(make_skill("beta", visibility="internal"))
+    return registry
+
+
+class TestToolsCache:
+    """测试 get_tools_for_skills 缓存"""
+
+    def test_returns_tuple_with_loaders_and_loaded_tools(self, registry):
+        tools = registry.get_tools_for_skills(["alpha"])
+
+        assert isinstance(tools, tuple)
+        assert [t.name for t in tools] == ["skill_alpha", "skill_beta", "alpha_action"]
+
+    def test_hit_is_order_insensitive(self, registry):
+        first = registry.get_tools_for_skills(["alpha", "beta"])
+        second = registry.get_tools_for_skills(["beta", "alpha", "alpha"])
+
+        assert first is second
+        assert registry.get_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_filter_is_part_of_key(self, registry):
+        public_only = lambda meta: meta.visibility == "public"
+
+        tools = registry.get_tools_for_skills(["alpha", "beta"], public_only)
+
+        assert [t.name for t in tools] == ["skill_alpha", "alpha_action"]
+        assert registry.get_tools_for_skills(["alpha", "beta"]) is not tools
+
+    def test_invalidated_on_register_and_unregister(self, registry):
+        registry.get_tools_for_skills([])
+        registry.register(make_skill("gamma"))
+        assert registry.get_cache_stats()["size"] == 0
+
+        assert "skill_gamma" in [t.name for t in registry.get_tools_for_skills([])]
+
+        registry.unregister("gamma")
+        assert "skill_gamma" not in [t.name for t in registry.get_tools_for_skills([])]
+
+    def test_invalidated_on_enable_toggle(self, registry):
+        registry.get_tools_for_skills(["alpha"])
+        registry.set_enabled("alpha", False)
+
+        names = [t.name for t in registry.get_tools_for_skills(["alpha"])]
+        assert names == ["skill_beta"]
+        # 启用状态只记录在 Registry 的元数据中，Skill 实例声明的元数据不变
+        assert not registry.get_metadata("alpha").enabled
+        assert registry.get("alpha").metadata.enabled
+
+        registry.set_enabled("alpha", True)
+        assert "alpha_action" in [t.name for t in registry.get_tools_for_skills(["alpha"])]
+
+    def test_set_enabled_unknown_skill(self, registry):
+        with pytest.raises(SkillNotFoundError):
+            registry.set_enabled("missing", False)
+
+    def test_cache_is_bounded(self):
+        registry = SkillRegistry(tools_cache_size=2)
+        for name in ["a", "b", "c"]:
+            registry.register(make_skill(name))
+
+        for name in ["a", "b", "c"]:
+            registry.get_tools_for_skills([name])
+
+        assert registry.get_cache_stats()["size"] == 2
+
+
+class TestBaseSkillBuildOnce:
+    """测试 BaseSkill 的工具实例缓存"""
+
+    class CountingSkill(BaseSkill):
+        builds = 0
+
+        @property
+        def metadata(self):
+            return SkillMetadata(name="counting", description="Counting skill")
+
+        def build_tools(self):
+            self.builds += 1
+
+            @tool
+            def count() -> str:
+                """Count"""
+                return "1"
+
+            return [count]
+
+        def build_loader_tool(self):
+            @tool
+            def skill_counting() -> str:
+                """Load counting"""
+                return "loaded"
+
+            return skill_counting
+
+    def test_tools_built_once(self):
+        skill = self.CountingSkill()
+        skill.validate()
+        skill.get_instructions()
+
+        assert skill.get_tools()[0] is skill.get_tools()[0]
+        assert skill.get_loader_tool() is skill.get_loader_tool()
+        assert skill.builds == 1
+
+    def test_rebuild_tools(self):
+        skill = self.CountingSkill()
+        old_tool = skill.get_tools()[0]
+        old_loader = skill.get_loader_tool()
+
+        skill.rebuild_tools()
+
+        assert skill.get_tools()[0] is not old_tool
+        assert skill.get_loader_tool() is not old_loader
+
+    def test_returned_list_does_not_leak_cache(self):
+        skill = self.CountingSkill()
+        skill.get_tools().clear()
+
+        assert len(skill.get_tools()) == 1
@@ -3,11 +3,14 @@ Utility Module - 工具函数
 """
 
 from .logger import setup_logger, get_logger
-from .helpers import format_skill_list, generate_system_prompt
+from .helpers import format_skill_list, generate_system_prompt, generate_meta_system_prompt
+from .tokens import estimate_tokens
 
 __all__ = [
     "setup_logger",
     "get_logger",
     "format_skill_list",
     "generate_system_prompt",
+    "generate_meta_system_prompt",
+    "estimate_tokens",
 ]
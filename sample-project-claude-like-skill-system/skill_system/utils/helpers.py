@@ -2,8 +2,9 @@
 辅助工具函数
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from skill_system.core.base_skill import SkillMetadata
+from skill_system.core.groups import group_loader_name
 
 
 def format_skill_list(skills_metadata: List[SkillMetadata]) -> str:
@@ -35,14 +36,16 @@ def format_skill_list(skills_metadata: List[SkillMetadata]) -> str:
 
 def generate_system_prompt(
     available_skill_names: List[str],
-    custom_instructions: str = ""
+    custom_instructions: str = "",
+    available_groups: Optional[List[str]] = None
 ) -> str:
     """
     生成 Agent 的 System Prompt
 
     Args:
-        available_skill_names: 可用的 Skill 名称列表
+        available_skill_names: 可用的 Skill 名称列表（分组模式下只包含未分组的 Skill）
         custom_instructions: 自定义指令
+        available_groups: 分组模式下的分组列表（组内 Skill 的 Loader 在打开分组后才出现）
 
     Returns:
         完整的 System Prompt
@@ -50,6 +53,9 @@ def generate_system_prompt(
     skill_loaders = "\n".join([
         f"- skill_{name}: Load {name.replace('_', ' ')} capabilities"
         for name in available_skill_names
+    ] + [
+        f"- {group_loader_name(group)}: Open the {group} skill group (reveals its skill loaders)"
+        for group in available_groups or []
     ])
 
     prompt = f"""You are an AI assistant with modular skills.
@@ -77,6 +83,40 @@ User: "Convert report.pdf to CSV and analyze the data"
 - ALWAYS load the skill BEFORE trying to use its tools
 - Don't assume tools are available without loading the skill first
 - If you're unsure which skill to use, describe what you need and load the most relevant one
+- If you already know which tool you need, pass it to the skill loader as `action` (with `action_args`) to load the skill and run the tool in one step
+- Skills persist across conversation turns once loaded
+
+{custom_instructions}
+"""
+
+    return prompt
+
+
+def generate_meta_system_prompt(custom_instructions: str = "") -> str:
+    """
+    生成 meta 模式（find_skills / load_skill）的 System Prompt
+
+    不列出任何 Skill，长度与 Skill 数量无关
+
+    Args:
+        custom_instructions: 自定义指令
+
+    Returns:
+        完整的 System Prompt
+    """
+    prompt = f"""You are an AI assistant with modular skills.
+
+**Important Operating Principle**:
+You start with minimal capabilities. When you need specific functionality:
+1. Call find_skills with a few keywords describing what you need
+2. Pick the best match and call load_skill with its name
+3. Wait for the skill to be activated (you'll receive instructions)
+4. Then use the newly available tools to complete the task
+
+**Key Rules**:
+- ALWAYS load the skill BEFORE trying to use its tools
+- Don't assume tools are available without loading the skill first
+- If find_skills returns nothing useful, try other keywords before giving up
 - Skills persist across conversation turns once loaded
 
 {custom_instructions}
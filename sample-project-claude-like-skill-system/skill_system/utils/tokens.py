@@ -0,0 +1,48 @@
+"""
+Token 估算
+
+安装了 tiktoken 时使用 cl100k_base 精确计数；否则按字符启发式估算
+（ASCII 约 4 个字符一个 token，CJK 等非 ASCII 字符每个字符一个 token）。
+只用于比较不同 Prompt 方案的相对大小，不用于计费。
+"""
+
+from functools import lru_cache
+from typing import Any, Optional
+
+try:
+    import tiktoken
+except ImportError:  # 可选依赖
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _encoding() -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # 离线环境下可能无法下载编码表
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的 token 数
+
+    Args:
+        text: 待估算的文本
+
+    Returns:
+        token 数
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def token_counter_name() -> str:
+    """当前使用的计数方式（写入基准输出，便于区分精确值与估算值）"""
+    return "tiktoken/cl100k_base" if _encoding() is not None else "heuristic"